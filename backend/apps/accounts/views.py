@@ -519,10 +519,10 @@ def request_first_access(request):
             SELECT nr_cpf, matricula, nome_beneficiario, nascto, empresa, plano_nome,
                    tipo_contratacao, nome_titular
             FROM public.v_app_carteiras_unificadas
-            WHERE (LPAD(nr_cpf::TEXT, 11, '0') = %s OR nr_cpf::TEXT = %s)
+            WHERE cpf_key = %s
               AND matricula = %s
             LIMIT 1
-        """, [cpf_clean.zfill(11), cpf_clean, registration_number])
+        """, [cpf_clean, registration_number])
 
         row = cursor.fetchone()
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AdminProfile, AuditLog, SystemConfiguration
+from .models import AdminProfile, AuditLog, DashboardDailyMetrics, ReportJob, SystemConfiguration
 
 
 @admin.register(AdminProfile)
@@ -33,3 +33,19 @@ class SystemConfigurationAdmin(admin.ModelAdmin):
     list_display = ['key', 'category', 'is_sensitive', 'last_modified_by', 'updated_at']
     list_filter = ['category', 'is_sensitive']
     search_fields = ['key', 'description']
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['report_type', 'format', 'status', 'requested_by', 'total_rows', 'rows_written', 'created_at']
+    list_filter = ['status', 'report_type', 'format']
+    readonly_fields = ['requested_by', 'report_type', 'format', 'parameters', 'task_id', 'total_rows',
+                       'rows_written', 'file', 'error', 'created_at', 'started_at', 'finished_at']
+
+
+@admin.register(DashboardDailyMetrics)
+class DashboardDailyMetricsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'new_beneficiaries', 'approved_reimbursements', 'rejected_reimbursements', 'computed_at']
+    date_hierarchy = 'date'
+    readonly_fields = ['date', 'new_beneficiaries', 'approved_reimbursements', 'rejected_reimbursements',
+                       'computed_at']
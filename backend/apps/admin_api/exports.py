@@ -0,0 +1,297 @@
+"""
+Admin report querysets and streaming exports
+
+Each report type is a model, the date field its period filters on and the
+exported columns. ``report_queryset`` returns the filtered rows as a lazy
+queryset shared by the preview (a LIMIT on it, counted by ``report_count``)
+and the exports, so both always see the same rows.
+
+``stream_csv`` turns the rows into CSV lines while iterating the database
+cursor, so exports run in constant memory whatever the row count;
+``gzip_stream`` compresses those lines on the fly. ``write_csv`` and
+``write_pdf`` write a whole report to a file for the background report jobs
+(apps.admin_api.tasks), reporting progress as they go.
+
+Settings:
+    REPORT_EXPORT_CHUNK_SIZE       rows fetched per database round-trip
+    REPORT_EXACT_COUNT_THRESHOLD   planner estimates above this are returned
+                                   as the preview count instead of COUNT(*)
+"""
+import csv
+import datetime
+import io
+import json
+import zlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas as pdf_canvas
+
+from apps.utils import pdf_layout
+
+from apps.beneficiaries.models import Beneficiary
+from apps.providers.models import AccreditedProvider
+from apps.reimbursements.models import ReimbursementRequest
+
+
+REPORTS = {
+    'users': {
+        'model': Beneficiary,
+        'date_field': 'created_at',
+        'fields': [
+            'registration_number', 'full_name', 'cpf', 'email',
+            'phone', 'status', 'beneficiary_type', 'created_at'
+        ],
+    },
+    'providers': {
+        'model': AccreditedProvider,
+        'date_field': 'created_at',
+        'fields': [
+            'name', 'provider_type', 'cnpj', 'email', 'phone',
+            'city', 'state', 'is_active', 'rating', 'created_at'
+        ],
+    },
+    'reimbursements': {
+        'model': ReimbursementRequest,
+        'date_field': 'request_date',
+        'fields': [
+            'protocol_number', 'beneficiary__full_name', 'expense_type',
+            'service_date', 'requested_amount', 'approved_amount',
+            'status', 'request_date'
+        ],
+    },
+}
+
+
+def _chunk_size():
+    return getattr(settings, 'REPORT_EXPORT_CHUNK_SIZE', 2000)
+
+
+def _exact_count_threshold():
+    return getattr(settings, 'REPORT_EXACT_COUNT_THRESHOLD', 100000)
+
+
+def report_fields(report_type):
+    return REPORTS[report_type]['fields']
+
+
+def report_queryset(report_type, date_from=None, date_to=None, filters=None):
+    """Filtered rows of a report; raises KeyError for an unknown report type"""
+    report = REPORTS[report_type]
+    date_field = report['date_field']
+    queryset = report['model'].objects.all()
+
+    if date_from:
+        queryset = queryset.filter(**{f'{date_field}__date__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{date_field}__date__lte': date_to})
+
+    return queryset.order_by('pk')
+
+
+def estimated_count(queryset):
+    """Planner row estimate for ``queryset`` (EXPLAIN, no scan)"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def report_count(queryset, exact=False):
+    """
+    Row count of a report as (count, is_estimate). Uses the planner estimate
+    when it is above EXACT_COUNT_THRESHOLD and an exact count is not asked for;
+    small results are always counted exactly.
+    """
+    if not exact:
+        estimate = estimated_count(queryset)
+        if estimate > _exact_count_threshold():
+            return estimate, True
+    return queryset.count(), False
+
+
+class _Echo:
+    """File-like object whose write() returns the written line"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset, fields, chunk_size=None):
+    """Yield the CSV header and then one line per row of ``queryset``"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size or _chunk_size())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def gzip_stream(chunks, flush_bytes=64 * 1024):
+    """Compress a stream of text chunks into gzip bytes on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending += len(data)
+        compressed = compressor.compress(data)
+        if pending >= flush_bytes:
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def encode_stream(chunks, batch_bytes=64 * 1024):
+    """Group text chunks into UTF-8 byte blocks of about ``batch_bytes``"""
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= batch_bytes:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+class ReportCancelled(Exception):
+    """Raised by a progress callback to stop writing a report"""
+
+
+def write_csv(queryset, fields, fileobj, on_progress=None, chunk_size=None):
+    """
+    Write the report as UTF-8 CSV into the binary ``fileobj``. ``on_progress``
+    is called with the rows written so far after every chunk. Returns the
+    number of rows written.
+    """
+    chunk_size = chunk_size or _chunk_size()
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(fields)
+
+    rows = 0
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        writer.writerow(row)
+        rows += 1
+        if on_progress and rows % chunk_size == 0:
+            on_progress(rows)
+
+    text.flush()
+    text.detach()  # leave fileobj open for the caller
+    return rows
+
+
+PDF_PAGESIZE = landscape(A4)
+PDF_MARGIN = 1.5*cm
+PDF_FONT_SIZE = 7
+PDF_ROW_HEIGHT = 0.45*cm
+PDF_HEADER_HEIGHT = 2*cm
+
+
+def _pdf_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Sim' if value else 'Não'
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).strftime('%d/%m/%Y %H:%M') if timezone.is_aware(value) \
+            else value.strftime('%d/%m/%Y %H:%M')
+    if isinstance(value, datetime.date):
+        return value.strftime('%d/%m/%Y')
+    if isinstance(value, Decimal):
+        return f'{value:.2f}'
+    return str(value)
+
+
+def _fit(canvas, text, width):
+    """Truncate ``text`` to fit in ``width`` points"""
+    text_width = canvas.stringWidth(text, 'Helvetica', PDF_FONT_SIZE)
+    if text_width <= width:
+        return text
+    keep = max(int(len(text) * width / text_width) - 3, 0)
+    return text[:keep] + '...'
+
+
+def _report_page_layout(report_type, fields):
+    """Header band and column titles, compiled once and stamped on every page"""
+    page_width, page_height = PDF_PAGESIZE
+    column_width = (page_width - 2 * PDF_MARGIN) / len(fields)
+    header_band = pdf_layout.header_band(
+        subtitle=f"Relatório: {report_type.title()}", band_height=PDF_HEADER_HEIGHT,
+        title_size=16, subtitle_size=10, title_y=0.9*cm, subtitle_y=1.5*cm, pagesize=PDF_PAGESIZE
+    )
+
+    def draw(canvas):
+        header_band.draw(canvas)
+        y = page_height - PDF_HEADER_HEIGHT - 0.8*cm
+        canvas.setFillColor(pdf_layout.LIGHT_GRAY)
+        canvas.rect(PDF_MARGIN, y - 0.15*cm, page_width - 2 * PDF_MARGIN, PDF_ROW_HEIGHT, fill=True, stroke=False)
+        canvas.setFillColor(pdf_layout.GRAY_COLOR)
+        canvas.setFont('Helvetica-Bold', PDF_FONT_SIZE)
+        for index, field in enumerate(fields):
+            label = field.replace('__', ' ').replace('_', ' ').title()
+            canvas.drawString(PDF_MARGIN + index * column_width + 2, y, _fit(canvas, label, column_width - 4))
+
+    return pdf_layout.PageLayout(f'Report{report_type.title()}', draw)
+
+
+def write_pdf(queryset, fields, fileobj, report_type, total_rows=None, on_progress=None, chunk_size=None):
+    """
+    Write the report as a multi-page landscape PDF table into ``fileobj``.
+    Same progress contract as write_csv; returns the number of rows written.
+    """
+    chunk_size = chunk_size or _chunk_size()
+    page_width, page_height = PDF_PAGESIZE
+    column_width = (page_width - 2 * PDF_MARGIN) / len(fields)
+    first_row_y = page_height - PDF_HEADER_HEIGHT - 0.8*cm - PDF_ROW_HEIGHT
+    last_row_y = PDF_MARGIN + 0.8*cm
+    layout = _report_page_layout(report_type, fields)
+    generated_at = timezone.localtime().strftime('%d/%m/%Y %H:%M')
+
+    p = pdf_canvas.Canvas(fileobj, pagesize=PDF_PAGESIZE)
+    p.setTitle(f"Relatório {report_type}")
+    page = 0
+
+    def start_page():
+        nonlocal page
+        page += 1
+        layout.stamp(p)
+        p.setFont('Helvetica', PDF_FONT_SIZE)
+        p.setFillColor(pdf_layout.GRAY_COLOR)
+        summary = f"Gerado em: {generated_at}"
+        if total_rows is not None:
+            summary += f" | Total de registros: {total_rows}"
+        p.drawString(PDF_MARGIN, PDF_MARGIN, summary)
+        p.drawRightString(page_width - PDF_MARGIN, PDF_MARGIN, f"Página {page}")
+        p.setFillColorRGB(0, 0, 0)
+        return first_row_y
+
+    y = start_page()
+    rows = 0
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        if y < last_row_y:
+            p.showPage()
+            y = start_page()
+        for index, value in enumerate(row):
+            p.drawString(
+                PDF_MARGIN + index * column_width + 2, y,
+                _fit(p, _pdf_value(value), column_width - 4)
+            )
+        y -= PDF_ROW_HEIGHT
+        rows += 1
+        if on_progress and rows % chunk_size == 0:
+            on_progress(rows)
+
+    p.showPage()
+    p.save()
+    return rows
@@ -0,0 +1,280 @@
+"""
+Admin dashboard metrics
+
+The dashboard shows two kinds of numbers:
+
+* current totals (beneficiaries, active providers, pending reimbursements,
+  reimbursed value), computed live with one conditional-aggregation query
+  per table;
+* period counts (new beneficiaries, approved and rejected reimbursements),
+  summed from DashboardDailyMetrics rollup rows for past days plus today's
+  live counts, so a year costs the same as a day.
+
+Periods are whole local calendar days ending today. Rollup rows are written
+by the rollup_dashboard_metrics task shortly after midnight; days missing
+from the rollup table when a period is read are computed on the spot, from
+the first day with any activity on. Every result is cached per period for a
+short time and carries the time it was computed (``snapshot_at``).
+
+Settings:
+    DASHBOARD_METRICS_CACHE_TIMEOUT   seconds a computed result is cached
+    DASHBOARD_METRICS_BACKFILL_DAYS   days the rollup task fills in when the
+                                      table is empty or has a gap, and the
+                                      longest custom range the API accepts
+"""
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.beneficiaries.models import Beneficiary
+from apps.providers.models import AccreditedProvider
+from apps.reimbursements.models import ReimbursementRequest
+
+from .models import DashboardDailyMetrics
+
+
+CACHE_KEY_PREFIX = 'admin:dashboard:metrics'
+FIRST_DAY_CACHE_KEY = f'{CACHE_KEY_PREFIX}:first_day'
+FIRST_DAY_CACHE_TIMEOUT = 86400
+
+# Days covered by each dashboard period, today included
+PERIOD_DAYS = {
+    'today': 1,
+    'week': 7,
+    'month': 30,
+    'year': 365,
+}
+DEFAULT_PERIOD = 'month'
+
+ROLLUP_FIELDS = ['new_beneficiaries', 'approved_reimbursements', 'rejected_reimbursements']
+
+
+def _cache_timeout():
+    return getattr(settings, 'DASHBOARD_METRICS_CACHE_TIMEOUT', 60)
+
+
+def _backfill_days():
+    return getattr(settings, 'DASHBOARD_METRICS_BACKFILL_DAYS', 366)
+
+
+def max_range_days():
+    """Longest range of days a dashboard query may cover"""
+    return _backfill_days()
+
+
+def period_range(period, today=None):
+    """First and last day (inclusive) of a named dashboard period"""
+    today = today or timezone.localdate()
+    days = PERIOD_DAYS.get(period, PERIOD_DAYS[DEFAULT_PERIOD])
+    return today - datetime.timedelta(days=days - 1), today
+
+
+def _day_bounds(day):
+    """Aware datetimes of the start of ``day`` and of the next day"""
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    end = timezone.make_aware(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time.min))
+    return start, end
+
+
+def current_totals(today=None):
+    """
+    Live totals plus today's period counts: one query per table.
+    Returns (totals, today's counts keyed like the rollup fields).
+    """
+    day_start, day_end = _day_bounds(today or timezone.localdate())
+    analysed_today = Q(analysis_date__gte=day_start, analysis_date__lt=day_end)
+
+    beneficiaries = Beneficiary.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='ACTIVE')),
+        new_today=Count('id', filter=Q(created_at__gte=day_start, created_at__lt=day_end)),
+    )
+    providers = AccreditedProvider.objects.aggregate(
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    reimbursements = ReimbursementRequest.objects.aggregate(
+        pending=Count('id', filter=Q(status='IN_ANALYSIS')),
+        total_value=Sum('approved_amount', filter=Q(status__in=['APPROVED', 'PAID'])),
+        approved_today=Count('id', filter=Q(status='APPROVED') & analysed_today),
+        rejected_today=Count('id', filter=Q(status='DENIED') & analysed_today),
+    )
+
+    totals = {
+        'total_beneficiaries': beneficiaries['total'],
+        'active_beneficiaries': beneficiaries['active'],
+        'total_providers': providers['active'],
+        'pending_reimbursements': reimbursements['pending'],
+        'total_reimbursement_value': reimbursements['total_value'] or 0,
+    }
+    today_counts = {
+        'new_beneficiaries': beneficiaries['new_today'],
+        'approved_reimbursements': reimbursements['approved_today'],
+        'rejected_reimbursements': reimbursements['rejected_today'],
+    }
+    return totals, today_counts
+
+
+def first_activity_day():
+    """
+    First day with a new beneficiary or an analysed reimbursement, or None.
+    Rollup rows before it would all be zero. Cached for a day.
+    """
+    first_day = cache.get(FIRST_DAY_CACHE_KEY)
+    if first_day is None:
+        firsts = [
+            Beneficiary.objects.aggregate(first=Min('created_at'))['first'],
+            ReimbursementRequest.objects.aggregate(first=Min('analysis_date'))['first'],
+        ]
+        firsts = [timezone.localdate(value) for value in firsts if value is not None]
+        if not firsts:
+            return None
+        first_day = min(firsts)
+        cache.set(FIRST_DAY_CACHE_KEY, first_day, FIRST_DAY_CACHE_TIMEOUT)
+    return first_day
+
+
+def rollup_days(date_from, date_to, days=None):
+    """
+    Compute and store the DashboardDailyMetrics rows of every day from
+    ``date_from`` to ``date_to`` (inclusive), or only of ``days`` within that
+    range, replacing existing rows. Days without activity get a zero row so
+    they are not recomputed. Returns the number of rows written.
+    """
+    if date_from > date_to:
+        return 0
+
+    range_start, _ = _day_bounds(date_from)
+    _, range_end = _day_bounds(date_to)
+
+    if days is None:
+        days = [date_from + datetime.timedelta(days=n) for n in range((date_to - date_from).days + 1)]
+    rows = {day: DashboardDailyMetrics(date=day) for day in days}
+    if not rows:
+        return 0
+
+    new_beneficiaries = (
+        Beneficiary.objects
+        .filter(created_at__gte=range_start, created_at__lt=range_end)
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(count=Count('id'))
+    )
+    for row in new_beneficiaries:
+        if row['day'] in rows:
+            rows[row['day']].new_beneficiaries = row['count']
+
+    analysed = (
+        ReimbursementRequest.objects
+        .filter(analysis_date__gte=range_start, analysis_date__lt=range_end)
+        .annotate(day=TruncDate('analysis_date'))
+        .values('day')
+        .annotate(
+            approved=Count('id', filter=Q(status='APPROVED')),
+            rejected=Count('id', filter=Q(status='DENIED')),
+        )
+    )
+    for row in analysed:
+        if row['day'] in rows:
+            rows[row['day']].approved_reimbursements = row['approved']
+            rows[row['day']].rejected_reimbursements = row['rejected']
+
+    DashboardDailyMetrics.objects.bulk_create(
+        rows.values(),
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=ROLLUP_FIELDS + ['computed_at'],
+    )
+    return len(rows)
+
+
+def _rollup_sums(date_from, date_to):
+    return DashboardDailyMetrics.objects.filter(date__range=(date_from, date_to)).aggregate(
+        days=Count('id'),
+        **{field: Sum(field) for field in ROLLUP_FIELDS}
+    )
+
+
+def rolled_up_counts(date_from, date_to):
+    """
+    Period counts from the rollup table, computing first the missing days
+    since the first day with activity (earlier days count zero)
+    """
+    if date_from > date_to:
+        return {field: 0 for field in ROLLUP_FIELDS}
+
+    sums = _rollup_sums(date_from, date_to)
+    if sums['days'] < (date_to - date_from).days + 1:
+        first_day = first_activity_day()
+        fill_from = max(date_from, first_day) if first_day else None
+        if fill_from is not None and fill_from <= date_to:
+            stored = set(
+                DashboardDailyMetrics.objects
+                .filter(date__range=(fill_from, date_to))
+                .values_list('date', flat=True)
+            )
+            missing = [
+                day for day in (fill_from + datetime.timedelta(days=n) for n in range((date_to - fill_from).days + 1))
+                if day not in stored
+            ]
+            if missing:
+                rollup_days(missing[0], missing[-1], days=missing)
+                sums = _rollup_sums(date_from, date_to)
+
+    return {field: sums[field] or 0 for field in ROLLUP_FIELDS}
+
+
+def compute_metrics(date_from, date_to):
+    """Uncached dashboard metrics for the days ``date_from`` to ``date_to``"""
+    today = timezone.localdate()
+    snapshot_at = timezone.now()
+
+    totals, today_counts = current_totals(today)
+    counts = rolled_up_counts(date_from, min(date_to, today - datetime.timedelta(days=1)))
+    if date_from <= today <= date_to:
+        for field in ROLLUP_FIELDS:
+            counts[field] += today_counts[field]
+
+    return {
+        **totals,
+        'approved_this_period': counts['approved_reimbursements'],
+        'rejected_this_period': counts['rejected_reimbursements'],
+        'new_users_this_period': counts['new_beneficiaries'],
+        'period_start': date_from.isoformat(),
+        'period_end': date_to.isoformat(),
+        'snapshot_at': snapshot_at.isoformat(),
+    }
+
+
+def get_metrics(date_from, date_to):
+    """Dashboard metrics for a day range, cached for DASHBOARD_METRICS_CACHE_TIMEOUT"""
+    key = f'{CACHE_KEY_PREFIX}:{date_from.isoformat()}:{date_to.isoformat()}'
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = compute_metrics(date_from, date_to)
+        cache.set(key, metrics, _cache_timeout())
+    return metrics
+
+
+def rollup_pending_days(today=None):
+    """
+    Write the rollup rows of yesterday and of any earlier day missing since
+    the last rollup (at most DASHBOARD_METRICS_BACKFILL_DAYS back).
+    Returns the number of rows written.
+    """
+    today = today or timezone.localdate()
+    yesterday = today - datetime.timedelta(days=1)
+    earliest = today - datetime.timedelta(days=_backfill_days())
+
+    last = (
+        DashboardDailyMetrics.objects
+        .filter(date__gte=earliest, date__lt=yesterday)
+        .order_by('-date')
+        .values_list('date', flat=True)
+        .first()
+    )
+    date_from = last + datetime.timedelta(days=1) if last else earliest
+    return rollup_days(date_from, yesterday)
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('admin_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_type', models.CharField(max_length=30, verbose_name='Report Type')),
+                ('format', models.CharField(max_length=10, verbose_name='Format')),
+                ('parameters', models.JSONField(blank=True, default=dict, verbose_name='Parameters')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('task_id', models.CharField(blank=True, max_length=64, verbose_name='Task ID')),
+                ('total_rows', models.IntegerField(default=0, verbose_name='Total Rows')),
+                ('rows_written', models.IntegerField(default=0, verbose_name='Rows Written')),
+                ('file', models.FileField(blank=True, null=True, upload_to='reports/', verbose_name='File')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Requested By')),
+            ],
+            options={
+                'verbose_name': 'Report Job',
+                'verbose_name_plural': 'Report Jobs',
+                'db_table': 'admin_api_report_job',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['requested_by', 'created_at'], name='admin_api_r_request_a4a108_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_api', '0002_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Date')),
+                ('new_beneficiaries', models.IntegerField(default=0, verbose_name='New Beneficiaries')),
+                ('approved_reimbursements', models.IntegerField(default=0, verbose_name='Approved Reimbursements')),
+                ('rejected_reimbursements', models.IntegerField(default=0, verbose_name='Rejected Reimbursements')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='Computed At')),
+            ],
+            options={
+                'verbose_name': 'Dashboard Daily Metrics',
+                'verbose_name_plural': 'Dashboard Daily Metrics',
+                'db_table': 'admin_api_dashboard_daily_metrics',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
@@ -204,3 +204,132 @@ class SystemConfiguration(models.Model):
 
     def __str__(self):
         return f"{self.key} ({self.get_category_display()})"
+
+
+class ReportJob(models.Model):
+    """Report export generated in the background (apps.admin_api.tasks)"""
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('Pending')
+        RUNNING = 'RUNNING', _('Running')
+        COMPLETED = 'COMPLETED', _('Completed')
+        FAILED = 'FAILED', _('Failed')
+        CANCELLED = 'CANCELLED', _('Cancelled')
+
+    ACTIVE_STATUSES = [Status.PENDING, Status.RUNNING]
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='report_jobs',
+        verbose_name=_('Requested By')
+    )
+    report_type = models.CharField(
+        max_length=30,
+        verbose_name=_('Report Type')
+    )
+    format = models.CharField(
+        max_length=10,
+        verbose_name=_('Format')
+    )
+    parameters = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Parameters')
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('Status')
+    )
+    task_id = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name=_('Task ID')
+    )
+    total_rows = models.IntegerField(
+        default=0,
+        verbose_name=_('Total Rows')
+    )
+    rows_written = models.IntegerField(
+        default=0,
+        verbose_name=_('Rows Written')
+    )
+    file = models.FileField(
+        upload_to='reports/',
+        null=True,
+        blank=True,
+        verbose_name=_('File')
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('Error')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Started At')
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Finished At')
+    )
+
+    class Meta:
+        db_table = 'admin_api_report_job'
+        verbose_name = _('Report Job')
+        verbose_name_plural = _('Report Jobs')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requested_by', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type}.{self.format} - {self.get_status_display()}"
+
+    @property
+    def progress(self):
+        """Percentage of rows written"""
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(int(self.rows_written * 100 / self.total_rows), 99)
+
+
+class DashboardDailyMetrics(models.Model):
+    """Per-day rollup of the dashboard period metrics (apps.admin_api.metrics)"""
+
+    date = models.DateField(
+        unique=True,
+        verbose_name=_('Date')
+    )
+    new_beneficiaries = models.IntegerField(
+        default=0,
+        verbose_name=_('New Beneficiaries')
+    )
+    approved_reimbursements = models.IntegerField(
+        default=0,
+        verbose_name=_('Approved Reimbursements')
+    )
+    rejected_reimbursements = models.IntegerField(
+        default=0,
+        verbose_name=_('Rejected Reimbursements')
+    )
+    computed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Computed At')
+    )
+
+    class Meta:
+        db_table = 'admin_api_dashboard_daily_metrics'
+        verbose_name = _('Dashboard Daily Metrics')
+        verbose_name_plural = _('Dashboard Daily Metrics')
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date:%Y-%m-%d}"
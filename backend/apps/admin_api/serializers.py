@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.urls import reverse
 from apps.beneficiaries.models import Beneficiary, Company, HealthPlan
 from apps.providers.models import AccreditedProvider, Specialty
 from apps.reimbursements.models import ReimbursementRequest, ReimbursementDocument
-from .models import AdminProfile, AuditLog, SystemConfiguration
+from .models import AdminProfile, AuditLog, ReportJob, SystemConfiguration
 
 
 class AdminProfileSerializer(serializers.ModelSerializer):
@@ -38,6 +39,26 @@ class AuditLogSerializer(serializers.ModelSerializer):
         return "Unknown"
 
 
+class ReportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report_type', 'format', 'parameters', 'status', 'progress',
+            'total_rows', 'rows_written', 'error', 'download_url',
+            'created_at', 'started_at', 'finished_at'
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.Status.COMPLETED or not obj.file:
+            return None
+        url = reverse('admin_api:report-job-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
 class SystemConfigurationSerializer(serializers.ModelSerializer):
     class Meta:
         model = SystemConfiguration
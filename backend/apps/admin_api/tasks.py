@@ -0,0 +1,138 @@
+from celery import shared_task
+from django.utils import timezone
+from datetime import timedelta
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def export_report_task(job_id):
+    """
+    Write a ReportJob's report to a file in storage
+
+    Rows are streamed from the database into a temporary file (CSV or a
+    multi-page PDF) and the file is then saved to storage. Progress is stored
+    on the job after every chunk; a job cancelled meanwhile stops at the next
+    chunk. Returns the number of rows written.
+    """
+    from django.core.files import File
+    from apps.admin_api.exports import (
+        ReportCancelled, report_fields, report_queryset, write_csv, write_pdf
+    )
+    from apps.admin_api.models import ReportJob
+
+    Status = ReportJob.Status
+
+    # Claim the job; a job cancelled before it started is skipped
+    claimed = ReportJob.objects.filter(pk=job_id, status=Status.PENDING).update(
+        status=Status.RUNNING, started_at=timezone.now()
+    )
+    if not claimed:
+        logger.info(f"Report job {job_id} is no longer pending; skipping")
+        return 0
+
+    job = ReportJob.objects.get(pk=job_id)
+
+    def on_progress(rows):
+        # Store progress and stop if the job was cancelled
+        if not ReportJob.objects.filter(pk=job_id, status=Status.RUNNING).update(rows_written=rows):
+            raise ReportCancelled()
+
+    try:
+        parameters = job.parameters or {}
+        queryset = report_queryset(
+            job.report_type,
+            parameters.get('date_from'),
+            parameters.get('date_to'),
+            parameters.get('filters')
+        )
+        fields = report_fields(job.report_type)
+
+        with tempfile.TemporaryFile() as output:
+            if job.format == 'csv':
+                rows = write_csv(queryset, fields, output, on_progress=on_progress)
+            else:
+                rows = write_pdf(
+                    queryset, fields, output, job.report_type,
+                    total_rows=job.total_rows, on_progress=on_progress
+                )
+            output.seek(0)
+            job.file.save(f"{job.report_type}_report_{job.pk}.{job.format}", File(output), save=False)
+
+        completed = ReportJob.objects.filter(pk=job_id, status=Status.RUNNING).update(
+            status=Status.COMPLETED,
+            file=job.file.name,
+            rows_written=rows,
+            finished_at=timezone.now()
+        )
+        if not completed:
+            # Cancelled while the file was being saved
+            job.file.delete(save=False)
+            raise ReportCancelled()
+
+        logger.info(f"Report job {job_id} completed: {rows} rows ({job.report_type}.{job.format})")
+        return rows
+
+    except ReportCancelled:
+        logger.info(f"Report job {job_id} cancelled")
+        return 0
+
+    except Exception as e:
+        ReportJob.objects.filter(pk=job_id).update(
+            status=Status.FAILED, error=str(e), finished_at=timezone.now()
+        )
+        logger.error(f"Error in report job {job_id}: {str(e)}")
+        return 0
+
+
+@shared_task
+def cleanup_report_jobs():
+    """
+    Delete finished report jobs and their files after the retention period
+    Runs daily
+    """
+    from django.conf import settings
+    from apps.admin_api.models import ReportJob
+
+    try:
+        retention_days = getattr(settings, 'REPORT_JOB_RETENTION_DAYS', 7)
+        cutoff = timezone.now() - timedelta(days=retention_days)
+
+        expired = ReportJob.objects.exclude(
+            status__in=ReportJob.ACTIVE_STATUSES
+        ).filter(created_at__lt=cutoff)
+
+        count = 0
+        for job in expired.iterator():
+            if job.file:
+                job.file.delete(save=False)
+            job.delete()
+            count += 1
+
+        logger.info(f"Deleted {count} expired report jobs")
+        return count
+
+    except Exception as e:
+        logger.error(f"Error cleaning up report jobs: {str(e)}")
+        return 0
+
+
+@shared_task
+def rollup_dashboard_metrics():
+    """
+    Write the dashboard daily rollup rows of yesterday and of any day
+    missed since the last run
+    Runs daily after midnight
+    """
+    from apps.admin_api.metrics import rollup_pending_days
+
+    try:
+        count = rollup_pending_days()
+        logger.info(f"Rolled up dashboard metrics for {count} days")
+        return count
+
+    except Exception as e:
+        logger.error(f"Error rolling up dashboard metrics: {str(e)}")
+        return 0
@@ -21,6 +21,7 @@ urlpatterns = [
     path('users/', users.UserListCreateView.as_view(), name='user-list'),
     path('users/<int:pk>/', users.UserDetailView.as_view(), name='user-detail'),
     path('users/<int:pk>/deactivate/', users.UserDeactivateView.as_view(), name='user-deactivate'),
+    path('users/<int:pk>/invalidate-cards/', users.UserCardCacheInvalidateView.as_view(), name='user-invalidate-cards'),
 
     # Providers endpoints
     path('providers/', providers.ProviderListView.as_view(), name='provider-list'),
@@ -38,6 +39,10 @@ urlpatterns = [
     # Reports endpoints
     path('reports/generate/', reports.ReportGenerateView.as_view(), name='report-generate'),
     path('reports/export/<str:format>/', reports.ReportExportView.as_view(), name='report-export'),
+    path('reports/jobs/', reports.ReportJobListView.as_view(), name='report-job-list'),
+    path('reports/jobs/<int:pk>/', reports.ReportJobDetailView.as_view(), name='report-job-detail'),
+    path('reports/jobs/<int:pk>/download/', reports.ReportJobDownloadView.as_view(), name='report-job-download'),
+    path('reports/jobs/<int:pk>/cancel/', reports.ReportJobCancelView.as_view(), name='report-job-cancel'),
 
     # Settings endpoints
     path('settings/', settings.SettingsListView.as_view(), name='settings-list'),
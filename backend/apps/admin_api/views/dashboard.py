@@ -2,61 +2,49 @@ from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Sum, Q
-from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_date
 
-from apps.beneficiaries.models import Beneficiary
-from apps.providers.models import AccreditedProvider
-from apps.reimbursements.models import ReimbursementRequest
+from apps.common.pagination import StandardKeysetPagination
+
+from .. import metrics
 from ..models import AuditLog
 from ..serializers import AuditLogSerializer
 from ..permissions import IsAdminUser
 
 
 class DashboardMetricsView(APIView):
-    """Get dashboard metrics"""
+    """
+    Get dashboard metrics
+
+    ``period`` is today, week, month (default) or year; ``date_from`` and
+    ``date_to`` (YYYY-MM-DD) select any other range of days instead, of at
+    most DASHBOARD_METRICS_BACKFILL_DAYS days.
+    """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get(self, request):
-        period = request.query_params.get('period', 'month')
-
-        # Calculate date range
-        now = timezone.now()
-        if period == 'today':
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'year':
-            start_date = now - timedelta(days=365)
-        else:  # month
-            start_date = now - timedelta(days=30)
-
-        # Get metrics
-        metrics = {
-            'total_beneficiaries': Beneficiary.objects.count(),
-            'active_beneficiaries': Beneficiary.objects.filter(status='ACTIVE').count(),
-            'total_providers': AccreditedProvider.objects.filter(is_active=True).count(),
-            'pending_reimbursements': ReimbursementRequest.objects.filter(
-                status='IN_ANALYSIS'
-            ).count(),
-            'total_reimbursement_value': ReimbursementRequest.objects.filter(
-                status__in=['APPROVED', 'PAID']
-            ).aggregate(total=Sum('approved_amount'))['total'] or 0,
-            'approved_this_period': ReimbursementRequest.objects.filter(
-                status='APPROVED',
-                analysis_date__gte=start_date
-            ).count(),
-            'rejected_this_period': ReimbursementRequest.objects.filter(
-                status='DENIED',
-                analysis_date__gte=start_date
-            ).count(),
-            'new_users_this_period': Beneficiary.objects.filter(
-                created_at__gte=start_date
-            ).count(),
-        }
-
-        return Response(metrics)
+        period = request.query_params.get('period', metrics.DEFAULT_PERIOD)
+        date_from, date_to = metrics.period_range(period)
+
+        if 'date_from' in request.query_params or 'date_to' in request.query_params:
+            try:
+                date_from = parse_date(request.query_params.get('date_from', '')) or date_from
+                date_to = parse_date(request.query_params.get('date_to', '')) or date_to
+            except ValueError:
+                date_from = date_to = None
+            if not date_from or not date_to or date_from > date_to:
+                return Response(
+                    {'error': 'Invalid date range'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if (date_to - date_from).days + 1 > metrics.max_range_days():
+                return Response(
+                    {'error': f'Date range longer than {metrics.max_range_days()} days'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            period = 'custom'
+
+        return Response({'period': period, **metrics.get_metrics(date_from, date_to)})
 
 
 class RecentActivityView(APIView):
@@ -77,6 +65,8 @@ class AuditLogListView(generics.ListAPIView):
     """List all audit logs with filtering"""
     permission_classes = [IsAuthenticated, IsAdminUser]
     serializer_class = AuditLogSerializer
+    # The log only grows; keyset pages stay fast however far back they go
+    pagination_class = StandardKeysetPagination
 
     def get_queryset(self):
         queryset = AuditLog.objects.select_related('admin').order_by('-timestamp')
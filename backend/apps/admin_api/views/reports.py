@@ -1,18 +1,33 @@
-import csv
 import io
-from rest_framework import status
+import uuid
+from celery import current_app
+from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.http import HttpResponse
+from django.db import transaction
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
 
 from apps.beneficiaries.models import Beneficiary
-from apps.providers.models import AccreditedProvider
-from apps.reimbursements.models import ReimbursementRequest
+from ..exports import (
+    REPORTS, encode_stream, gzip_stream, report_count, report_fields, report_queryset, stream_csv,
+    write_pdf
+)
+from ..models import ReportJob
+from ..serializers import ReportJobSerializer
+from ..tasks import export_report_task
 from ..permissions import IsAdminUser
 from ..signals import log_admin_action
 
 
+# Rows returned by the report preview
+PREVIEW_LIMIT = 100
+# Exports above this many rows run as background report jobs
+SYNC_EXPORT_LIMIT = 10000
+
+
 class ReportGenerateView(APIView):
     """Generate report data for preview"""
     permission_classes = [IsAuthenticated, IsAdminUser]
@@ -29,65 +44,27 @@ class ReportGenerateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if report_type == 'users':
-            data = self._generate_users_report(date_from, date_to, filters)
-        elif report_type == 'providers':
-            data = self._generate_providers_report(date_from, date_to, filters)
-        elif report_type == 'reimbursements':
-            data = self._generate_reimbursements_report(date_from, date_to, filters)
-        else:
+        if report_type not in REPORTS:
             return Response(
                 {'error': f'Unknown report type: {report_type}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Same query as the export; the preview is a LIMIT on it
+        queryset = report_queryset(report_type, date_from, date_to, filters)
+        data = list(queryset.values(*report_fields(report_type))[:PREVIEW_LIMIT])
+
+        exact = str(request.data.get('exact_count', '')).lower() in ('1', 'true')
+        total, is_estimate = report_count(queryset, exact=exact)
+
         return Response({
             'report_type': report_type,
             'generated_at': str(request._request.META.get('HTTP_DATE', '')),
-            'total_records': len(data),
-            'data': data[:100]  # Return first 100 for preview
+            'total_records': total,
+            'total_is_estimate': is_estimate,
+            'data': data
         })
 
-    def _generate_users_report(self, date_from, date_to, filters):
-        queryset = Beneficiary.objects.all()
-
-        if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
-
-        return list(queryset.values(
-            'registration_number', 'full_name', 'cpf', 'email',
-            'phone', 'status', 'beneficiary_type', 'created_at'
-        ))
-
-    def _generate_providers_report(self, date_from, date_to, filters):
-        queryset = AccreditedProvider.objects.all()
-
-        if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
-
-        return list(queryset.values(
-            'name', 'provider_type', 'cnpj', 'email', 'phone',
-            'city', 'state', 'is_active', 'rating', 'created_at'
-        ))
-
-    def _generate_reimbursements_report(self, date_from, date_to, filters):
-        queryset = ReimbursementRequest.objects.select_related('beneficiary')
-
-        if date_from:
-            queryset = queryset.filter(request_date__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(request_date__date__lte=date_to)
-
-        return list(queryset.values(
-            'protocol_number', 'beneficiary__full_name', 'expense_type',
-            'service_date', 'requested_amount', 'approved_amount',
-            'status', 'request_date'
-        ))
-
 
 class ReportExportView(APIView):
     """Export report to file"""
@@ -105,78 +82,139 @@ class ReportExportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get report data
-        generator = ReportGenerateView()
-        if report_type == 'users':
-            data = generator._generate_users_report(date_from, date_to, filters)
-        elif report_type == 'providers':
-            data = generator._generate_providers_report(date_from, date_to, filters)
-        elif report_type == 'reimbursements':
-            data = generator._generate_reimbursements_report(date_from, date_to, filters)
-        else:
+        if report_type not in REPORTS:
             return Response(
                 {'error': f'Unknown report type: {report_type}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Check for large exports
-        if len(data) > 10000:
-            # Queue background job
-            # from .tasks import export_report_task
-            # job = export_report_task.delay(report_type, format, data, request.user.email)
+        # Count only; rows are streamed from the database when exporting
+        queryset = report_queryset(report_type, date_from, date_to, filters)
+        total = queryset.count()
+
+        if not total:
+            return Response({'error': 'No data to export'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Large exports never run inside the request: queue a report job
+        if total > SYNC_EXPORT_LIMIT:
+            job = ReportJob.objects.create(
+                requested_by=request.user,
+                report_type=report_type,
+                format=format,
+                parameters={'date_from': date_from, 'date_to': date_to, 'filters': filters},
+                total_rows=total,
+                task_id=str(uuid.uuid4())
+            )
+            log_admin_action(
+                request=request,
+                action='EXPORT',
+                entity=job,
+                changes={'report_type': report_type, 'format': format, 'records': total}
+            )
+            transaction.on_commit(
+                lambda: export_report_task.apply_async(args=[job.pk], task_id=job.task_id)
+            )
             return Response({
-                'message': 'Report is being generated. You will receive an email when ready.',
-                'job_id': 'background-job-id'
+                'message': 'Report is being generated in the background.',
+                'job_id': job.pk,
+                'status_url': request.build_absolute_uri(
+                    reverse('admin_api:report-job-detail', args=[job.pk])
+                )
             }, status=status.HTTP_202_ACCEPTED)
 
         # Log export action
         log_admin_action(
             request=request,
             action='EXPORT',
-            entity=Beneficiary.objects.first() if data else None,  # Dummy entity for logging
-            changes={'report_type': report_type, 'format': format, 'records': len(data)}
+            entity=Beneficiary.objects.first(),  # Dummy entity for logging
+            changes={'report_type': report_type, 'format': format, 'records': total}
         )
 
         if format == 'csv':
-            return self._export_csv(data, report_type)
+            return self._export_csv(request, queryset, report_type)
         else:
-            return self._export_pdf(data, report_type)
-
-    def _export_csv(self, data, report_type):
-        if not data:
-            return Response({'error': 'No data to export'}, status=status.HTTP_400_BAD_REQUEST)
+            return self._export_pdf(queryset, total, report_type)
 
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
+    def _export_csv(self, request, queryset, report_type):
+        lines = stream_csv(queryset, report_fields(report_type))
 
-        response = HttpResponse(output.getvalue(), content_type='text/csv')
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = StreamingHttpResponse(gzip_stream(lines), content_type='text/csv')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(encode_stream(lines), content_type='text/csv')
+        response['Vary'] = 'Accept-Encoding'
         response['Content-Disposition'] = f'attachment; filename="{report_type}_report.csv"'
         return response
 
-    def _export_pdf(self, data, report_type):
-        # For now, return a simple response
-        # Full PDF implementation would use ReportLab
-        from django.http import HttpResponse
-        from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
-
+    def _export_pdf(self, queryset, total, report_type):
         buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
+        write_pdf(queryset, report_fields(report_type), buffer, report_type, total_rows=total)
 
-        # Add title
-        p.setFont("Helvetica-Bold", 16)
-        p.drawString(50, 750, f"Relatorio: {report_type.title()}")
+        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{report_type}_report.pdf"'
+        return response
 
-        # Add basic info
-        p.setFont("Helvetica", 12)
-        p.drawString(50, 720, f"Total de registros: {len(data)}")
 
-        p.showPage()
-        p.save()
+class ReportJobMixin:
+    """Report jobs visible to the current admin (superusers see all)"""
+    permission_classes = [IsAuthenticated, IsAdminUser]
 
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{report_type}_report.pdf"'
-        return response
+    def get_queryset(self):
+        queryset = ReportJob.objects.all()
+        if not self.request.user.is_superuser:
+            queryset = queryset.filter(requested_by=self.request.user)
+        return queryset
+
+
+class ReportJobListView(ReportJobMixin, generics.ListAPIView):
+    """List background report jobs"""
+    serializer_class = ReportJobSerializer
+
+
+class ReportJobDetailView(ReportJobMixin, generics.RetrieveAPIView):
+    """Poll the status and progress of a report job"""
+    serializer_class = ReportJobSerializer
+
+
+class ReportJobDownloadView(ReportJobMixin, generics.GenericAPIView):
+    """Download the file of a completed report job"""
+
+    def get(self, request, pk):
+        job = self.get_object()
+        if job.status != ReportJob.Status.COMPLETED or not job.file:
+            return Response(
+                {'error': 'Report is not ready', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        content_type = 'text/csv' if job.format == 'csv' else 'application/pdf'
+        return FileResponse(
+            job.file.open('rb'),
+            as_attachment=True,
+            filename=f'{job.report_type}_report.{job.format}',
+            content_type=content_type
+        )
+
+
+class ReportJobCancelView(ReportJobMixin, generics.GenericAPIView):
+    """Cancel a pending or running report job"""
+
+    def post(self, request, pk):
+        job = self.get_object()
+        cancelled = ReportJob.objects.filter(
+            pk=job.pk, status__in=ReportJob.ACTIVE_STATUSES
+        ).update(status=ReportJob.Status.CANCELLED, finished_at=timezone.now())
+
+        if not cancelled:
+            return Response(
+                {'error': f'Report job is already {job.status.lower()}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # A queued task is dropped; a running one stops at its next chunk
+        if job.task_id:
+            current_app.control.revoke(job.task_id)
+
+        job.refresh_from_db()
+        return Response(ReportJobSerializer(job, context={'request': request}).data)
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
 from apps.beneficiaries.models import Beneficiary
+from apps.common import card_cache
 from ..serializers import (
     BeneficiaryListSerializer,
     BeneficiaryDetailSerializer,
@@ -77,6 +78,7 @@ class UserDetailView(generics.RetrieveUpdateAPIView):
         old_data = BeneficiaryDetailSerializer(self.get_object()).data
         instance = serializer.save()
         new_data = BeneficiaryDetailSerializer(instance).data
+        card_cache.invalidate(instance.cpf)
 
         changes = {
             k: {'old': old_data.get(k), 'new': v}
@@ -108,6 +110,7 @@ class UserDeactivateView(APIView):
         old_status = beneficiary.status
         beneficiary.status = 'CANCELLED'
         beneficiary.save()
+        card_cache.invalidate(beneficiary.cpf)
 
         log_admin_action(
             request=request,
@@ -117,3 +120,32 @@ class UserDeactivateView(APIView):
         )
 
         return Response({'message': 'User deactivated successfully'})
+
+
+class UserCardCacheInvalidateView(APIView):
+    """Drop the cached card data of a user so the next app open reloads it"""
+    permission_classes = [IsAuthenticated, IsAdminUser, CanEditPermission]
+
+    def post(self, request, pk):
+        beneficiary = get_object_or_404(Beneficiary, pk=pk)
+
+        card_type = request.data.get('card_type')
+        if card_type and card_type not in card_cache.CARD_TYPES:
+            return Response(
+                {'error': f'Invalid card_type. Use one of: {", ".join(card_cache.CARD_TYPES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        card_cache.invalidate(beneficiary.cpf, card_type)
+
+        log_admin_action(
+            request=request,
+            action='UPDATE',
+            entity=beneficiary,
+            changes={'card_cache': {'invalidated': card_type or 'all'}}
+        )
+
+        return Response({
+            'message': 'Card cache invalidated successfully',
+            'card_types': [card_type] if card_type else card_cache.CARD_TYPES,
+        })
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Company, HealthPlan, Beneficiary
+from .models import Company, HealthPlan, Beneficiary, CardReplicationRun
 
 
 @admin.register(Company)
@@ -45,3 +45,13 @@ class BeneficiaryAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(CardReplicationRun)
+class CardReplicationRunAdmin(admin.ModelAdmin):
+    list_display = ['started_at', 'status', 'rows_read', 'rows_inserted', 'rows_updated', 'rows_deleted', 'watermark']
+    list_filter = ['status']
+    readonly_fields = [
+        'status', 'started_at', 'finished_at', 'watermark', 'rows_read', 'rows_inserted',
+        'rows_updated', 'rows_deleted', 'rows_unchanged', 'error'
+    ]
@@ -0,0 +1,83 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+OLD_LOOKUP = """
+    SELECT * FROM bench_cards
+    WHERE LPAD(nr_cpf::TEXT, 11, '0') = %s OR nr_cpf::TEXT = %s
+"""
+NEW_LOOKUP = """
+    SELECT * FROM bench_cards
+    WHERE cpf_key = %s
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the old LPAD(nr_cpf) card lookup (sequential scan) with the '
+        'indexed cpf_key lookup on a temporary table of synthetic card rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic card rows (default 1000000)')
+        parser.add_argument('--lookups', type=int, default=50, help='Lookups per variant (default 50)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        lookups = max(options['lookups'], 1)
+
+        # Everything lives in a temporary table inside a rolled-back transaction
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                self.stdout.write(f'Gerando {rows} carteirinhas sintéticas...')
+                cursor.execute("""
+                    CREATE TEMP TABLE bench_cards ON COMMIT DROP AS
+                    SELECT
+                        g AS id,
+                        (10000000000 + g * 7)::NUMERIC(11, 0) AS nr_cpf,
+                        LPAD((10000000000 + g * 7)::TEXT, 11, '0') AS cpf_key,
+                        (ARRAY['CARTEIRINHA', 'UNIMED', 'RECIPROCIDADE'])[1 + g % 3] AS tipo_carteira,
+                        'Beneficiario ' || g AS nome_beneficiario,
+                        'S' AS sn_ativo
+                    FROM generate_series(1, %s) AS g
+                """, [rows])
+                cursor.execute("CREATE INDEX bench_cards_cpf_key ON bench_cards (cpf_key)")
+                cursor.execute("ANALYZE bench_cards")
+
+                cpfs = [
+                    str(10000000000 + random.randint(1, rows) * 7).zfill(11)
+                    for _ in range(lookups)
+                ]
+
+                old = self._measure(cursor, OLD_LOOKUP, [[cpf, cpf.lstrip('0')] for cpf in cpfs])
+                new = self._measure(cursor, NEW_LOOKUP, [[cpf] for cpf in cpfs])
+
+                self._report('LPAD(nr_cpf::TEXT) / nr_cpf::TEXT', old, cursor, OLD_LOOKUP, [cpfs[0], cpfs[0]])
+                self._report('cpf_key (indexado)', new, cursor, NEW_LOOKUP, [cpfs[0]])
+
+                speedup = statistics.mean(old) / max(statistics.mean(new), 1e-6)
+                self.stdout.write(self.style.SUCCESS(f'Ganho médio: {speedup:.0f}x'))
+
+            transaction.set_rollback(True)
+
+    def _measure(self, cursor, query, params_list):
+        timings = []
+        for params in params_list:
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _report(self, label, timings, cursor, query, params):
+        cursor.execute('EXPLAIN ' + query, params)
+        plan = cursor.fetchone()[0]
+        p95 = sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f'{label}: média {statistics.mean(timings):.2f} ms, '
+            f'p95 {p95:.2f} ms, plano: {plan.strip()}'
+        )
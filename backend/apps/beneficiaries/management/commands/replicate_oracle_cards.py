@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.beneficiaries.replication import replicate_cards, ReplicationInProgress
+
+
+class Command(BaseCommand):
+    help = 'Replicate the Oracle unified card view into PostgreSQL'
+
+    def handle(self, *args, **options):
+        try:
+            run = replicate_cards()
+        except ReplicationInProgress as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Replicação concluída: {run.rows_read} lidas, {run.rows_inserted} inseridas, '
+            f'{run.rows_updated} atualizadas, {run.rows_deleted} removidas, '
+            f'{run.rows_unchanged} sem alteração (watermark {run.watermark:%d/%m/%Y %H:%M:%S})'
+        ))
@@ -0,0 +1,249 @@
+# Replicated copy of the Oracle unified card view and replication run log
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0008_add_verification_token_and_onboarding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardReplica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_key', models.CharField(max_length=255, unique=True, verbose_name='Source Key')),
+                ('row_hash', models.CharField(max_length=40, verbose_name='Row Hash')),
+                ('tipo_carteira', models.CharField(max_length=20, verbose_name='Card Type')),
+                ('contrato', models.DecimalField(blank=True, decimal_places=0, max_digits=20, null=True)),
+                ('matricula_soul', models.DecimalField(decimal_places=0, max_digits=20)),
+                ('nr_cpf', models.DecimalField(blank=True, db_index=True, decimal_places=0, max_digits=11, null=True)),
+                ('nome_beneficiario', models.CharField(blank=True, max_length=100, null=True)),
+                ('matricula', models.CharField(blank=True, max_length=20, null=True)),
+                ('nr_cns', models.CharField(blank=True, max_length=100, null=True)),
+                ('nascto', models.CharField(blank=True, max_length=10, null=True)),
+                ('nm_social', models.CharField(blank=True, max_length=100, null=True)),
+                ('sn_ativo', models.CharField(blank=True, max_length=1, null=True)),
+                ('segmentacao', models.CharField(blank=True, max_length=40, null=True)),
+                ('empresa', models.CharField(blank=True, max_length=170, null=True)),
+                ('cd_plano', models.DecimalField(blank=True, decimal_places=0, max_digits=20, null=True)),
+                ('plano_nome', models.CharField(blank=True, max_length=133, null=True)),
+                ('plano_secundario', models.CharField(blank=True, max_length=115, null=True)),
+                ('plano_terciario', models.CharField(blank=True, max_length=111, null=True)),
+                ('tipo_contratacao', models.CharField(blank=True, max_length=20, null=True)),
+                ('data_validade', models.CharField(blank=True, max_length=10, null=True)),
+                ('cpt', models.CharField(blank=True, max_length=13, null=True)),
+                ('layout', models.CharField(blank=True, max_length=13, null=True)),
+                ('nome_titular', models.CharField(blank=True, max_length=100, null=True)),
+                ('matricula_rede', models.CharField(blank=True, max_length=200, null=True)),
+                ('prestador_rede', models.CharField(blank=True, max_length=9, null=True)),
+                ('data_adesao', models.DateField(blank=True, null=True)),
+                ('abrangencia', models.CharField(blank=True, max_length=8, null=True)),
+                ('acomodacao', models.CharField(blank=True, max_length=10, null=True)),
+                ('rede_atendimento', models.CharField(blank=True, max_length=11, null=True)),
+                ('synced_at', models.DateTimeField(verbose_name='Synced At')),
+            ],
+            options={
+                'verbose_name': 'Card Replica',
+                'verbose_name_plural': 'Card Replicas',
+                'db_table': 'esau_app_carteiras_unificadas',
+                'ordering': ['tipo_carteira', 'matricula_soul'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CardReplicationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], default='RUNNING', max_length=20, verbose_name='Status')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('watermark', models.DateTimeField(blank=True, help_text='Oracle snapshot time the replica reflects after this run', null=True, verbose_name='Watermark')),
+                ('rows_read', models.PositiveIntegerField(default=0, verbose_name='Rows Read')),
+                ('rows_inserted', models.PositiveIntegerField(default=0, verbose_name='Rows Inserted')),
+                ('rows_updated', models.PositiveIntegerField(default=0, verbose_name='Rows Updated')),
+                ('rows_deleted', models.PositiveIntegerField(default=0, verbose_name='Rows Deleted')),
+                ('rows_unchanged', models.PositiveIntegerField(default=0, verbose_name='Rows Unchanged')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+            ],
+            options={
+                'verbose_name': 'Card Replication Run',
+                'verbose_name_plural': 'Card Replication Runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+            -- ================================================================
+            -- Seed the replica from the current materialized tables so card
+            -- reads keep working until the first replication run. row_hash is
+            -- left empty, so the first run refreshes every row from Oracle.
+            -- ================================================================
+            INSERT INTO public.esau_app_carteiras_unificadas (
+                source_key, row_hash, tipo_carteira, contrato, matricula_soul,
+                nr_cpf, nome_beneficiario, matricula, nr_cns, nascto, nm_social,
+                sn_ativo, segmentacao, empresa, cd_plano, plano_nome,
+                plano_secundario, plano_terciario, tipo_contratacao,
+                data_validade, cpt, layout, nome_titular, matricula_rede,
+                prestador_rede, data_adesao, abrangencia, acomodacao,
+                rede_atendimento, synced_at
+            )
+            SELECT
+                tipo_carteira || '|' || matricula_soul::TEXT || '|' ||
+                    COALESCE(matricula_rede::TEXT, '') || '|' || COALESCE(prestador_rede::TEXT, ''),
+                '',
+                tipo_carteira, contrato, matricula_soul, nr_cpf,
+                nome_beneficiario, matricula, nr_cns, nascto::TEXT, nm_social,
+                sn_ativo, segmentacao, empresa, cd_plano, plano_nome,
+                plano_secundario, plano_terciario, tipo_contratacao,
+                data_validade, cpt, layout, nome_titular, matricula_rede,
+                prestador_rede, data_adesao, abrangencia, acomodacao,
+                rede_atendimento, NOW()
+            FROM public.v_app_carteiras_unificadas
+            WHERE matricula_soul IS NOT NULL
+            ON CONFLICT (source_key) DO NOTHING;
+
+            -- ================================================================
+            -- Serve the unified view from the replica
+            -- ================================================================
+            DROP VIEW IF EXISTS public.v_app_carteiras_unificadas;
+
+            CREATE VIEW public.v_app_carteiras_unificadas AS
+            SELECT
+                tipo_carteira,
+                contrato,
+                matricula_soul,
+                nr_cpf,
+                nome_beneficiario,
+                matricula,
+                nr_cns,
+                nascto,
+                nm_social,
+                sn_ativo,
+                segmentacao,
+                empresa,
+                cd_plano,
+                plano_nome,
+                plano_secundario,
+                plano_terciario,
+                tipo_contratacao,
+                data_validade,
+                cpt,
+                layout,
+                nome_titular,
+                matricula_rede,
+                prestador_rede,
+                data_adesao,
+                abrangencia,
+                acomodacao,
+                rede_atendimento
+            FROM public.esau_app_carteiras_unificadas
+            WHERE sn_ativo = 'S';
+
+            COMMENT ON VIEW public.v_app_carteiras_unificadas IS
+            'View unificada das carteirinhas. Replicada do Oracle (DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS) pela tarefa replicate_oracle_cards.';
+            """,
+            reverse_sql="""
+            DROP VIEW IF EXISTS public.v_app_carteiras_unificadas;
+
+            CREATE VIEW public.v_app_carteiras_unificadas AS
+            SELECT
+                'CARTEIRINHA' AS tipo_carteira,
+                contrato,
+                matricula_soul,
+                nr_cpf,
+                nome_do_beneficiario AS nome_beneficiario,
+                matricula,
+                nr_cns,
+                nascto,
+                nm_social,
+                sn_ativo,
+                segmentacao,
+                empresa,
+                cd_plano,
+                primario AS plano_nome,
+                secundario AS plano_secundario,
+                terciario AS plano_terciario,
+                contratacao AS tipo_contratacao,
+                validade AS data_validade,
+                cpt,
+                layout,
+                nome_titular,
+                NULL::TEXT AS matricula_rede,
+                NULL::TEXT AS prestador_rede,
+                NULL::DATE AS data_adesao,
+                NULL::TEXT AS abrangencia,
+                NULL::TEXT AS acomodacao,
+                NULL::TEXT AS rede_atendimento
+            FROM public.esau_v_app_carteirinha
+            WHERE sn_ativo = 'S'
+
+            UNION ALL
+
+            SELECT
+                'UNIMED' AS tipo_carteira,
+                contrato,
+                matricula_soul,
+                cpf AS nr_cpf,
+                nome_do_beneficiario AS nome_beneficiario,
+                NULL::VARCHAR AS matricula,
+                nr_cns,
+                nascto,
+                nm_social,
+                sn_ativo,
+                segmentacao,
+                NULL::VARCHAR AS empresa,
+                plano_benef AS cd_plano,
+                plano AS plano_nome,
+                NULL::VARCHAR AS plano_secundario,
+                NULL::VARCHAR AS plano_terciario,
+                contratante AS tipo_contratacao,
+                TO_CHAR(validade, 'DD/MM/YYYY') AS data_validade,
+                NULL::VARCHAR AS cpt,
+                NULL::VARCHAR AS layout,
+                nome_titular,
+                matricula_unimed AS matricula_rede,
+                'UNIMED' AS prestador_rede,
+                vigencia AS data_adesao,
+                abrangencia,
+                acomodacao,
+                rede_atendimento
+            FROM public.esau_v_app_unimed
+            WHERE sn_ativo = 'S'
+
+            UNION ALL
+
+            SELECT
+                'RECIPROCIDADE' AS tipo_carteira,
+                contrato,
+                matricula_soul,
+                nr_cpf,
+                nome_beneficiario,
+                matricula,
+                nr_cns,
+                nascto,
+                nm_social,
+                sn_ativo,
+                NULL::VARCHAR AS segmentacao,
+                NULL::VARCHAR AS empresa,
+                NULL::NUMERIC AS cd_plano,
+                plano_elosaude AS plano_nome,
+                NULL::VARCHAR AS plano_secundario,
+                NULL::VARCHAR AS plano_terciario,
+                NULL::VARCHAR AS tipo_contratacao,
+                TO_CHAR(dt_validade_carteira, 'DD/MM/YYYY') AS data_validade,
+                NULL::VARCHAR AS cpt,
+                NULL::VARCHAR AS layout,
+                NULL::VARCHAR AS nome_titular,
+                cd_matricula_reciprocidade AS matricula_rede,
+                prestador_reciprocidade AS prestador_rede,
+                dt_adesao AS data_adesao,
+                NULL::TEXT AS abrangencia,
+                NULL::TEXT AS acomodacao,
+                NULL::TEXT AS rede_atendimento
+            FROM public.esau_v_app_reciprocidade
+            WHERE sn_ativo = 'S';
+            """
+        ),
+    ]
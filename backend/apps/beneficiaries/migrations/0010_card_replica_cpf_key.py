@@ -0,0 +1,79 @@
+# Indexed, zero-padded CPF key for card lookups
+from django.db import migrations, models
+
+
+VIEW_COLUMNS = """
+                tipo_carteira,
+                contrato,
+                matricula_soul,
+                nr_cpf,
+                nome_beneficiario,
+                matricula,
+                nr_cns,
+                nascto,
+                nm_social,
+                sn_ativo,
+                segmentacao,
+                empresa,
+                cd_plano,
+                plano_nome,
+                plano_secundario,
+                plano_terciario,
+                tipo_contratacao,
+                data_validade,
+                cpt,
+                layout,
+                nome_titular,
+                matricula_rede,
+                prestador_rede,
+                data_adesao,
+                abrangencia,
+                acomodacao,
+                rede_atendimento"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0009_card_replica'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cardreplica',
+            name='nr_cpf',
+            field=models.DecimalField(blank=True, decimal_places=0, max_digits=11, null=True),
+        ),
+        migrations.AddField(
+            model_name='cardreplica',
+            name='cpf_key',
+            field=models.CharField(blank=True, db_index=True, help_text='nr_cpf zero-padded to 11 digits; the indexed lookup column', max_length=11, null=True, verbose_name='CPF Key'),
+        ),
+        migrations.RunSQL(
+            sql="""
+            UPDATE public.esau_app_carteiras_unificadas
+            SET cpf_key = LPAD(nr_cpf::TEXT, 11, '0')
+            WHERE nr_cpf IS NOT NULL;
+
+            -- Views cannot gain a column in the middle, so recreate it
+            DROP VIEW IF EXISTS public.v_app_carteiras_unificadas;
+
+            CREATE VIEW public.v_app_carteiras_unificadas AS
+            SELECT
+                cpf_key,""" + VIEW_COLUMNS + """
+            FROM public.esau_app_carteiras_unificadas
+            WHERE sn_ativo = 'S';
+
+            COMMENT ON VIEW public.v_app_carteiras_unificadas IS
+            'View unificada das carteirinhas. Replicada do Oracle (DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS) pela tarefa replicate_oracle_cards. Filtrar por cpf_key (CPF com 11 dígitos).';
+            """,
+            reverse_sql="""
+            DROP VIEW IF EXISTS public.v_app_carteiras_unificadas;
+
+            CREATE VIEW public.v_app_carteiras_unificadas AS
+            SELECT""" + VIEW_COLUMNS + """
+            FROM public.esau_app_carteiras_unificadas
+            WHERE sn_ativo = 'S';
+            """
+        ),
+    ]
@@ -139,3 +139,92 @@ class Beneficiary(models.Model):
         self.onboarding_completed = True
         self.onboarding_completed_at = timezone.now()
         self.save(update_fields=['onboarding_completed', 'onboarding_completed_at'])
+
+
+class CardReplica(models.Model):
+    """
+    Local copy of DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS, kept in sync by
+    apps.beneficiaries.replication. Backs public.v_app_carteiras_unificadas.
+    """
+    source_key = models.CharField(max_length=255, unique=True, verbose_name=_('Source Key'))
+    row_hash = models.CharField(max_length=40, verbose_name=_('Row Hash'))
+
+    tipo_carteira = models.CharField(max_length=20, verbose_name=_('Card Type'))
+    contrato = models.DecimalField(max_digits=20, decimal_places=0, null=True, blank=True)
+    matricula_soul = models.DecimalField(max_digits=20, decimal_places=0)
+    nr_cpf = models.DecimalField(max_digits=11, decimal_places=0, null=True, blank=True)
+    cpf_key = models.CharField(
+        max_length=11, null=True, blank=True, db_index=True, verbose_name=_('CPF Key'),
+        help_text=_('nr_cpf zero-padded to 11 digits; the indexed lookup column')
+    )
+    nome_beneficiario = models.CharField(max_length=100, null=True, blank=True)
+    matricula = models.CharField(max_length=20, null=True, blank=True)
+    nr_cns = models.CharField(max_length=100, null=True, blank=True)
+    nascto = models.CharField(max_length=10, null=True, blank=True)
+    nm_social = models.CharField(max_length=100, null=True, blank=True)
+    sn_ativo = models.CharField(max_length=1, null=True, blank=True)
+    segmentacao = models.CharField(max_length=40, null=True, blank=True)
+    empresa = models.CharField(max_length=170, null=True, blank=True)
+    cd_plano = models.DecimalField(max_digits=20, decimal_places=0, null=True, blank=True)
+    plano_nome = models.CharField(max_length=133, null=True, blank=True)
+    plano_secundario = models.CharField(max_length=115, null=True, blank=True)
+    plano_terciario = models.CharField(max_length=111, null=True, blank=True)
+    tipo_contratacao = models.CharField(max_length=20, null=True, blank=True)
+    data_validade = models.CharField(max_length=10, null=True, blank=True)
+    cpt = models.CharField(max_length=13, null=True, blank=True)
+    layout = models.CharField(max_length=13, null=True, blank=True)
+    nome_titular = models.CharField(max_length=100, null=True, blank=True)
+    matricula_rede = models.CharField(max_length=200, null=True, blank=True)
+    prestador_rede = models.CharField(max_length=9, null=True, blank=True)
+    data_adesao = models.DateField(null=True, blank=True)
+    abrangencia = models.CharField(max_length=8, null=True, blank=True)
+    acomodacao = models.CharField(max_length=10, null=True, blank=True)
+    rede_atendimento = models.CharField(max_length=11, null=True, blank=True)
+
+    synced_at = models.DateTimeField(verbose_name=_('Synced At'))
+
+    class Meta:
+        db_table = 'esau_app_carteiras_unificadas'
+        verbose_name = _('Card Replica')
+        verbose_name_plural = _('Card Replicas')
+        ordering = ['tipo_carteira', 'matricula_soul']
+
+    def __str__(self):
+        return f"{self.nome_beneficiario} - {self.tipo_carteira}"
+
+
+class CardReplicationRun(models.Model):
+    """One execution of the Oracle card replication job"""
+    STATUS_CHOICES = [
+        ('RUNNING', _('Running')),
+        ('SUCCESS', _('Success')),
+        ('FAILED', _('Failed')),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='RUNNING', verbose_name=_('Status'))
+    started_at = models.DateTimeField(default=timezone.now, verbose_name=_('Started At'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Finished At'))
+    watermark = models.DateTimeField(
+        null=True, blank=True, verbose_name=_('Watermark'),
+        help_text=_('Oracle snapshot time the replica reflects after this run')
+    )
+    rows_read = models.PositiveIntegerField(default=0, verbose_name=_('Rows Read'))
+    rows_inserted = models.PositiveIntegerField(default=0, verbose_name=_('Rows Inserted'))
+    rows_updated = models.PositiveIntegerField(default=0, verbose_name=_('Rows Updated'))
+    rows_deleted = models.PositiveIntegerField(default=0, verbose_name=_('Rows Deleted'))
+    rows_unchanged = models.PositiveIntegerField(default=0, verbose_name=_('Rows Unchanged'))
+    error = models.TextField(blank=True, verbose_name=_('Error'))
+
+    class Meta:
+        verbose_name = _('Card Replication Run')
+        verbose_name_plural = _('Card Replication Runs')
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.started_at:%Y-%m-%d %H:%M} - {self.status}"
+
+    @classmethod
+    def last_watermark(cls):
+        """Watermark of the most recent successful run"""
+        run = cls.objects.filter(status='SUCCESS').exclude(watermark=None).first()
+        return run.watermark if run else None
@@ -0,0 +1,222 @@
+"""
+Incremental replication of the Oracle unified card view into PostgreSQL
+
+Rows of DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS are streamed in batches from a
+pooled Oracle session and upserted into CardReplica, which backs
+public.v_app_carteiras_unificadas. Each row carries a hash of its replicated
+columns, so only new or changed rows are written; rows that disappeared from
+Oracle are deleted once the whole view has been read. Every run is recorded
+in CardReplicationRun with its row counts and watermark.
+
+The Oracle view has no change timestamp, so the watermark is the time the
+run started reading: the replica reflects every Oracle change committed
+before it.
+
+Settings:
+    CARD_REPLICATION_BATCH_SIZE   rows fetched and written per round-trip
+"""
+import datetime
+import hashlib
+import json
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common import card_cache
+from apps.oracle_integration.connection import OracleConnection
+from .models import CardReplica, CardReplicationRun
+
+logger = logging.getLogger(__name__)
+
+
+# Replicated columns, in the order they are selected from Oracle
+COLUMNS = [
+    'tipo_carteira', 'contrato', 'matricula_soul', 'nr_cpf',
+    'nome_beneficiario', 'matricula', 'nr_cns', 'nascto', 'nm_social',
+    'sn_ativo', 'segmentacao', 'empresa', 'cd_plano', 'plano_nome',
+    'plano_secundario', 'plano_terciario', 'tipo_contratacao',
+    'data_validade', 'cpt', 'layout', 'nome_titular', 'matricula_rede',
+    'prestador_rede', 'data_adesao', 'abrangencia', 'acomodacao',
+    'rede_atendimento',
+]
+DECIMAL_COLUMNS = {'contrato', 'matricula_soul', 'nr_cpf', 'cd_plano'}
+DATE_COLUMNS = {'data_adesao'}
+
+SOURCE_QUERY = (
+    "SELECT " + ", ".join(column.upper() for column in COLUMNS) +
+    " FROM DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS"
+)
+
+UPDATE_FIELDS = COLUMNS + ['cpf_key', 'row_hash', 'synced_at']
+
+LOCK_KEY = 'cards:replication:lock'
+LOCK_TIMEOUT = 60 * 60  # seconds; a crashed run must not block replication forever
+
+
+class ReplicationInProgress(Exception):
+    """Raised when another replication run holds the lock"""
+
+
+def _batch_size():
+    return getattr(settings, 'CARD_REPLICATION_BATCH_SIZE', 1000)
+
+
+def _normalize(column, value):
+    """Convert an Oracle value to the type stored in CardReplica"""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='ignore')
+    if column in DECIMAL_COLUMNS:
+        return Decimal(int(value))
+    if column in DATE_COLUMNS:
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        if isinstance(value, datetime.date):
+            return value
+        try:
+            return datetime.datetime.strptime(str(value), '%d/%m/%Y').date()
+        except ValueError:
+            return None
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%d/%m/%Y')
+    return str(value)
+
+
+def _source_key(record):
+    """Natural key of a card: type, Soul registration and network card"""
+    return '|'.join([
+        record['tipo_carteira'] or '',
+        str(record['matricula_soul']),
+        record['matricula_rede'] or '',
+        record['prestador_rede'] or '',
+    ])
+
+
+def row_hash(record):
+    """Stable hash of the replicated columns of a row"""
+    encoded = json.dumps([record[column] for column in COLUMNS], default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _apply_batch(rows, run, seen_keys, touched_cpfs, synced_at):
+    """Upsert one batch of Oracle rows, skipping rows whose hash is unchanged"""
+    records = {}
+    for row in rows:
+        record = {column: _normalize(column, value) for column, value in zip(COLUMNS, row)}
+        if record['matricula_soul'] is None:
+            continue
+        records[_source_key(record)] = record
+
+    existing = {
+        key: (pk, stored_hash)
+        for key, pk, stored_hash in CardReplica.objects.filter(
+            source_key__in=list(records)
+        ).values_list('source_key', 'pk', 'row_hash')
+    }
+
+    to_create = []
+    to_update = []
+    for key, record in records.items():
+        seen_keys.add(key)
+        digest = row_hash(record)
+        current = existing.get(key)
+        cpf_key = card_cache.normalize_cpf(record['nr_cpf']) if record['nr_cpf'] is not None else None
+        if current is None:
+            to_create.append(CardReplica(
+                source_key=key, row_hash=digest, cpf_key=cpf_key, synced_at=synced_at, **record
+            ))
+        elif current[1] != digest:
+            to_update.append(CardReplica(
+                pk=current[0], source_key=key, row_hash=digest, cpf_key=cpf_key,
+                synced_at=synced_at, **record
+            ))
+        else:
+            run.rows_unchanged += 1
+            continue
+        if record['nr_cpf'] is not None:
+            touched_cpfs.add(record['nr_cpf'])
+
+    with transaction.atomic():
+        if to_create:
+            CardReplica.objects.bulk_create(to_create, batch_size=_batch_size())
+        if to_update:
+            CardReplica.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=_batch_size())
+
+    run.rows_read += len(rows)
+    run.rows_inserted += len(to_create)
+    run.rows_updated += len(to_update)
+
+
+def _delete_missing(run, seen_keys, touched_cpfs):
+    """Delete replica rows that were not returned by Oracle in this run"""
+    stale_ids = []
+    for pk, key, cpf in CardReplica.objects.values_list(
+        'pk', 'source_key', 'nr_cpf'
+    ).iterator(chunk_size=_batch_size()):
+        if key not in seen_keys:
+            stale_ids.append(pk)
+            if cpf is not None:
+                touched_cpfs.add(cpf)
+
+    batch_size = _batch_size()
+    for start in range(0, len(stale_ids), batch_size):
+        deleted, _ = CardReplica.objects.filter(pk__in=stale_ids[start:start + batch_size]).delete()
+        run.rows_deleted += deleted
+
+
+def replicate_cards():
+    """
+    Run one replication pass and return the CardReplicationRun.
+    Raises ReplicationInProgress if another run is active.
+    """
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        raise ReplicationInProgress('Card replication is already running')
+
+    run = CardReplicationRun.objects.create()
+    seen_keys = set()
+    touched_cpfs = set()
+    batch_size = _batch_size()
+
+    try:
+        for rows in OracleConnection.stream_query(
+            SOURCE_QUERY, arraysize=batch_size, as_tuples=True, convert=False
+        ):
+            _apply_batch(rows, run, seen_keys, touched_cpfs, timezone.now())
+
+        if run.rows_read:
+            _delete_missing(run, seen_keys, touched_cpfs)
+        else:
+            # An empty read is far more likely an Oracle problem than every
+            # card being cancelled; keep the replica instead of wiping it.
+            logger.warning("Card replication read no rows from Oracle; skipping deletions")
+
+        for cpf in touched_cpfs:
+            card_cache.invalidate(cpf, card_cache.CARD_TYPE_LOCAL)
+
+        run.status = 'SUCCESS'
+        run.watermark = run.started_at
+        run.finished_at = timezone.now()
+        run.save()
+
+        logger.info(
+            "Card replication finished: read=%s inserted=%s updated=%s deleted=%s unchanged=%s",
+            run.rows_read, run.rows_inserted, run.rows_updated,
+            run.rows_deleted, run.rows_unchanged
+        )
+        return run
+
+    except Exception as e:
+        run.status = 'FAILED'
+        run.error = str(e)
+        run.finished_at = timezone.now()
+        run.save()
+        logger.error(f"Card replication failed: {str(e)}")
+        raise
+
+    finally:
+        cache.delete(LOCK_KEY)
@@ -0,0 +1,29 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def replicate_oracle_cards():
+    """
+    Replicate DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS into PostgreSQL
+    Runs every 15 minutes
+    """
+    from apps.beneficiaries.replication import replicate_cards, ReplicationInProgress
+
+    try:
+        run = replicate_cards()
+    except ReplicationInProgress:
+        logger.info("Card replication skipped: previous run still in progress")
+        return None
+
+    return {
+        'run_id': run.id,
+        'watermark': run.watermark.isoformat(),
+        'rows_read': run.rows_read,
+        'inserted': run.rows_inserted,
+        'updated': run.rows_updated,
+        'deleted': run.rows_deleted,
+        'unchanged': run.rows_unchanged,
+    }
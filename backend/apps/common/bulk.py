@@ -0,0 +1,51 @@
+"""
+Set-based state transitions for periodic jobs
+
+``bulk_transition`` moves every row of a queryset to a new status with a
+single ``UPDATE ... RETURNING`` statement and hands back the columns the
+caller needs (ids, beneficiary ids, values for notification messages), so a
+job runs a constant number of queries no matter how many rows change.
+"""
+from django.db import connections
+from django.utils import timezone
+
+
+def bulk_transition(queryset, status, returning=('id',), status_field='status', **values):
+    """
+    Set ``status_field`` to ``status`` (plus any extra ``values``) on every
+    row matched by ``queryset`` and return the changed rows as dicts with the
+    ``returning`` fields. Fields with ``auto_now`` (e.g. ``updated_at``) are
+    refreshed as ``save()`` would.
+    """
+    model = queryset.model
+    opts = model._meta
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+
+    values = {status_field: status, **values}
+    for field in opts.concrete_fields:
+        if getattr(field, 'auto_now', False) and field.name not in values:
+            values[field.name] = timezone.now()
+
+    assignments = []
+    params = []
+    for name, value in values.items():
+        field = opts.get_field(name)
+        assignments.append(f'{qn(field.column)} = %s')
+        params.append(field.get_db_prep_save(value, connection))
+
+    subquery = queryset.values_list('pk', flat=True).order_by()
+    sub_sql, sub_params = subquery.query.get_compiler(using=queryset.db).as_sql()
+    params.extend(sub_params)
+
+    returning_columns = ', '.join(qn(opts.get_field(name).column) for name in returning)
+
+    sql = (
+        f'UPDATE {qn(opts.db_table)} SET {", ".join(assignments)} '
+        f'WHERE {qn(opts.pk.column)} IN ({sub_sql}) '
+        f'RETURNING {returning_columns}'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(returning, row)) for row in cursor.fetchall()]
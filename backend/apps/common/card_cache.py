@@ -0,0 +1,190 @@
+"""
+Read-through cache for beneficiary card data
+
+Card payloads are cached per CPF and card type in two tiers:
+- L1: a small in-process LRU with a short TTL and at most
+  CARD_CACHE_L1_MAX_ENTRIES entries, so repeated app opens served by the
+  same worker skip the network entirely
+- L2: the Django cache (Redis in production), shared by all workers
+
+Concurrent misses for the same key are collapsed: one caller computes the
+payload while the others wait for it (one of a fixed set of striped
+per-process locks plus a short-lived cache lock across processes). Every entry carries an ETag so the mobile app
+can revalidate with If-None-Match and receive 304 responses.
+
+Settings:
+    CARD_CACHE_TTL      L2 time-to-live in seconds
+    CARD_CACHE_L1_TTL   L1 time-to-live in seconds (bounds staleness across
+                        workers after an invalidation)
+    CARD_CACHE_L1_MAX_ENTRIES
+                        L1 size; the least recently used entry is evicted
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# Card payload types served by the API
+CARD_TYPE_ORACLE = 'oracle'            # OracleCardViewSet.my_oracle_cards
+CARD_TYPE_UNIFIED = 'unificadas'       # OracleCarteirasUnificadasViewSet.minhas_carteirinhas
+CARD_TYPE_LOCAL = 'local'              # BeneficiaryViewSet.my_cards
+CARD_TYPES = [CARD_TYPE_ORACLE, CARD_TYPE_UNIFIED, CARD_TYPE_LOCAL]
+
+KEY_PREFIX = 'cards'
+LOCK_TIMEOUT = 30  # seconds a cross-process compute lock is held at most
+LOCK_WAIT = 5  # seconds a waiter polls for the value before computing itself
+LOCK_POLL_INTERVAL = 0.05
+KEY_LOCK_STRIPES = 64  # per-process compute locks; keys share them by hash
+
+_l1 = OrderedDict()
+_l1_lock = threading.Lock()
+_key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+
+
+def normalize_cpf(cpf):
+    """Strip formatting and zero-pad a CPF to 11 digits"""
+    return ''.join(filter(str.isdigit, str(cpf))).zfill(11)
+
+
+def make_key(cpf, card_type):
+    return f'{KEY_PREFIX}:{normalize_cpf(cpf)}:{card_type}'
+
+
+def compute_etag(data):
+    """Strong ETag over the canonical JSON encoding of a payload"""
+    encoded = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode('utf-8')
+    return '"%s"' % hashlib.sha1(encoded).hexdigest()
+
+
+def _ttl():
+    return getattr(settings, 'CARD_CACHE_TTL', 900)
+
+
+def _l1_ttl():
+    return min(getattr(settings, 'CARD_CACHE_L1_TTL', 30), _ttl())
+
+
+def _l1_max_entries():
+    return getattr(settings, 'CARD_CACHE_L1_MAX_ENTRIES', 1000)
+
+
+def _l1_get(key):
+    with _l1_lock:
+        item = _l1.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del _l1[key]
+            return None
+        _l1.move_to_end(key)
+        return entry
+
+
+def _l1_set(key, entry):
+    with _l1_lock:
+        _l1[key] = (time.monotonic() + _l1_ttl(), entry)
+        _l1.move_to_end(key)
+        while len(_l1) > _l1_max_entries():
+            _l1.popitem(last=False)
+
+
+def _key_lock(key):
+    return _key_locks[hash(key) % KEY_LOCK_STRIPES]
+
+
+def get_or_compute(cpf, card_type, compute, cache_if=None):
+    """
+    Return ``(entry, hit)`` for the given CPF and card type.
+
+    ``entry`` is a dict with ``data``, ``etag`` and ``cached_at``. ``compute``
+    is called on a miss and must return the payload; exceptions propagate and
+    nothing is cached. ``cache_if(data)`` may veto storing a payload (e.g.
+    partial results).
+    """
+    key = make_key(cpf, card_type)
+
+    entry = _l1_get(key)
+    if entry is not None:
+        return entry, True
+
+    entry = cache.get(key)
+    if entry is not None:
+        _l1_set(key, entry)
+        return entry, True
+
+    with _key_lock(key):
+        # Another thread in this process may have filled it while we waited
+        entry = _l1_get(key) or cache.get(key)
+        if entry is not None:
+            _l1_set(key, entry)
+            return entry, True
+
+        lock_key = f'{key}:lock'
+        owns_lock = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        if not owns_lock:
+            # Another worker is computing this key; wait briefly for its result
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(key)
+                if entry is not None:
+                    _l1_set(key, entry)
+                    return entry, True
+
+        try:
+            data = compute()
+            entry = {
+                'data': data,
+                'etag': compute_etag(data),
+                'cached_at': time.time(),
+            }
+            if cache_if is None or cache_if(data):
+                cache.set(key, entry, _ttl())
+                _l1_set(key, entry)
+            return entry, False
+        finally:
+            if owns_lock:
+                cache.delete(lock_key)
+
+
+def invalidate(cpf, card_type=None):
+    """
+    Drop cached card payloads for a CPF (all card types unless one is given).
+    Other workers' L1 copies expire within CARD_CACHE_L1_TTL.
+    """
+    card_types = [card_type] if card_type else CARD_TYPES
+    keys = [make_key(cpf, t) for t in card_types]
+    cache.delete_many(keys)
+    with _l1_lock:
+        for key in keys:
+            _l1.pop(key, None)
+    return keys
+
+
+def cached_response(request, entry, hit=None):
+    """
+    Build the HTTP response for a cache entry, honouring If-None-Match.
+    """
+    etag = entry['etag']
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    matches = [tag.strip() for tag in if_none_match.split(',') if tag.strip()]
+
+    if etag in matches or '*' in matches:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry['data'])
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    if hit is not None:
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
@@ -0,0 +1,216 @@
+"""
+Rendered document cache for PDF downloads
+
+Invoices, receipts, guides and tax statements are rendered once per content
+version and stored in the default storage under
+``document_cache/<kind>/<pk>/<version>.pdf``. The version is a hash of the
+values the document depends on (``updated_at`` of the object and of related
+rows printed on it, plus LAYOUT_VERSION), so any relevant change produces a
+new file; older versions are removed when the new one is stored and on model
+saves/deletes. Versioned paths already keep stale files from being served;
+the receivers in the financial, guides and reimbursements ``signals``
+modules (connected from their AppConfig.ready(), so in every process) free
+the storage right away.
+
+The month-end batch (apps.financial.pdf_batch) and the per-document PDF
+tasks (generate_invoice_pdf_task, generate_tax_statement_pdf_task,
+generate_guide_pdf_task) render with the same functions and versions as the
+views and store through here, so downloads find those documents already
+rendered.
+
+The ``invoice_pdf``, ``statement_pdf`` and ``guide_pdf`` FileFields are
+legacy: nothing writes or serves them any more, and files left in them from
+before this cache may be stale.
+
+Downloads are served from storage with ETag / Last-Modified validation and
+single-range ``Range`` support, so repeated downloads and resumed transfers
+never re-render.
+"""
+import hashlib
+import logging
+import re
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the drawing code of any document changes so stored PDFs are re-rendered
+LAYOUT_VERSION = 2
+
+ROOT = 'document_cache'
+
+# Document kinds served by the API
+KIND_INVOICE = 'invoice'                      # InvoiceViewSet.pdf
+KIND_INVOICE_RECEIPT = 'invoice_receipt'      # InvoiceViewSet.receipt_pdf
+KIND_TAX_STATEMENT = 'tax_statement'          # TaxStatementViewSet.pdf
+KIND_GUIDE = 'guide'                          # TISSGuideViewSet.pdf
+KIND_REIMBURSEMENT_RECEIPT = 'reimbursement_receipt'  # ReimbursementRequestViewSet.receipt_pdf
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def content_version(*parts):
+    """Version tag over the values a document depends on"""
+    raw = repr((LAYOUT_VERSION,) + parts).encode('utf-8')
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def _directory(kind, pk):
+    return f'{ROOT}/{kind}/{pk}'
+
+
+def _path(kind, pk, version):
+    return f'{_directory(kind, pk)}/{version}.pdf'
+
+
+def _delete_versions(kind, pk, keep=None):
+    directory = _directory(kind, pk)
+    try:
+        _, files = default_storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return
+    for name in files:
+        if name != keep:
+            default_storage.delete(f'{directory}/{name}')
+
+
+def _save(kind, pk, version, data):
+    path = _path(kind, pk, version)
+    # A concurrent writer may have stored it while we rendered
+    if not default_storage.exists(path):
+        saved = default_storage.save(path, ContentFile(data))
+        if saved != path:
+            # Lost a race against another writer; keep the canonical name
+            default_storage.delete(saved)
+        _delete_versions(kind, pk, keep=f'{version}.pdf')
+    return path
+
+
+def is_stored(kind, pk, version):
+    """Whether this version of the document is already rendered"""
+    return default_storage.exists(_path(kind, pk, version))
+
+
+def get_or_render(kind, pk, version, render):
+    """
+    Return the storage path of the rendered document, calling ``render()``
+    (which must return the PDF bytes) only if this version is not stored yet.
+    """
+    path = _path(kind, pk, version)
+    if default_storage.exists(path):
+        return path
+    return _save(kind, pk, version, render())
+
+
+def store(kind, pk, version, data, replace=False):
+    """
+    Store already rendered bytes as ``version`` of a document (batch
+    rendering). A stored copy of the same version is kept unless ``replace``.
+    """
+    if replace:
+        default_storage.delete(_path(kind, pk, version))
+    return _save(kind, pk, version, data)
+
+
+def invalidate(kind, pk):
+    """Delete every stored version of a document"""
+    _delete_versions(kind, pk)
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in tags or '*' in tags
+
+
+def _modified_time(path):
+    try:
+        return default_storage.get_modified_time(path)
+    except NotImplementedError:
+        return None
+
+
+def _requested_range(request, etag, size):
+    """
+    Return (start, end) for a satisfiable single byte range, None to send
+    the whole file, or False if the range cannot be satisfied.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range.strip() != etag:
+        return None
+
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None  # multi-range or malformed: ignore and send everything
+
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def serve(request, kind, pk, version, render, filename):
+    """
+    Build the download response for a document, rendering it only if the
+    current version is not stored yet. Last-Modified is the time the current
+    version was stored.
+    """
+    etag = f'"{version}"'
+    etag_match = _etag_matches(request, etag)
+
+    if etag_match:
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    path = get_or_render(kind, pk, version, render)
+    last_modified = _modified_time(path)
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if etag_match is None and if_modified_since and last_modified \
+            and int(last_modified.timestamp()) <= if_modified_since:
+        response = HttpResponse(status=304)
+    else:
+        size = default_storage.size(path)
+        byte_range = _requested_range(request, etag, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range is None:
+            response = FileResponse(default_storage.open(path, 'rb'), content_type='application/pdf')
+            response['Content-Length'] = size
+        else:
+            start, end = byte_range
+            with default_storage.open(path, 'rb') as f:
+                f.seek(start)
+                data = f.read(end - start + 1)
+            response = HttpResponse(data, status=206, content_type='application/pdf')
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,9 +1,20 @@
 """
 Custom pagination classes for Elosaúde API
 """
+import binascii
+import datetime
+import json
+import math
+import uuid
+from base64 import b64decode, b64encode
+from decimal import Decimal
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -67,3 +78,192 @@ class LargeResultsSetPagination(PageNumberPagination):
             'page_size': self.get_page_size(self.request),
             'results': data
         })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination, opt-in per view with ``pagination_class``
+
+    Pages are fetched with ``WHERE (ordering columns) after/before the
+    cursor row`` instead of OFFSET, so every page costs the same index seek
+    however deep it is. The ordering is the queryset's (e.g. set by
+    OrderingFilter), else the model's default ordering, else ``ordering``
+    below; the primary key is appended as a tiebreaker unless the view sets
+    ``keyset_ordering`` to columns that are already unique.
+
+    The response keeps the envelope of the page number classes. ``next``
+    and ``previous`` carry opaque cursors, ``count`` and ``total_pages``
+    are only computed on the first page (``None`` afterwards, or always
+    with ``count_first_page = False``). Ordering columns must not be NULL.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at',)
+    count_first_page = True
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        values, reverse, self.page_number = self.decode_cursor(request, queryset.model)
+
+        self.count = None
+        if values is None and self.count_first_page:
+            self.count = queryset.count()
+
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+        ordering = [_flip(field) for field in self.ordering] if reverse else self.ordering
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', None)
+        if ordering:
+            return list(ordering)
+
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or self.ordering)
+        assert all(isinstance(field, str) for field in ordering), (
+            'KeysetPagination only supports ordering by field names; set keyset_ordering on the view.'
+        )
+        if not {'pk', '-pk', 'id', '-id'}.intersection(ordering):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return ordering
+
+    def _seek(self, values, reverse):
+        """Q for the rows after (before, if ``reverse``) the cursor row in ``self.ordering``"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            condition |= equal & Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _values(self, obj):
+        values = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, values, reverse, page_number):
+        payload = json.dumps({'v': values, 'r': reverse, 'n': page_number}, default=_cursor_value)
+        cursor = b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """(cursor row values, reverse, page number) of the requested page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False, 1
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if len(payload['v']) != len(self.ordering):
+                raise ValueError('cursor does not match the ordering')
+            values = [
+                _field(model, field).to_python(value)
+                for field, value in zip(self.ordering, payload['v'])
+            ]
+            return values, bool(payload['r']), max(int(payload['n']), 1)
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._values(self.page[-1]), False, self.page_number + 1)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._values(self.page[0]), True, max(self.page_number - 1, 1))
+
+    def get_paginated_response(self, data):
+        total_pages = None
+        if self.count is not None:
+            total_pages = max(math.ceil(self.count / self.page_size), 1)
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'total_pages': total_pages,
+            'current_page': self.page_number,
+            'page_size': self.page_size,
+            'results': data
+        })
+
+
+def _cursor_value(value):
+    # Full precision: a truncated timestamp would skip or repeat rows
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} cannot be used in a keyset cursor')
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _field(model, path):
+    """Model field at the end of an ordering path such as ``-beneficiary__created_at``"""
+    names = path.lstrip('-').split('__')
+    for name in names[:-1]:
+        model = model._meta.get_field(name).related_model
+    name = names[-1]
+    return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+
+class StandardKeysetPagination(KeysetPagination):
+    """
+    Keyset counterpart of StandardResultsSetPagination
+    Default: 20 items per page
+    """
+    page_size = 20
+    max_page_size = 100
+
+
+class SmallKeysetPagination(KeysetPagination):
+    """
+    Keyset counterpart of SmallResultsSetPagination
+    Default: 10 items per page
+    """
+    page_size = 10
+    max_page_size = 50
+
+
+class LargeKeysetPagination(KeysetPagination):
+    """
+    Keyset counterpart of LargeResultsSetPagination
+    Default: 50 items per page
+    """
+    page_size = 50
+    max_page_size = 200
@@ -0,0 +1,82 @@
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.beneficiaries.models import Beneficiary, HealthPlan
+from apps.financial.models import Invoice, TaxStatement
+from apps.financial.pdf import generate_invoice_pdf, generate_tax_statement_pdf
+from apps.utils import pdf_layout
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure invoice and tax statement PDFs rendered per second with the '
+        'compiled page layouts and with the per-document baseline (static parts '
+        'drawn on every page). No database access.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=200, help='Documents per variant (default 200)')
+        parser.add_argument('--rounds', type=int, default=3, help='Rounds per variant; the best is reported (default 3)')
+
+    def handle(self, *args, **options):
+        documents = max(options['documents'], 1)
+        rounds = max(options['rounds'], 1)
+
+        plan = HealthPlan(name='Plano Benchmark', monthly_fee=Decimal('450.00'))
+        invoices = []
+        statements = []
+        for i in range(documents):
+            beneficiary = Beneficiary(
+                pk=i + 1,
+                full_name=f'Beneficiario {i}',
+                cpf=str(10000000000 + i),
+                registration_number=f'BENCH{i:06d}',
+                health_plan=plan,
+            )
+            invoices.append(Invoice(
+                pk=i + 1,
+                beneficiary=beneficiary,
+                reference_month='01/2026',
+                amount=Decimal('675.00'),
+                due_date=date(2026, 1, 10),
+                status='OPEN',
+                barcode='0' * 44,
+                digitable_line='0' * 47,
+            ))
+            statements.append(TaxStatement(
+                pk=i + 1,
+                beneficiary=beneficiary,
+                year=2025,
+                total_paid=Decimal('5400.00'),
+                deductible_amount=Decimal('5400.00'),
+                monthly_breakdown={f'{month:02d}': 450.0 for month in range(1, 13)},
+            ))
+
+        for label, render, objects in [
+            ('Faturas', generate_invoice_pdf, invoices),
+            ('Informes IR', generate_tax_statement_pdf, statements),
+        ]:
+            baseline = self._measure(render, objects, rounds, compiled=False)
+            compiled = self._measure(render, objects, rounds, compiled=True)
+            self.stdout.write(
+                f'{label}: antes {baseline:.1f} documentos/s, depois {compiled:.1f} documentos/s '
+                f'({compiled / max(baseline, 1e-6):.2f}x)'
+            )
+
+    def _measure(self, render, objects, rounds, compiled):
+        """Best documents/second over ``rounds`` passes"""
+        rates = []
+        try:
+            pdf_layout.PageLayout.compiled = compiled
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for obj in objects:
+                    render(obj)
+                elapsed = time.perf_counter() - start
+                rates.append(len(objects) / max(elapsed, 1e-6))
+        finally:
+            pdf_layout.PageLayout.compiled = True
+        return max(rates)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.financial.models import Invoice, TaxStatement
+from apps.financial.pdf_batch import render_invoices, render_tax_statements
+
+
+class Command(BaseCommand):
+    help = 'Render invoice or tax statement PDFs in bulk across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('document', choices=['invoices', 'tax-statements'])
+        parser.add_argument('--month', help='Invoice reference month MM/YYYY (default: current)')
+        parser.add_argument('--year', type=int, help='Tax statement year (default: previous)')
+        parser.add_argument('--workers', type=int, help='Rendering processes (default: PDF_RENDER_WORKERS or CPUs)')
+        parser.add_argument('--chunk-size', type=int, help='Documents per chunk (default: PDF_RENDER_CHUNK_SIZE)')
+        parser.add_argument('--overwrite', action='store_true', help='Re-render documents already stored in the document cache')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        kwargs = {
+            'overwrite': options['overwrite'],
+            'workers': options['workers'],
+            'chunk_size': options['chunk_size'],
+        }
+
+        if options['document'] == 'invoices':
+            month = options['month'] or now.strftime('%m/%Y')
+            if not Invoice.objects.filter(reference_month=month).exists():
+                raise CommandError(f'Nenhuma fatura para {month}')
+            report = render_invoices(Invoice.objects.filter(reference_month=month), **kwargs)
+        else:
+            year = options['year'] or now.year - 1
+            report = render_tax_statements(TaxStatement.objects.filter(year=year), **kwargs)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['rendered']} PDFs gerados, {report['skipped']} já armazenados, {report['failed']} falhas em "
+            f"{report['elapsed_seconds']}s ({report['per_second']} documentos/s, "
+            f"{report['workers']} processos)"
+        ))
@@ -1,252 +1,342 @@
 """
-PDF Generator for Invoices and Tax Statements
+PDF layouts of invoices and tax statements
+
+These are the only invoice and tax statement layouts: the API downloads
+(InvoiceViewSet.pdf, TaxStatementViewSet.pdf), the month-end batch
+(apps.financial.pdf_batch) and the per-document tasks all draw with them and
+store the result through apps.common.document_cache under the version given
+by invoice_version / tax_statement_version.
 """
+from io import BytesIO
+from datetime import datetime
+
+from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from apps.utils.pdf_generator import PDFGenerator, format_currency, format_date
-from decimal import Decimal
-
-
-class InvoicePDFGenerator(PDFGenerator):
-    """Generate PDF for Invoices"""
-
-    def __init__(self, invoice):
-        super().__init__(title=f"Fatura - {invoice.reference_month}")
-        self.invoice = invoice
-
-    def generate(self):
-        """Generate the PDF and return bytes"""
-        doc = self.create_document()
-
-        # Build content
-        story = []
-
-        # Title
-        story.append(Paragraph("FATURA MENSAL", self.styles['Title']))
-        story.append(Spacer(1, 0.5*cm))
-
-        # Invoice Information
-        story.append(Paragraph("Dados da Fatura", self.styles['Subtitle']))
-        invoice_data = [
-            ['Referência:', self.invoice.reference_month],
-            ['Vencimento:', format_date(self.invoice.due_date)],
-            ['Status:', self.invoice.get_status_display()],
-        ]
-
-        if self.invoice.payment_date:
-            invoice_data.append(['Data de Pagamento:', format_date(self.invoice.payment_date)])
-
-        invoice_table = Table(invoice_data, colWidths=[5*cm, 12*cm])
-        invoice_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(invoice_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Beneficiary Information
-        story.append(Paragraph("Beneficiário", self.styles['Subtitle']))
-        beneficiary_data = [
-            ['Nome:', self.invoice.beneficiary.full_name],
-            ['CPF:', self.invoice.beneficiary.cpf],
-            ['Matrícula:', self.invoice.beneficiary.registration_number],
-            ['Plano:', self.invoice.beneficiary.health_plan.name if self.invoice.beneficiary.health_plan else 'N/A'],
-        ]
-
-        beneficiary_table = Table(beneficiary_data, colWidths=[5*cm, 12*cm])
-        beneficiary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(beneficiary_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Amount Details
-        story.append(Paragraph("Valores", self.styles['Subtitle']))
-
-        # Calculate totals
-        monthly_fee = self.invoice.beneficiary.health_plan.monthly_fee if self.invoice.beneficiary.health_plan else Decimal('0')
-        discount = self.invoice.discount or Decimal('0')
-        late_fee = self.invoice.late_fee or Decimal('0')
-
-        amount_data = [
-            ['Mensalidade do Plano:', format_currency(monthly_fee)],
-            ['Desconto:', format_currency(discount)],
-            ['Multa/Juros:', format_currency(late_fee)],
-            ['', ''],
-            ['TOTAL A PAGAR:', format_currency(self.invoice.amount)],
-        ]
-
-        amount_table = Table(amount_data, colWidths=[12*cm, 5*cm])
-        amount_table.setStyle(TableStyle([
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, 2), 'Helvetica'),
-            ('FONTNAME', (0, 4), (0, 4), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('FONTSIZE', (0, 4), (-1, 4), 12),
-            ('BACKGROUND', (0, 4), (-1, 4), colors.HexColor('#007AFF')),
-            ('TEXTCOLOR', (0, 4), (-1, 4), colors.whitesmoke),
-            ('GRID', (0, 0), (-1, 2), 0.5, colors.grey),
-            ('GRID', (0, 4), (-1, 4), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(amount_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Payment Information
-        if self.invoice.barcode or self.invoice.digitable_line:
-            story.append(Paragraph("Dados para Pagamento", self.styles['Subtitle']))
-
-            if self.invoice.digitable_line:
-                story.append(Paragraph(f"<b>Linha Digitável:</b>", self.styles['Normal']))
-                story.append(Paragraph(f"<font face='Courier'>{self.invoice.digitable_line}</font>", self.styles['Normal']))
-                story.append(Spacer(1, 0.3*cm))
-
-            if self.invoice.barcode:
-                story.append(Paragraph(f"<b>Código de Barras:</b>", self.styles['Normal']))
-                story.append(Paragraph(f"<font face='Courier'>{self.invoice.barcode}</font>", self.styles['Normal']))
-
-        # Build PDF
-        doc.build(story, onFirstPage=self.create_header, onLaterPages=self.create_header)
-
-        return self.get_value()
-
-
-class TaxStatementPDFGenerator(PDFGenerator):
-    """Generate PDF for Tax Statements"""
-
-    def __init__(self, statement):
-        super().__init__(title=f"Declaração IR - {statement.year}")
-        self.statement = statement
-
-    def generate(self):
-        """Generate the PDF and return bytes"""
-        doc = self.create_document()
-
-        # Build content
-        story = []
-
-        # Title
-        story.append(Paragraph(f"DECLARAÇÃO DE IMPOSTO DE RENDA - {self.statement.year}", self.styles['Title']))
-        story.append(Spacer(1, 0.5*cm))
-
-        # Beneficiary Information
-        story.append(Paragraph("Dados do Beneficiário", self.styles['Subtitle']))
-        beneficiary_data = [
-            ['Nome:', self.statement.beneficiary.full_name],
-            ['CPF:', self.statement.beneficiary.cpf],
-            ['Ano de Referência:', str(self.statement.year)],
-        ]
-
-        beneficiary_table = Table(beneficiary_data, colWidths=[5*cm, 12*cm])
-        beneficiary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(beneficiary_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Summary
-        story.append(Paragraph("Resumo Anual", self.styles['Subtitle']))
-        summary_data = [
-            ['Total Pago no Ano:', format_currency(self.statement.total_paid)],
-            ['Valor Dedutível (IR):', format_currency(self.statement.deductible_amount)],
-        ]
-
-        summary_table = Table(summary_data, colWidths=[10*cm, 7*cm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Monthly Breakdown
-        story.append(Paragraph("Detalhamento Mensal", self.styles['Subtitle']))
-
-        monthly_data = [['Mês', 'Valor Pago']]
-        months = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-                  'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
-
-        monthly_breakdown = self.statement.monthly_breakdown or {}
-        total = Decimal('0')
-
-        for i, month in enumerate(months, 1):
-            amount = Decimal(str(monthly_breakdown.get(str(i), 0)))
-            monthly_data.append([month, format_currency(amount)])
-            total += amount
-
-        monthly_data.append(['TOTAL', format_currency(total)])
-
-        monthly_table = Table(monthly_data, colWidths=[12*cm, 5*cm])
-        monthly_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#007AFF')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#F0F0F0')),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(monthly_table)
-
-        # Build PDF
-        doc.build(story, onFirstPage=self.create_header, onLaterPages=self.create_header)
-
-        return self.get_value()
+
+from apps.common import document_cache
+from apps.utils import pdf_layout
+from .models import Invoice
+
+
+def invoice_version(invoice):
+    """document_cache version of an invoice PDF (what generate_invoice_pdf prints)"""
+    return document_cache.content_version(invoice.updated_at, invoice.beneficiary.updated_at)
+
+
+def tax_statement_version(statement):
+    """document_cache version of a tax statement PDF"""
+    return document_cache.content_version(statement.updated_at, statement.beneficiary.updated_at)
 
 
 def generate_invoice_pdf(invoice):
-    """Helper function to generate invoice PDF"""
-    generator = InvoicePDFGenerator(invoice)
-    return generator.generate()
+    """Draw the invoice PDF and return its bytes"""
+    beneficiary = invoice.beneficiary
+
+    # Create PDF in memory
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    # Colors
+    gray_color = pdf_layout.GRAY_COLOR
+    light_gray = pdf_layout.LIGHT_GRAY
+
+    # Header
+    pdf_layout.header_band(subtitle="Fatura de Plano de Saúde", subtitle_size=12).stamp(p)
+
+    # Invoice status badge
+    y_pos = height - 4*cm
+    status_colors = {
+        'OPEN': colors.HexColor('#FF9800'),
+        'PAID': colors.HexColor('#4CAF50'),
+        'OVERDUE': colors.HexColor('#F44336'),
+        'CANCELLED': colors.HexColor('#9E9E9E')
+    }
+    status_bg = status_colors.get(invoice.status, gray_color)
+    p.setFillColor(status_bg)
+    p.roundRect(2*cm, y_pos, 3*cm, 0.7*cm, 0.2*cm, fill=True, stroke=False)
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica-Bold", 10)
+    status_text = dict(Invoice.STATUS_CHOICES).get(invoice.status, invoice.status)
+    p.drawString(2.3*cm, y_pos + 0.2*cm, status_text)
+
+    # Invoice details
+    y_pos -= 1.5*cm
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_pos, "Informações da Fatura")
+
+    y_pos -= 0.8*cm
+    p.setFont("Helvetica", 10)
+    details = [
+        ("Mês de Referência:", invoice.reference_month),
+        ("Vencimento:", invoice.due_date.strftime('%d/%m/%Y')),
+        ("Valor:", f"R$ {invoice.amount:,.2f}"),
+    ]
+    if invoice.payment_date:
+        details.append(("Data de Pagamento:", invoice.payment_date.strftime('%d/%m/%Y')))
+
+    for label, value in details:
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(2*cm, y_pos, label)
+        p.setFont("Helvetica", 10)
+        p.drawString(7*cm, y_pos, str(value))
+        y_pos -= 0.6*cm
+
+    # Beneficiary information
+    y_pos -= 1*cm
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_pos, "Dados do Beneficiário")
+
+    y_pos -= 0.8*cm
+    p.setFont("Helvetica", 10)
+    ben_details = [
+        ("Nome:", beneficiary.full_name),
+        ("CPF:", beneficiary.cpf),
+        ("Carteirinha:", f"{beneficiary.card_number if hasattr(beneficiary, 'card_number') else 'N/A'}"),
+    ]
+
+    for label, value in ben_details:
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(2*cm, y_pos, label)
+        p.setFont("Helvetica", 10)
+        p.drawString(7*cm, y_pos, str(value))
+        y_pos -= 0.6*cm
+
+    # Payment information (barcode and digitable line)
+    y_pos -= 1*cm
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_pos, "Formas de Pagamento")
+
+    y_pos -= 1*cm
+    # Digitable line box
+    p.setFillColor(light_gray)
+    p.rect(2*cm, y_pos - 1.2*cm, width - 4*cm, 1.5*cm, fill=True, stroke=True)
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 9)
+    p.drawString(2.5*cm, y_pos - 0.4*cm, "Linha Digitável:")
+    p.setFont("Courier", 8)
+    p.drawString(2.5*cm, y_pos - 0.9*cm, invoice.digitable_line)
+
+    # Barcode
+    y_pos -= 2*cm
+    p.setFont("Helvetica-Bold", 9)
+    p.drawString(2.5*cm, y_pos, "Código de Barras:")
+    p.setFont("Courier", 7)
+    p.drawString(2.5*cm, y_pos - 0.5*cm, invoice.barcode)
+
+    # Payment methods
+    y_pos -= 1.5*cm
+    p.setFont("Helvetica", 9)
+    p.drawString(2*cm, y_pos, "• Pague no aplicativo ou site do seu banco")
+    y_pos -= 0.5*cm
+    p.drawString(2*cm, y_pos, "• Utilize a linha digitável ou código de barras")
+    y_pos -= 0.5*cm
+    p.drawString(2*cm, y_pos, "• PIX: Use o QR Code disponível no app Elosaúde")
+
+    # Important notes
+    y_pos -= 2*cm
+    p.setFillColor(colors.HexColor('#FFF3E0'))
+    p.rect(2*cm, y_pos - 2*cm, width - 4*cm, 2.5*cm, fill=True, stroke=True)
+    p.setFillColor(colors.HexColor('#E65100'))
+    p.setFont("Helvetica-Bold", 10)
+    p.drawString(2.5*cm, y_pos - 0.5*cm, "IMPORTANTE:")
+    p.setFont("Helvetica", 8)
+    p.setFillColor(colors.black)
+    notes = [
+        "• Fatura vencida está sujeita a juros e multa",
+        "• Em caso de dúvidas, entre em contato: (11) 3000-0000",
+        "• Email: financeiro@elosaude.com.br",
+        "• Mantenha seu plano ativo para garantir cobertura"
+    ]
+    y_note = y_pos - 1*cm
+    for note in notes:
+        p.drawString(2.7*cm, y_note, note)
+        y_note -= 0.5*cm
+
+    # Footer
+    p.setFont("Helvetica", 8)
+    p.setFillColor(gray_color)
+    p.drawString(2*cm, 1.5*cm, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+    pdf_layout.footer_lines((pdf_layout.COMPANY_LINE,), 1*cm).stamp(p)
+
+    # Save PDF
+    p.showPage()
+    p.save()
+
+    # Get PDF data
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
 
 
 def generate_tax_statement_pdf(statement):
-    """Helper function to generate tax statement PDF"""
-    generator = TaxStatementPDFGenerator(statement)
-    return generator.generate()
+    """Draw the tax statement PDF and return its bytes"""
+    beneficiary = statement.beneficiary
+
+    # Create PDF in memory
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    # Colors
+    primary_color = pdf_layout.PRIMARY_COLOR
+    gray_color = pdf_layout.GRAY_COLOR
+    light_gray = pdf_layout.LIGHT_GRAY
+
+    # Header (static band compiled once per document; the subtitle varies)
+    pdf_layout.header_band().stamp(p)
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica", 14)
+    p.drawString(2*cm, height - 2.5*cm, f"Informe de Rendimentos - Ano {statement.year}")
+
+    # Year badge
+    y_pos = height - 4.5*cm
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(2*cm, y_pos, f"Ano-base: {statement.year}")
+
+    # Summary box
+    y_pos -= 1.5*cm
+    p.setFillColor(light_gray)
+    p.rect(2*cm, y_pos - 2.5*cm, width - 4*cm, 3*cm, fill=True, stroke=True)
+
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 12)
+    p.drawString(2.5*cm, y_pos - 0.5*cm, "RESUMO ANUAL")
+
+    y_pos -= 1.2*cm
+    p.setFont("Helvetica-Bold", 10)
+    p.drawString(2.5*cm, y_pos, "Total Pago:")
+    p.setFont("Helvetica", 10)
+    p.drawString(10*cm, y_pos, f"R$ {statement.total_paid:,.2f}")
+
+    y_pos -= 0.7*cm
+    p.setFont("Helvetica-Bold", 10)
+    p.drawString(2.5*cm, y_pos, "Valor Dedutível (IR):")
+    p.setFont("Helvetica", 10)
+    p.drawString(10*cm, y_pos, f"R$ {statement.deductible_amount:,.2f}")
+
+    # Beneficiary information
+    y_pos -= 2*cm
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_pos, "Dados do Beneficiário")
+
+    y_pos -= 0.8*cm
+    p.setFont("Helvetica", 10)
+    ben_details = [
+        ("Nome:", beneficiary.full_name),
+        ("CPF:", beneficiary.cpf),
+        ("Data de Nascimento:", beneficiary.birth_date.strftime('%d/%m/%Y') if beneficiary.birth_date else 'N/A'),
+    ]
+
+    for label, value in ben_details:
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(2*cm, y_pos, label)
+        p.setFont("Helvetica", 10)
+        p.drawString(7*cm, y_pos, str(value))
+        y_pos -= 0.6*cm
+
+    # Monthly breakdown table
+    y_pos -= 1.5*cm
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_pos, "Discriminação Mensal")
+
+    y_pos -= 0.8*cm
+
+    # Create table data
+    months_pt = {
+        '01': 'Janeiro', '02': 'Fevereiro', '03': 'Março', '04': 'Abril',
+        '05': 'Maio', '06': 'Junho', '07': 'Julho', '08': 'Agosto',
+        '09': 'Setembro', '10': 'Outubro', '11': 'Novembro', '12': 'Dezembro'
+    }
+
+    table_data = [['Mês', 'Valor Pago']]
+    for month, amount in sorted(statement.monthly_breakdown.items()):
+        month_name = months_pt.get(month, month)
+        table_data.append([month_name, f"R$ {float(amount):,.2f}"])
+
+    # Draw table
+    col_widths = [8*cm, 6*cm]
+    row_height = 0.6*cm
+    table_width = sum(col_widths)
+
+    # Table header
+    p.setFillColor(primary_color)
+    p.rect(2*cm, y_pos - row_height, table_width, row_height, fill=True, stroke=True)
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica-Bold", 10)
+    p.drawString(2.3*cm, y_pos - row_height + 0.15*cm, table_data[0][0])
+    p.drawString(10.3*cm, y_pos - row_height + 0.15*cm, table_data[0][1])
+
+    # Table rows
+    y_pos -= row_height
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica", 9)
+
+    for i, row in enumerate(table_data[1:], 1):
+        # Alternate row colors
+        if i % 2 == 0:
+            p.setFillColor(light_gray)
+            p.rect(2*cm, y_pos - row_height, table_width, row_height, fill=True, stroke=True)
+        else:
+            p.rect(2*cm, y_pos - row_height, table_width, row_height, fill=False, stroke=True)
+
+        p.setFillColor(colors.black)
+        p.drawString(2.3*cm, y_pos - row_height + 0.15*cm, row[0])
+        p.drawString(10.3*cm, y_pos - row_height + 0.15*cm, row[1])
+        y_pos -= row_height
+
+        # Check if we need a new page
+        if y_pos < 5*cm:
+            p.showPage()
+            y_pos = height - 2*cm
+
+    # Important information
+    y_pos -= 1.5*cm
+    if y_pos < 7*cm:
+        p.showPage()
+        y_pos = height - 2*cm
+
+    p.setFillColor(colors.HexColor('#FFF3E0'))
+    p.rect(2*cm, y_pos - 4*cm, width - 4*cm, 4.5*cm, fill=True, stroke=True)
+    p.setFillColor(colors.HexColor('#E65100'))
+    p.setFont("Helvetica-Bold", 11)
+    p.drawString(2.5*cm, y_pos - 0.5*cm, "INFORMAÇÕES IMPORTANTES:")
+
+    p.setFont("Helvetica", 8)
+    p.setFillColor(colors.black)
+    info_text = [
+        "• Este documento serve como comprovante para declaração de Imposto de Renda.",
+        f"• Valores referentes a pagamentos efetuados no ano-base {statement.year}.",
+        "• O valor dedutível considera as despesas elegíveis conforme legislação do IR.",
+        "• Mantenha este informe junto aos seus documentos fiscais.",
+        "• Em caso de dúvidas, consulte seu contador ou a Receita Federal.",
+        "• Código de verificação disponível em: www.elosaude.com.br/verificar",
+        f"• Código: IR-{statement.year}-{beneficiary.id:06d}"
+    ]
+
+    y_info = y_pos - 1*cm
+    for line in info_text:
+        p.drawString(2.7*cm, y_info, line)
+        y_info -= 0.5*cm
+
+    # Footer
+    p.setFont("Helvetica", 8)
+    p.setFillColor(gray_color)
+    p.drawString(2*cm, 2*cm, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+    pdf_layout.footer_lines(
+        (pdf_layout.COMPANY_LINE, "www.elosaude.com.br | financeiro@elosaude.com.br | (11) 3000-0000"),
+        1.5*cm
+    ).stamp(p)
+
+    # Save PDF
+    p.showPage()
+    p.save()
+
+    # Get PDF data
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
@@ -0,0 +1,193 @@
+"""
+Batch PDF rendering for month-end document runs
+
+``render_invoices`` and ``render_tax_statements`` take a queryset, load it in
+keyset-ordered chunks with every related row the documents print (one query
+per chunk) and render each chunk with the layouts of apps.financial.pdf. The
+files are stored through apps.common.document_cache under the same kind and
+version the download views use, so the app's downloads are served from them;
+documents whose current version is already stored are skipped.
+
+Two ways to run them in parallel:
+
+* Celery (render_invoice_pdfs / render_tax_statement_pdfs): the documents are
+  split with ``pk_ranges`` into primary key ranges rendered by a group of per-range tasks, so the worker pool's
+  concurrency does the parallelism. Prefork children are daemonic and may not
+  start processes of their own, so each range renders serially.
+* The render_pdfs command: one process renders across a local process pool.
+  Rendering is pure CPU work on already-loaded objects, so the pool workers
+  never touch the database; the pool forks all its workers up front, after
+  closing the parent's connections and before the first chunk is queried.
+
+Settings:
+    PDF_RENDER_WORKERS      local pool processes (default: number of CPUs)
+    PDF_RENDER_CHUNK_SIZE   documents loaded, rendered and stored per chunk,
+                            and per Celery task
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from apps.common import document_cache
+from .pdf import generate_invoice_pdf, generate_tax_statement_pdf, invoice_version, tax_statement_version
+
+logger = logging.getLogger(__name__)
+
+
+def _workers():
+    return getattr(settings, 'PDF_RENDER_WORKERS', None) or os.cpu_count() or 1
+
+
+def _chunk_size():
+    return getattr(settings, 'PDF_RENDER_CHUNK_SIZE', 200)
+
+
+def _render_invoice(invoice):
+    try:
+        return invoice.pk, generate_invoice_pdf(invoice), None
+    except Exception as e:
+        return invoice.pk, None, str(e)
+
+
+def _render_tax_statement(statement):
+    try:
+        return statement.pk, generate_tax_statement_pdf(statement), None
+    except Exception as e:
+        return statement.pk, None, str(e)
+
+
+def _chunks(queryset, chunk_size):
+    """Yield lists of objects in primary key order, one query per list"""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        objects = list(page[:chunk_size])
+        if not objects:
+            return
+        yield objects
+        last_pk = objects[-1].pk
+
+
+def pk_ranges(queryset, chunk_size=None):
+    """
+    (first pk, last pk) of consecutive chunks of ``queryset`` in primary key
+    order, read from the primary keys only
+    """
+    chunk_size = chunk_size or _chunk_size()
+    ranges = []
+    first = last = None
+    count = 0
+    for pk in queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=5000):
+        if first is None:
+            first = pk
+        last = pk
+        count += 1
+        if count == chunk_size:
+            ranges.append((first, last))
+            first, count = None, 0
+    if first is not None:
+        ranges.append((first, last))
+    return ranges
+
+
+def _start_pool(workers):
+    """
+    A process pool with every worker already forked. Workers are forked on
+    the first submit; doing it here, right after closing the connections,
+    keeps them from inheriting a socket opened by the first chunk query.
+    """
+    connections.close_all()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+    executor.submit(int).result()
+    return executor
+
+
+def _render_all(queryset, kind, render, version, overwrite, workers, chunk_size):
+    """
+    Render every object of ``queryset`` and store it in the document cache
+    under ``kind`` and ``version(obj)``
+    """
+    model = queryset.model
+    report = {'rendered': 0, 'skipped': 0, 'failed': 0, 'workers': workers}
+    started = time.monotonic()
+
+    # A daemonic process (e.g. a Celery prefork child) may not start children
+    executor = None
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        executor = _start_pool(workers)
+    else:
+        report['workers'] = 1
+
+    try:
+        for objects in _chunks(queryset, chunk_size):
+            versions = {obj.pk: version(obj) for obj in objects}
+            if not overwrite:
+                pending = [obj for obj in objects if not document_cache.is_stored(kind, obj.pk, versions[obj.pk])]
+                report['skipped'] += len(objects) - len(pending)
+                objects = pending
+
+            if executor:
+                results = executor.map(render, objects, chunksize=max(len(objects) // (workers * 4), 1))
+            else:
+                results = map(render, objects)
+
+            for pk, pdf_bytes, error in results:
+                if error is not None:
+                    report['failed'] += 1
+                    logger.error(f"Error rendering {model.__name__} {pk} PDF: {error}")
+                    continue
+                document_cache.store(kind, pk, versions[pk], pdf_bytes, replace=overwrite)
+                report['rendered'] += 1
+
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"{model.__name__} PDFs: {report['rendered']} rendered, {report['skipped']} already stored, "
+                f"{report['failed']} failed ({report['rendered'] / max(elapsed, 1e-6):.1f}/s)"
+            )
+    finally:
+        if executor:
+            executor.shutdown()
+
+    elapsed = time.monotonic() - started
+    report['elapsed_seconds'] = round(elapsed, 2)
+    report['per_second'] = round(report['rendered'] / elapsed, 1) if elapsed else None
+    return report
+
+
+def render_invoices(queryset, overwrite=False, workers=None, chunk_size=None):
+    """
+    Render the PDF of every invoice in ``queryset`` into the document cache.
+    Invoices whose current version is already stored are skipped unless
+    ``overwrite``. Returns a report with counts and documents per second.
+    """
+    return _render_all(
+        queryset.select_related('beneficiary'),
+        document_cache.KIND_INVOICE,
+        _render_invoice,
+        invoice_version,
+        overwrite,
+        workers or _workers(),
+        chunk_size or _chunk_size(),
+    )
+
+
+def render_tax_statements(queryset, overwrite=False, workers=None, chunk_size=None):
+    """
+    Render the PDF of every tax statement in ``queryset`` into the document
+    cache. Same behaviour as render_invoices.
+    """
+    return _render_all(
+        queryset.select_related('beneficiary'),
+        document_cache.KIND_TAX_STATEMENT,
+        _render_tax_statement,
+        tax_statement_version,
+        overwrite,
+        workers or _workers(),
+        chunk_size or _chunk_size(),
+    )
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common import document_cache
+
+from .models import Invoice, PaymentHistory, TaxStatement
+
+
+@receiver([post_save, post_delete], sender=Invoice)
+def invalidate_invoice_documents(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_INVOICE, instance.pk)
+    document_cache.invalidate(document_cache.KIND_INVOICE_RECEIPT, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=PaymentHistory)
+def invalidate_invoice_receipt(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_INVOICE_RECEIPT, instance.invoice_id)
+
+
+@receiver([post_save, post_delete], sender=TaxStatement)
+def invalidate_tax_statement_document(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_TAX_STATEMENT, instance.pk)
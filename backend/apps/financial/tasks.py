@@ -3,21 +3,38 @@ from django.utils import timezone
 from datetime import timedelta, datetime
 from decimal import Decimal
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+INVOICE_CHUNK_SIZE = 1000
+DEFAULT_MONTHLY_FEE = Decimal('500.00')
+DEPENDENT_FEE_RATE = Decimal('0.50')  # each active dependent adds 50% of the holder fee
+
+
 @shared_task
-def generate_monthly_invoices():
+def generate_monthly_invoices(dry_run=False, chunk_size=INVOICE_CHUNK_SIZE):
     """
     Generate monthly invoices for all active beneficiaries
     Runs on the 1st day of each month
+
+    Set-based: one query lists the holders already invoiced this month, one
+    annotated query streams the remaining holders with their plan fee and
+    active dependents count, and each chunk of invoices is inserted with
+    bulk_create in the same transaction as its notifications in the outbox.
+    With ``dry_run`` nothing is written and the report shows what would be
+    generated.
     """
+    from django.db import transaction
+    from django.db.models import Count, Q
     from apps.financial.models import Invoice
     from apps.beneficiaries.models import Beneficiary
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notifications
 
     try:
+        started = time.monotonic()
+
         # Get current month/year
         now = timezone.now()
         reference_month = now.strftime('%m/%Y')
@@ -25,66 +42,99 @@ def generate_monthly_invoices():
         # Due date: 10th of current month
         due_date = datetime(now.year, now.month, 10).date()
 
-        # Get all active beneficiaries (holders only)
-        active_beneficiaries = Beneficiary.objects.filter(
+        already_invoiced = set(
+            Invoice.objects.filter(reference_month=reference_month)
+            .values_list('beneficiary_id', flat=True)
+        )
+
+        # Active holders with plan fee and active dependents in one query
+        holders = Beneficiary.objects.filter(
             status='ACTIVE',
-            beneficiary_type='HOLDER'
-        ).select_related('health_plan')
+            beneficiary_type='TITULAR'
+        ).annotate(
+            active_dependents=Count('dependents', filter=Q(dependents__status='ACTIVE'))
+        ).order_by('id').values_list('id', 'health_plan__monthly_fee', 'active_dependents')
+
+        report = {
+            'reference_month': reference_month,
+            'dry_run': dry_run,
+            'created': 0,
+            'skipped': 0,
+            'total_amount': Decimal('0.00'),
+        }
+
+        def flush(invoices):
+            if not dry_run:
+                with transaction.atomic():
+                    Invoice.objects.bulk_create(invoices)
+                    enqueue_notifications([
+                        {
+                            'beneficiary_id': invoice.beneficiary_id,
+                            'title': "Nova Fatura Disponível",
+                            'message': f"Sua fatura de {reference_month} no valor de R$ {invoice.amount:.2f} está disponível. Vencimento: {due_date.strftime('%d/%m/%Y')}",
+                            'notification_type': 'INVOICE',
+                            'priority': 'MEDIUM',
+                            'data': {
+                                'invoice_id': invoice.id,
+                                'amount': float(invoice.amount),
+                                'due_date': due_date.isoformat()
+                            }
+                        }
+                        for invoice in invoices
+                    ])
+
+            report['created'] += len(invoices)
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Monthly invoices {reference_month}: {report['created']} generated, "
+                f"{report['skipped']} skipped ({report['created'] / max(elapsed, 1e-6):.0f}/s)"
+            )
 
-        count = 0
-        for beneficiary in active_beneficiaries:
-            # Check if invoice already exists for this month
-            existing_invoice = Invoice.objects.filter(
-                beneficiary=beneficiary,
-                reference_month=reference_month
-            ).exists()
-
-            if existing_invoice:
-                logger.info(f"Invoice for {beneficiary.full_name} already exists for {reference_month}")
+        chunk = []
+        for beneficiary_id, monthly_fee, dependents_count in holders.iterator(chunk_size=chunk_size):
+            if beneficiary_id in already_invoiced:
+                report['skipped'] += 1
                 continue
 
-            # Calculate invoice amount from health plan
-            health_plan = beneficiary.health_plan
-            amount = health_plan.monthly_price if health_plan else Decimal('500.00')
-
-            # Count dependents to add to invoice
-            dependents_count = Beneficiary.objects.filter(
-                holder=beneficiary,
-                status='ACTIVE'
-            ).count()
-
-            # Add dependent costs (usually 50% of holder cost per dependent)
-            dependent_amount = amount * Decimal('0.50') * dependents_count
-            total_amount = amount + dependent_amount
+            amount = monthly_fee if monthly_fee is not None else DEFAULT_MONTHLY_FEE
+            total_amount = amount + amount * DEPENDENT_FEE_RATE * dependents_count
 
-            # Create invoice
-            invoice = Invoice.objects.create(
-                beneficiary=beneficiary,
+            # bulk_create bypasses Invoice.save(), so fill the payment codes here
+            invoice = Invoice(
+                beneficiary_id=beneficiary_id,
                 reference_month=reference_month,
                 amount=total_amount,
                 due_date=due_date,
-                status='OPEN'
+                status='OPEN',
+                barcode=Invoice.generate_barcode()
             )
+            invoice.digitable_line = invoice.generate_digitable_line()
+            chunk.append(invoice)
+            report['total_amount'] += total_amount
 
-            # Send notification
-            send_notification.delay(
-                beneficiary_id=beneficiary.id,
-                title="Nova Fatura Disponível",
-                message=f"Sua fatura de {reference_month} no valor de R$ {total_amount:.2f} está disponível. Vencimento: {due_date.strftime('%d/%m/%Y')}",
-                notification_type='INVOICE',
-                priority='MEDIUM',
-                data={
-                    'invoice_id': invoice.id,
-                    'amount': float(total_amount),
-                    'due_date': due_date.isoformat()
-                }
-            )
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
 
-            count += 1
-            logger.info(f"Invoice generated for {beneficiary.full_name}: R$ {total_amount}")
+        if chunk:
+            flush(chunk)
 
-        logger.info(f"Generated {count} monthly invoices for {reference_month}")
-        return count
+        elapsed = time.monotonic() - started
+        report['total_amount'] = float(report['total_amount'])
+        report['elapsed_seconds'] = round(elapsed, 2)
+        report['per_second'] = round(report['created'] / elapsed, 1) if elapsed else None
+
+        logger.info(
+            f"{'[DRY RUN] ' if dry_run else ''}Generated {report['created']} monthly invoices "
+            f"for {reference_month} in {report['elapsed_seconds']}s "
+            f"({report['skipped']} already invoiced)"
+        )
+
+        # Render every PDF before beneficiaries open the app
+        if report['created'] and not dry_run:
+            render_invoice_pdfs.delay(reference_month)
+
+        return report
 
     except Exception as e:
         logger.error(f"Error generating monthly invoices: {str(e)}")
@@ -97,44 +147,43 @@ def check_overdue_invoices():
     Check and notify about overdue invoices
     Runs daily
     """
+    from apps.common.bulk import bulk_transition
     from apps.financial.models import Invoice
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notifications
 
     try:
         today = timezone.now().date()
 
-        # Update status of open invoices that are now overdue
-        overdue_invoices = Invoice.objects.filter(
-            status='OPEN',
-            due_date__lt=today
-        ).select_related('beneficiary')
+        # Update status of open invoices that are now overdue (single UPDATE)
+        overdue_invoices = bulk_transition(
+            Invoice.objects.filter(status='OPEN', due_date__lt=today),
+            'OVERDUE',
+            returning=('id', 'beneficiary_id', 'reference_month', 'amount', 'due_date')
+        )
 
-        count = 0
+        notifications = []
         for invoice in overdue_invoices:
-            # Update status
-            invoice.status = 'OVERDUE'
-            invoice.save(update_fields=['status', 'updated_at'])
-
             # Calculate days overdue
-            days_overdue = (today - invoice.due_date).days
+            days_overdue = (today - invoice['due_date']).days
 
             # Send notification on specific days (1, 3, 7, 15, 30)
             if days_overdue in [1, 3, 7, 15, 30]:
-                send_notification.delay(
-                    beneficiary_id=invoice.beneficiary.id,
-                    title="Fatura Vencida",
-                    message=f"Sua fatura de {invoice.reference_month} está vencida há {days_overdue} dia(s). Valor: R$ {invoice.amount:.2f}",
-                    notification_type='INVOICE',
-                    priority='HIGH',
-                    data={
-                        'invoice_id': invoice.id,
-                        'amount': float(invoice.amount),
+                notifications.append({
+                    'beneficiary_id': invoice['beneficiary_id'],
+                    'title': "Fatura Vencida",
+                    'message': f"Sua fatura de {invoice['reference_month']} está vencida há {days_overdue} dia(s). Valor: R$ {invoice['amount']:.2f}",
+                    'notification_type': 'INVOICE',
+                    'priority': 'HIGH',
+                    'data': {
+                        'invoice_id': invoice['id'],
+                        'amount': float(invoice['amount']),
                         'days_overdue': days_overdue
                     }
-                )
+                })
 
-            count += 1
+        enqueue_notifications(notifications)
 
+        count = len(overdue_invoices)
         logger.info(f"Updated {count} overdue invoices")
         return count
 
@@ -150,7 +199,7 @@ def process_payment(payment_id):
     Updates invoice status and sends confirmation
     """
     from apps.financial.models import PaymentHistory, Invoice
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
 
     try:
         payment = PaymentHistory.objects.select_related('invoice', 'invoice__beneficiary').get(id=payment_id)
@@ -163,7 +212,7 @@ def process_payment(payment_id):
             invoice.payment_date = payment.payment_date
             invoice.save(update_fields=['status', 'payment_date', 'updated_at'])
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=invoice.beneficiary.id,
                 title="Pagamento Confirmado",
                 message=f"Seu pagamento da fatura {invoice.reference_month} foi confirmado! Valor: R$ {payment.amount_paid:.2f}",
@@ -182,7 +231,7 @@ def process_payment(payment_id):
             # Partial payment - notify about remaining amount
             remaining = invoice.amount - payment.amount_paid
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=invoice.beneficiary.id,
                 title="Pagamento Parcial Recebido",
                 message=f"Recebemos seu pagamento parcial de R$ {payment.amount_paid:.2f}. Valor restante: R$ {remaining:.2f}",
@@ -214,7 +263,7 @@ def send_invoice_reminders():
     Runs daily
     """
     from apps.financial.models import Invoice
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
 
     try:
         # Get invoices due in 3 days
@@ -227,7 +276,7 @@ def send_invoice_reminders():
 
         count = 0
         for invoice in upcoming_invoices:
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=invoice.beneficiary.id,
                 title="Lembrete de Vencimento",
                 message=f"Sua fatura de {invoice.reference_month} vence em 3 dias! Valor: R$ {invoice.amount:.2f}",
@@ -249,82 +298,111 @@ def send_invoice_reminders():
         return 0
 
 
+TAX_STATEMENT_CHUNK_SIZE = 1000
+
+
 @shared_task
-def generate_annual_tax_statements():
+def generate_annual_tax_statements(year=None, chunk_size=TAX_STATEMENT_CHUNK_SIZE):
     """
     Generate annual tax statements for all beneficiaries
     Runs in January for the previous year
+
+    One grouped query sums paid invoices per beneficiary and payment month and
+    is streamed in beneficiary order; statements are inserted with bulk_create
+    per chunk, in the same transaction as their outbox notifications. Resumable:
+    beneficiaries that already have a statement are excluded by the query, and
+    a checkpoint of the last committed beneficiary lets a rerun skip ahead.
     """
+    from django.core.cache import cache
+    from django.db import transaction
+    from django.db.models import Exists, OuterRef, Sum
+    from django.db.models.functions import ExtractMonth
     from apps.financial.models import TaxStatement, Invoice
-    from apps.beneficiaries.models import Beneficiary
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notifications
 
     try:
         # Get previous year
-        year = timezone.now().year - 1
-
-        # Get all beneficiaries who had invoices last year
-        beneficiaries_with_invoices = Beneficiary.objects.filter(
-            invoices__created_at__year=year
-        ).distinct()
+        if year is None:
+            year = timezone.now().year - 1
+
+        checkpoint_key = f'financial:tax_statements:{year}:last_beneficiary'
+        checkpoint = cache.get(checkpoint_key) or 0
+
+        # Paid invoices of the year, summed per beneficiary and payment month
+        monthly_totals = Invoice.objects.filter(
+            status='PAID',
+            payment_date__year=year,
+            beneficiary_id__gt=checkpoint
+        ).exclude(
+            Exists(TaxStatement.objects.filter(beneficiary_id=OuterRef('beneficiary_id'), year=year))
+        ).annotate(
+            month=ExtractMonth('payment_date')
+        ).values('beneficiary_id', 'month').annotate(
+            total=Sum('amount')
+        ).order_by('beneficiary_id', 'month')
 
         count = 0
-        for beneficiary in beneficiaries_with_invoices:
-            # Check if statement already exists
-            existing_statement = TaxStatement.objects.filter(
-                beneficiary=beneficiary,
-                year=year
-            ).exists()
-
-            if existing_statement:
-                continue
-
-            # Get all paid invoices for the year
-            invoices = Invoice.objects.filter(
-                beneficiary=beneficiary,
-                status='PAID',
-                payment_date__year=year
-            )
-
-            if not invoices.exists():
-                continue
-
-            # Calculate totals
-            total_paid = sum(invoice.amount for invoice in invoices)
 
-            # Calculate monthly breakdown
-            monthly_breakdown = {}
-            for invoice in invoices:
-                month = invoice.payment_date.strftime('%m')
-                monthly_breakdown[month] = float(invoice.amount)
-
-            # Create tax statement
-            tax_statement = TaxStatement.objects.create(
-                beneficiary=beneficiary,
+        def flush(statements):
+            with transaction.atomic():
+                TaxStatement.objects.bulk_create(statements)
+                enqueue_notifications([
+                    {
+                        'beneficiary_id': statement.beneficiary_id,
+                        'title': "Informe de Rendimentos Disponível",
+                        'message': f"Seu informe de rendimentos de {year} está disponível. Total: R$ {statement.total_paid:.2f}",
+                        'notification_type': 'TAX_STATEMENT',
+                        'priority': 'MEDIUM',
+                        'data': {
+                            'tax_statement_id': statement.id,
+                            'year': year,
+                            'total_paid': float(statement.total_paid)
+                        }
+                    }
+                    for statement in statements
+                ])
+            cache.set(checkpoint_key, statements[-1].beneficiary_id, 60 * 60 * 24 * 90)
+            logger.info(f"Tax statements {year}: {count + len(statements)} generated")
+
+        def build(beneficiary_id, months):
+            total_paid = sum(months.values())
+            return TaxStatement(
+                beneficiary_id=beneficiary_id,
                 year=year,
                 total_paid=total_paid,
                 deductible_amount=total_paid,  # All health plan payments are deductible
-                monthly_breakdown=monthly_breakdown
+                monthly_breakdown={month: float(amount) for month, amount in months.items()}
             )
 
-            # Send notification
-            send_notification.delay(
-                beneficiary_id=beneficiary.id,
-                title="Informe de Rendimentos Disponível",
-                message=f"Seu informe de rendimentos de {year} está disponível. Total: R$ {total_paid:.2f}",
-                notification_type='TAX_STATEMENT',
-                priority='MEDIUM',
-                data={
-                    'tax_statement_id': tax_statement.id,
-                    'year': year,
-                    'total_paid': float(total_paid)
-                }
-            )
-
-            count += 1
-            logger.info(f"Tax statement generated for {beneficiary.full_name} - {year}")
+        chunk = []
+        current_id = None
+        months = {}
+        for row in monthly_totals.iterator(chunk_size=chunk_size):
+            if row['beneficiary_id'] != current_id:
+                if current_id is not None:
+                    chunk.append(build(current_id, months))
+                    if len(chunk) >= chunk_size:
+                        flush(chunk)
+                        count += len(chunk)
+                        chunk = []
+                current_id = row['beneficiary_id']
+                months = {}
+            months[f"{row['month']:02d}"] = row['total']
+
+        if current_id is not None:
+            chunk.append(build(current_id, months))
+        if chunk:
+            flush(chunk)
+            count += len(chunk)
+
+        # Completed: a later rerun (e.g. for late payments) scans from the start
+        cache.delete(checkpoint_key)
 
         logger.info(f"Generated {count} tax statements for {year}")
+
+        if count:
+            render_tax_statement_pdfs.delay(year)
+
         return count
 
     except Exception as e:
@@ -335,24 +413,20 @@ def generate_annual_tax_statements():
 @shared_task
 def generate_invoice_pdf_task(invoice_id):
     """
-    Generate PDF for an invoice
+    Render the PDF of an invoice into the document cache (unless its
+    current version is already there)
     """
+    from apps.common import document_cache
     from apps.financial.models import Invoice
-    from apps.financial.pdf import generate_invoice_pdf
-    from django.core.files.base import ContentFile
+    from apps.financial.pdf import generate_invoice_pdf, invoice_version
     
     try:
-        invoice = Invoice.objects.select_related(
-            'beneficiary',
-            'beneficiary__health_plan'
-        ).get(id=invoice_id)
-        
-        # Generate PDF
-        pdf_bytes = generate_invoice_pdf(invoice)
+        invoice = Invoice.objects.select_related('beneficiary').get(id=invoice_id)
         
-        # Save to invoice
-        filename = f"fatura_{invoice.reference_month.replace('/', '-')}.pdf"
-        invoice.invoice_pdf.save(filename, ContentFile(pdf_bytes), save=True)
+        document_cache.get_or_render(
+            document_cache.KIND_INVOICE, invoice.pk, invoice_version(invoice),
+            lambda: generate_invoice_pdf(invoice)
+        )
         
         logger.info(f"PDF generated for invoice {invoice.reference_month}")
         return True
@@ -368,23 +442,20 @@ def generate_invoice_pdf_task(invoice_id):
 @shared_task
 def generate_tax_statement_pdf_task(statement_id):
     """
-    Generate PDF for a tax statement
+    Render the PDF of a tax statement into the document cache (unless its
+    current version is already there)
     """
+    from apps.common import document_cache
     from apps.financial.models import TaxStatement
-    from apps.financial.pdf import generate_tax_statement_pdf
-    from django.core.files.base import ContentFile
+    from apps.financial.pdf import generate_tax_statement_pdf, tax_statement_version
     
     try:
-        statement = TaxStatement.objects.select_related(
-            'beneficiary'
-        ).get(id=statement_id)
+        statement = TaxStatement.objects.select_related('beneficiary').get(id=statement_id)
         
-        # Generate PDF
-        pdf_bytes = generate_tax_statement_pdf(statement)
-        
-        # Save to statement
-        filename = f"declaracao_ir_{statement.year}.pdf"
-        statement.statement_pdf.save(filename, ContentFile(pdf_bytes), save=True)
+        document_cache.get_or_render(
+            document_cache.KIND_TAX_STATEMENT, statement.pk, tax_statement_version(statement),
+            lambda: generate_tax_statement_pdf(statement)
+        )
         
         logger.info(f"PDF generated for tax statement {statement.year}")
         return True
@@ -395,3 +466,128 @@ def generate_tax_statement_pdf_task(statement_id):
     except Exception as e:
         logger.error(f"Error generating tax statement PDF: {str(e)}")
         return False
+
+
+@shared_task
+def render_invoice_pdfs(reference_month=None, overwrite=False):
+    """
+    Render the PDFs of every invoice of a reference month (default: current)
+    Splits the invoices into primary key ranges rendered in parallel by a group
+    of render_invoice_pdf_chunk tasks; see apps.financial.pdf_batch
+    Returns the number of chunks dispatched
+    """
+    from celery import chord
+    from apps.financial.models import Invoice
+    from apps.financial.pdf_batch import pk_ranges
+
+    try:
+        if reference_month is None:
+            reference_month = timezone.now().strftime('%m/%Y')
+
+        ranges = pk_ranges(Invoice.objects.filter(reference_month=reference_month))
+        if ranges:
+            chord(
+                render_invoice_pdf_chunk.s(reference_month, first_pk, last_pk, overwrite)
+                for first_pk, last_pk in ranges
+            )(log_pdf_render_reports.s(f'invoice PDFs for {reference_month}', time.time()))
+        logger.info(f"Dispatched {len(ranges)} invoice PDF chunks for {reference_month}")
+        return len(ranges)
+
+    except Exception as e:
+        logger.error(f"Error rendering invoice PDFs: {str(e)}")
+        return 0
+
+
+@shared_task
+def render_invoice_pdf_chunk(reference_month, first_pk, last_pk, overwrite=False):
+    """
+    Render the invoice PDFs of one primary key range (see render_invoice_pdfs)
+    """
+    from apps.financial.models import Invoice
+    from apps.financial.pdf_batch import render_invoices
+
+    try:
+        return render_invoices(
+            Invoice.objects.filter(reference_month=reference_month, pk__range=(first_pk, last_pk)),
+            overwrite=overwrite,
+            workers=1,
+        )
+    except Exception as e:
+        logger.error(f"Error rendering invoice PDFs {first_pk}-{last_pk}: {str(e)}")
+        return None
+
+
+@shared_task
+def render_tax_statement_pdfs(year=None, overwrite=False):
+    """
+    Render the PDFs of every tax statement of a year (default: previous)
+    Splits the statements into primary key ranges rendered in parallel by a
+    group of render_tax_statement_pdf_chunk tasks; see apps.financial.pdf_batch
+    Returns the number of chunks dispatched
+    """
+    from celery import chord
+    from apps.financial.models import TaxStatement
+    from apps.financial.pdf_batch import pk_ranges
+
+    try:
+        if year is None:
+            year = timezone.now().year - 1
+
+        ranges = pk_ranges(TaxStatement.objects.filter(year=year))
+        if ranges:
+            chord(
+                render_tax_statement_pdf_chunk.s(year, first_pk, last_pk, overwrite)
+                for first_pk, last_pk in ranges
+            )(log_pdf_render_reports.s(f'tax statement PDFs for {year}', time.time()))
+        logger.info(f"Dispatched {len(ranges)} tax statement PDF chunks for {year}")
+        return len(ranges)
+
+    except Exception as e:
+        logger.error(f"Error rendering tax statement PDFs: {str(e)}")
+        return 0
+
+
+@shared_task
+def render_tax_statement_pdf_chunk(year, first_pk, last_pk, overwrite=False):
+    """
+    Render the tax statement PDFs of one primary key range (see render_tax_statement_pdfs)
+    """
+    from apps.financial.models import TaxStatement
+    from apps.financial.pdf_batch import render_tax_statements
+
+    try:
+        return render_tax_statements(
+            TaxStatement.objects.filter(year=year, pk__range=(first_pk, last_pk)),
+            overwrite=overwrite,
+            workers=1,
+        )
+    except Exception as e:
+        logger.error(f"Error rendering tax statement PDFs {first_pk}-{last_pk}: {str(e)}")
+        return None
+
+
+@shared_task
+def log_pdf_render_reports(reports, label, started_at):
+    """
+    Log the totals of a PDF render run once all of its chunks are done
+    (chord callback of render_invoice_pdfs / render_tax_statement_pdfs)
+    """
+    reports = [report for report in reports if report]
+    rendered = sum(report['rendered'] for report in reports)
+    skipped = sum(report['skipped'] for report in reports)
+    failed = sum(report['failed'] for report in reports)
+    elapsed = time.time() - started_at
+
+    logger.info(
+        f"Rendered {rendered} {label} in {elapsed:.1f}s "
+        f"({rendered / max(elapsed, 1e-6):.1f}/s, {skipped} already stored, {failed} failed, "
+        f"{len(reports)} chunks)"
+    )
+    return {
+        'rendered': rendered,
+        'skipped': skipped,
+        'failed': failed,
+        'chunks': len(reports),
+        'elapsed_seconds': round(elapsed, 2),
+        'per_second': round(rendered / elapsed, 1) if elapsed else None,
+    }
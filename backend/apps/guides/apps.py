@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class GuidesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.guides'
+
+    def ready(self):
+        import apps.guides.signals  # noqa
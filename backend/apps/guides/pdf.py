@@ -1,171 +1,292 @@
 """
-PDF Generator for TISS Guides
+PDF layout of TISS guides
+
+The only guide layout: TISSGuideViewSet.pdf and generate_guide_pdf_task draw
+with it and store the result through apps.common.document_cache under
+guide_version.
 """
+from io import BytesIO
+
+from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from apps.utils.pdf_generator import PDFGenerator, format_currency, format_date, format_datetime
-from io import BytesIO
-from datetime import datetime
 
+from apps.common import document_cache
+from apps.utils import pdf_layout
+from .models import TISSGuide
 
-class GuidePDFGenerator(PDFGenerator):
-    """Generate PDF for TISS Guides"""
 
-    def __init__(self, guide):
-        super().__init__(title=f"Guia TISS - {guide.guide_number}")
-        self.guide = guide
+def guide_version(guide):
+    """document_cache version of a guide PDF (the guide, its parties and procedures)"""
+    return document_cache.content_version(
+        guide.updated_at, guide.beneficiary.updated_at, guide.provider.updated_at,
+        list(guide.guide_procedures.values_list('id', 'quantity', 'authorized_quantity'))
+    )
 
-    def generate(self):
-        """Generate the PDF and return bytes"""
-        doc = self.create_document()
 
-        # Build content
-        story = []
+def generate_guide_pdf(guide):
+    """Draw the guide PDF and return its bytes"""
+    beneficiary = guide.beneficiary
+    provider = guide.provider
 
-        # Title
-        story.append(Paragraph(f"GUIA TISS - {self.guide.get_guide_type_display().upper()}", self.styles['Title']))
-        story.append(Spacer(1, 0.5*cm))
+    # Create PDF in memory
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
 
-        # Guide Information
-        story.append(Paragraph("Informações da Guia", self.styles['Subtitle']))
-        guide_data = [
-            ['Número da Guia:', self.guide.guide_number],
-            ['Protocolo:', self.guide.protocol_number or 'Não gerado'],
-            ['Status:', self.guide.get_status_display()],
-            ['Data da Solicitação:', format_date(self.guide.request_date)],
-        ]
+    # Colors
+    primary_color = pdf_layout.PRIMARY_COLOR
+    text_color = colors.HexColor('#333333')
+    gray_color = pdf_layout.GRAY_COLOR
 
-        if self.guide.authorization_date:
-            guide_data.append(['Data de Autorização:', format_datetime(self.guide.authorization_date)])
-
-        if self.guide.expiry_date:
-            guide_data.append(['Validade:', format_date(self.guide.expiry_date)])
-
-        guide_table = Table(guide_data, colWidths=[5*cm, 12*cm])
-        guide_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(guide_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Beneficiary Information
-        story.append(Paragraph("Dados do Beneficiário", self.styles['Subtitle']))
-        beneficiary_data = [
-            ['Nome:', self.guide.beneficiary.full_name],
-            ['CPF:', self.guide.beneficiary.cpf],
-            ['Matrícula:', self.guide.beneficiary.registration_number],
-            ['Plano:', self.guide.beneficiary.health_plan.name if self.guide.beneficiary.health_plan else 'N/A'],
-        ]
+    # Header
+    pdf_layout.header_band(
+        "GUIA DE AUTORIZAÇÃO - TISS", band_height=2.5*cm, title_size=20, title_y=1.7*cm
+    ).stamp(p)
+
+    # Guide type and status
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica", 11)
+    guide_type_label = dict(TISSGuide.GUIDE_TYPES).get(guide.guide_type, guide.guide_type)
+    status_label = dict(TISSGuide.STATUS_CHOICES).get(guide.status, guide.status)
+
+    p.drawString(2*cm, height - 2.2*cm, f"Tipo: {guide_type_label}")
+
+    # Status badge
+    status_x = width - 5*cm
+    if guide.status == 'AUTHORIZED':
+        status_bg = colors.HexColor('#4CAF50')
+    elif guide.status == 'DENIED':
+        status_bg = colors.HexColor('#F44336')
+    elif guide.status == 'PENDING':
+        status_bg = colors.HexColor('#FF9800')
+    else:
+        status_bg = colors.HexColor('#999999')
+
+    p.setFillColor(status_bg)
+    p.roundRect(status_x, height - 2.3*cm, 3*cm, 0.8*cm, 0.2*cm, fill=True, stroke=False)
+    p.setFillColor(colors.white)
+    p.setFont("Helvetica-Bold", 10)
+    p.drawCentredString(status_x + 1.5*cm, height - 2*cm, status_label.upper())
+
+    # Guide information section
+    y_position = height - 4*cm
+    p.setFillColor(text_color)
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(2*cm, y_position, "INFORMAÇÕES DA GUIA")
+
+    # Draw separator line
+    y_position -= 0.3*cm
+    p.setStrokeColor(primary_color)
+    p.setLineWidth(2)
+    p.line(2*cm, y_position, width - 2*cm, y_position)
+
+    y_position -= 0.8*cm
+    line_height = 0.6*cm
+
+    # Guide details
+    guide_data = [
+        ("Número da Guia:", guide.guide_number),
+        ("Protocolo:", guide.protocol_number),
+        ("Data de Solicitação:", guide.request_date.strftime('%d/%m/%Y')),
+    ]
+
+    if guide.authorization_date:
+        guide_data.append(("Data de Autorização:", guide.authorization_date.strftime('%d/%m/%Y')))
+
+    if guide.expiry_date:
+        guide_data.append(("Validade:", guide.expiry_date.strftime('%d/%m/%Y')))
+
+    for label, value in guide_data:
+        p.setFont("Helvetica-Bold", 10)
+        p.setFillColor(gray_color)
+        p.drawString(2*cm, y_position, label)
+        p.setFont("Helvetica", 10)
+        p.setFillColor(text_color)
+        p.drawString(6*cm, y_position, str(value))
+        y_position -= line_height
+
+    # Beneficiary section
+    y_position -= 0.5*cm
+    p.setFont("Helvetica-Bold", 14)
+    p.setFillColor(text_color)
+    p.drawString(2*cm, y_position, "BENEFICIÁRIO")
+
+    y_position -= 0.3*cm
+    p.setStrokeColor(primary_color)
+    p.line(2*cm, y_position, width - 2*cm, y_position)
+
+    y_position -= 0.8*cm
+
+    beneficiary_data = [
+        ("Nome:", beneficiary.full_name),
+        ("CPF:", f"{beneficiary.cpf[:3]}.{beneficiary.cpf[3:6]}.{beneficiary.cpf[6:9]}-{beneficiary.cpf[9:]}"),
+        ("Cartão:", beneficiary.registration_number),
+    ]
+
+    for label, value in beneficiary_data:
+        p.setFont("Helvetica-Bold", 10)
+        p.setFillColor(gray_color)
+        p.drawString(2*cm, y_position, label)
+        p.setFont("Helvetica", 10)
+        p.setFillColor(text_color)
+        p.drawString(6*cm, y_position, str(value))
+        y_position -= line_height
+
+    # Provider section
+    if provider:
+        y_position -= 0.5*cm
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(text_color)
+        p.drawString(2*cm, y_position, "PRESTADOR")
+
+        y_position -= 0.3*cm
+        p.setStrokeColor(primary_color)
+        p.line(2*cm, y_position, width - 2*cm, y_position)
+
+        y_position -= 0.8*cm
 
-        beneficiary_table = Table(beneficiary_data, colWidths=[5*cm, 12*cm])
-        beneficiary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(beneficiary_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Provider Information
-        story.append(Paragraph("Prestador", self.styles['Subtitle']))
         provider_data = [
-            ['Nome:', self.guide.provider.name],
-            ['Nome Fantasia:', self.guide.provider.trade_name],
-            ['Tipo:', self.guide.provider.get_provider_type_display()],
+            ("Nome:", provider.name),
+            ("CNPJ/CPF:", provider.cnpj_cpf),
         ]
 
-        provider_table = Table(provider_data, colWidths=[5*cm, 12*cm])
-        provider_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F0F0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(provider_table)
-        story.append(Spacer(1, 0.8*cm))
-
-        # Clinical Information
-        if self.guide.diagnosis or self.guide.observations:
-            story.append(Paragraph("Informações Clínicas", self.styles['Subtitle']))
-
-            if self.guide.diagnosis:
-                story.append(Paragraph(f"<b>Diagnóstico:</b> {self.guide.diagnosis}", self.styles['Normal']))
-                story.append(Spacer(1, 0.3*cm))
-
-            if self.guide.observations:
-                story.append(Paragraph(f"<b>Observações:</b> {self.guide.observations}", self.styles['Normal']))
-                story.append(Spacer(1, 0.5*cm))
-
-        # Procedures
-        procedures = self.guide.guideprocedure_set.select_related('procedure').all()
-        if procedures:
-            story.append(Spacer(1, 0.3*cm))
-            story.append(Paragraph("Procedimentos Solicitados", self.styles['Subtitle']))
-
-            procedure_data = [['Código', 'Procedimento', 'Qtd.', 'Autorizado']]
-            for gp in procedures:
-                procedure_data.append([
-                    gp.procedure.code,
-                    gp.procedure.name,
-                    str(gp.quantity),
-                    str(gp.authorized_quantity) if gp.authorized_quantity else '-'
-                ])
-
-            procedure_table = Table(procedure_data, colWidths=[3*cm, 9*cm, 2*cm, 3*cm])
-            procedure_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#007AFF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            story.append(procedure_table)
-
-        # Build PDF
-        doc.build(story, onFirstPage=self.create_header, onLaterPages=self.create_header)
-
-        return self.get_value()
+        if provider.phone:
+            provider_data.append(("Telefone:", provider.phone))
 
+        for label, value in provider_data:
+            p.setFont("Helvetica-Bold", 10)
+            p.setFillColor(gray_color)
+            p.drawString(2*cm, y_position, label)
+            p.setFont("Helvetica", 10)
+            p.setFillColor(text_color)
+            p.drawString(6*cm, y_position, str(value))
+            y_position -= line_height
 
-def generate_guide_pdf(guide):
-    """Helper function to generate guide PDF"""
-    generator = GuidePDFGenerator(guide)
-    return generator.generate()
+    # Procedures section
+    procedures = guide.guide_procedures.all()
+    if procedures.exists():
+        y_position -= 0.5*cm
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(text_color)
+        p.drawString(2*cm, y_position, "PROCEDIMENTOS SOLICITADOS")
+
+        y_position -= 0.3*cm
+        p.setStrokeColor(primary_color)
+        p.line(2*cm, y_position, width - 2*cm, y_position)
+
+        y_position -= 0.6*cm
+
+        # Table header
+        p.setFont("Helvetica-Bold", 9)
+        p.setFillColor(primary_color)
+        p.drawString(2*cm, y_position, "Código")
+        p.drawString(4.5*cm, y_position, "Procedimento")
+        p.drawString(13*cm, y_position, "Qtd")
+        p.drawString(15*cm, y_position, "Autorizado")
+
+        y_position -= 0.5*cm
+
+        # Table rows
+        p.setFont("Helvetica", 9)
+        p.setFillColor(text_color)
+
+        for proc in procedures[:10]:  # Limit to 10 procedures per page
+            p.drawString(2*cm, y_position, proc.procedure.code)
+
+            # Truncate long procedure names
+            proc_name = proc.procedure.name
+            if len(proc_name) > 45:
+                proc_name = proc_name[:42] + "..."
+            p.drawString(4.5*cm, y_position, proc_name)
+
+            p.drawString(13*cm, y_position, str(proc.quantity))
+            p.drawString(15*cm, y_position, str(proc.authorized_quantity) if proc.authorized_quantity else "-")
+
+            y_position -= 0.5*cm
+
+            if y_position < 5*cm:  # New page if needed
+                p.showPage()
+                y_position = height - 3*cm
+
+    # Clinical information
+    if guide.diagnosis or guide.observations:
+        y_position -= 0.5*cm
+
+        if y_position < 8*cm:
+            p.showPage()
+            y_position = height - 3*cm
+
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(text_color)
+        p.drawString(2*cm, y_position, "INFORMAÇÕES CLÍNICAS")
+
+        y_position -= 0.3*cm
+        p.setStrokeColor(primary_color)
+        p.line(2*cm, y_position, width - 2*cm, y_position)
+
+        y_position -= 0.6*cm
+
+        if guide.diagnosis:
+            p.setFont("Helvetica-Bold", 10)
+            p.setFillColor(gray_color)
+            p.drawString(2*cm, y_position, "Diagnóstico:")
+            y_position -= 0.5*cm
+
+            p.setFont("Helvetica", 9)
+            p.setFillColor(text_color)
+            # Word wrap for long text
+            words = guide.diagnosis.split()
+            line = ""
+            for word in words:
+                test_line = line + word + " "
+                if p.stringWidth(test_line, "Helvetica", 9) > (width - 4*cm):
+                    p.drawString(2.5*cm, y_position, line)
+                    y_position -= 0.4*cm
+                    line = word + " "
+                else:
+                    line = test_line
+            if line:
+                p.drawString(2.5*cm, y_position, line)
+                y_position -= 0.6*cm
+
+        if guide.observations:
+            p.setFont("Helvetica-Bold", 10)
+            p.setFillColor(gray_color)
+            p.drawString(2*cm, y_position, "Observações:")
+            y_position -= 0.5*cm
+
+            p.setFont("Helvetica", 9)
+            p.setFillColor(text_color)
+            # Word wrap for long text
+            words = guide.observations.split()
+            line = ""
+            for word in words:
+                test_line = line + word + " "
+                if p.stringWidth(test_line, "Helvetica", 9) > (width - 4*cm):
+                    p.drawString(2.5*cm, y_position, line)
+                    y_position -= 0.4*cm
+                    line = word + " "
+                else:
+                    line = test_line
+            if line:
+                p.drawString(2.5*cm, y_position, line)
+
+    # Footer
+    p.setFont("Helvetica", 8)
+    p.setFillColor(gray_color)
+    p.drawString(2*cm, 2*cm, f"Guia gerada em: {guide.created_at.strftime('%d/%m/%Y %H:%M')}")
+    pdf_layout.footer_lines(
+        ("Documento válido somente com assinatura digital ou carimbo do prestador",), 1.6*cm
+    ).stamp(p)
+
+    # Finish PDF
+    p.showPage()
+    p.save()
+
+    # Get PDF data
+    buffer.seek(0)
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
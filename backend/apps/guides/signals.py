@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common import document_cache
+
+from .models import GuideProcedure, TISSGuide
+
+
+@receiver([post_save, post_delete], sender=TISSGuide)
+def invalidate_guide_document(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_GUIDE, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=GuideProcedure)
+def invalidate_guide_document_on_procedure(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_GUIDE, instance.guide_id)
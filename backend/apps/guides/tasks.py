@@ -12,31 +12,34 @@ def check_expired_guides():
     Check and update status of expired guides
     Runs every hour
     """
+    from apps.common.bulk import bulk_transition
     from apps.guides.models import TISSGuide
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notifications
     
     try:
-        # Find authorized guides that have expired
-        expired_guides = TISSGuide.objects.filter(
-            status='AUTHORIZED',
-            expiry_date__lt=timezone.now().date()
+        # Expire authorized guides past their expiry date (single UPDATE)
+        expired_guides = bulk_transition(
+            TISSGuide.objects.filter(
+                status='AUTHORIZED',
+                expiry_date__lt=timezone.now().date()
+            ),
+            'EXPIRED',
+            returning=('id', 'beneficiary_id', 'guide_number', 'expiry_date')
         )
         
-        count = 0
-        for guide in expired_guides:
-            guide.status = 'EXPIRED'
-            guide.save(update_fields=['status', 'updated_at'])
-            
-            # Send notification to beneficiary
-            send_notification.delay(
-                beneficiary_id=guide.beneficiary.id,
-                title="Guia Expirada",
-                message=f"A guia {guide.guide_number} expirou em {guide.expiry_date.strftime('%d/%m/%Y')}",
-                notification_type='GUIDE_AUTHORIZATION',
-                data={'guide_id': guide.id, 'guide_number': guide.guide_number}
-            )
-            count += 1
+        # Send notification to beneficiaries
+        enqueue_notifications([
+            {
+                'beneficiary_id': guide['beneficiary_id'],
+                'title': "Guia Expirada",
+                'message': f"A guia {guide['guide_number']} expirou em {guide['expiry_date'].strftime('%d/%m/%Y')}",
+                'notification_type': 'GUIDE_AUTHORIZATION',
+                'data': {'guide_id': guide['id'], 'guide_number': guide['guide_number']}
+            }
+            for guide in expired_guides
+        ])
         
+        count = len(expired_guides)
         logger.info(f"Updated {count} expired guides")
         return count
         
@@ -52,10 +55,13 @@ def process_guide_authorization(guide_id):
     Business rules for auto-approval
     """
     from apps.guides.models import TISSGuide, GuideProcedure
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
     
     try:
-        guide = TISSGuide.objects.select_related('beneficiary', 'provider').get(id=guide_id)
+        guide = TISSGuide.objects.select_related(
+            'beneficiary',
+            'provider'
+        ).prefetch_related('guide_procedures__procedure').get(id=guide_id)
         
         # Check if beneficiary is active
         if guide.beneficiary.status != 'ACTIVE':
@@ -63,7 +69,7 @@ def process_guide_authorization(guide_id):
             guide.denial_reason = 'Beneficiário inativo'
             guide.save()
             
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=guide.beneficiary.id,
                 title="Guia Negada",
                 message=f"A guia {guide.guide_number} foi negada: Beneficiário inativo",
@@ -79,7 +85,7 @@ def process_guide_authorization(guide_id):
             guide.denial_reason = 'Prestador não credenciado'
             guide.save()
             
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=guide.beneficiary.id,
                 title="Guia Negada",
                 message=f"A guia {guide.guide_number} foi negada: Prestador não credenciado",
@@ -100,7 +106,7 @@ def process_guide_authorization(guide_id):
                 authorized_quantity=models.F('quantity')
             )
             
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=guide.beneficiary.id,
                 title="Guia Autorizada",
                 message=f"Sua guia {guide.guide_number} foi autorizada automaticamente!",
@@ -133,7 +139,7 @@ def send_pending_guide_reminders():
     Send reminders for guides pending for more than 48 hours
     """
     from apps.guides.models import TISSGuide
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
     
     cutoff_date = timezone.now() - timedelta(hours=48)
     
@@ -144,7 +150,7 @@ def send_pending_guide_reminders():
     
     count = 0
     for guide in pending_guides:
-        send_notification.delay(
+        enqueue_notification(
             beneficiary_id=guide.beneficiary.id,
             title="Guia em Análise",
             message=f"Sua guia {guide.guide_number} está sendo analisada. Em breve você receberá uma resposta.",
@@ -160,25 +166,23 @@ def send_pending_guide_reminders():
 @shared_task
 def generate_guide_pdf_task(guide_id):
     """
-    Generate PDF for a guide
+    Render the PDF of a guide into the document cache (unless its current
+    version is already there)
     """
+    from apps.common import document_cache
     from apps.guides.models import TISSGuide
-    from apps.guides.pdf import generate_guide_pdf
-    from django.core.files.base import ContentFile
+    from apps.guides.pdf import generate_guide_pdf, guide_version
     
     try:
         guide = TISSGuide.objects.select_related(
             'beneficiary',
-            'provider',
-            'beneficiary__health_plan'
-        ).prefetch_related('guideprocedure_set__procedure').get(id=guide_id)
+            'provider'
+        ).prefetch_related('guide_procedures__procedure').get(id=guide_id)
         
-        # Generate PDF
-        pdf_bytes = generate_guide_pdf(guide)
-        
-        # Save to guide
-        filename = f"guia_{guide.guide_number}.pdf"
-        guide.guide_pdf.save(filename, ContentFile(pdf_bytes), save=True)
+        document_cache.get_or_render(
+            document_cache.KIND_GUIDE, guide.pk, guide_version(guide),
+            lambda: generate_guide_pdf(guide)
+        )
         
         logger.info(f"PDF generated for guide {guide.guide_number}")
         return True
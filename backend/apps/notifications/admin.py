@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, PushToken, SystemMessage
+from .models import Notification, NotificationOutbox, PushToken, SystemMessage
 
 
 @admin.register(Notification)
@@ -25,3 +25,11 @@ class SystemMessageAdmin(admin.ModelAdmin):
     search_fields = ['title', 'message']
     filter_horizontal = ['target_companies', 'target_plans']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['beneficiary', 'title', 'notification_type', 'priority', 'created_at']
+    list_filter = ['notification_type', 'priority']
+    search_fields = ['beneficiary__full_name', 'title']
+    readonly_fields = ['dedup_key', 'created_at']
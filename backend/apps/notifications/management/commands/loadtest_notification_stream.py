@@ -0,0 +1,172 @@
+import asyncio
+import json
+import resource
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.beneficiaries.models import Beneficiary
+from apps.notifications import stream
+
+
+class Command(BaseCommand):
+    help = (
+        'Open many idle connections to the notification stream of a running ASGI server '
+        '(uvicorn elosaude_backend.asgi:application) and hold them, reporting how many stay '
+        'open, the heartbeats received and, with --server-pid, the worker memory per '
+        'connection. With --probe a synthetic event is published to every beneficiary used '
+        'and its delivery latency measured; run it with test users only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://localhost:8006/api/notifications/stream/',
+            help='Stream URL (default http://localhost:8006/api/notifications/stream/)'
+        )
+        parser.add_argument('--connections', type=int, default=20_000, help='Connections to open (default 20000)')
+        parser.add_argument('--users', type=int, default=100, help='Beneficiary users to spread them over (default 100)')
+        parser.add_argument('--rate', type=int, default=1000, help='New connections per second (default 1000)')
+        parser.add_argument('--hold', type=int, default=60, help='Seconds to hold them open (default 60)')
+        parser.add_argument('--server-pid', type=int, help='Worker process to measure (same host)')
+        parser.add_argument('--probe', action='store_true', help='Publish one event per beneficiary mid-hold')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('Use an http:// URL (no TLS) of the stream')
+
+        beneficiaries = (
+            Beneficiary.objects
+            .filter(user__isnull=False, user__is_active=True)
+            .select_related('user')[:options['users']]
+        )
+        tokens = [(beneficiary.pk, str(AccessToken.for_user(beneficiary.user))) for beneficiary in beneficiaries]
+        if not tokens:
+            raise CommandError('Nenhum beneficiário com usuário ativo')
+
+        # Every connection needs a file descriptor on this side too
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = options['connections'] + 1000
+        if soft < wanted:
+            limit = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+            if limit < wanted:
+                self.stdout.write(self.style.WARNING(f'Limite de arquivos abertos: {limit}'))
+
+        asyncio.run(self._run(url, tokens, options))
+
+    async def _run(self, url, tokens, options):
+        total = options['connections']
+        rate = max(options['rate'], 1)
+        pid = options['server_pid']
+        path = f'{url.path}?{url.query}' if url.query else url.path
+        stats = {'open': 0, 'peak': 0, 'failed': 0, 'dropped': 0, 'heartbeats': 0, 'latencies': []}
+
+        rss_before = self._rss(pid)
+        self.stdout.write(f'Abrindo {total} conexões ({len(tokens)} beneficiários, {rate}/s)...')
+        started = time.monotonic()
+        batch = max(rate // 10, 1)
+        clients = []
+        for i in range(total):
+            token = tokens[i % len(tokens)][1]
+            clients.append(asyncio.create_task(
+                self._client(url.hostname, url.port or 80, path, token, stats)
+            ))
+            if (i + 1) % batch == 0:
+                await asyncio.sleep(batch / rate)
+        await asyncio.sleep(2)  # let the last handshakes finish
+        self.stdout.write(
+            f'Abertas: {stats["open"]}, falhas: {stats["failed"]} '
+            f'em {time.monotonic() - started:.1f}s'
+        )
+
+        hold = options['hold']
+        if options['probe']:
+            await asyncio.sleep(hold / 2)
+            stream._publish([
+                json.dumps({'beneficiary_id': beneficiary_id, 'id': 0, 'data': {'loadtest_sent_at': time.time()}})
+                for beneficiary_id, _ in tokens
+            ])
+            await asyncio.sleep(hold - hold / 2)
+        else:
+            await asyncio.sleep(hold)
+
+        rss_after = self._rss(pid)
+        still_open = stats['open']
+        for client in clients:
+            client.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nConexões abertas ao final: {still_open} (pico {stats["peak"]}), '
+            f'encerradas pelo servidor: {stats["dropped"]}, falhas: {stats["failed"]}'
+        ))
+        self.stdout.write(f'Heartbeats recebidos: {stats["heartbeats"]}')
+        if options['probe']:
+            latencies = sorted(stats['latencies'])
+            self.stdout.write(f'Eventos entregues: {len(latencies)} de {still_open}')
+            if latencies:
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                self.stdout.write(
+                    f'Latência de entrega: mediana {statistics.median(latencies) * 1000:.1f} ms, '
+                    f'p99 {p99 * 1000:.1f} ms, máx {latencies[-1] * 1000:.1f} ms'
+                )
+        if rss_before is not None and rss_after is not None:
+            per_connection = (rss_after - rss_before) / max(stats['peak'], 1)
+            self.stdout.write(
+                f'Memória do worker: {rss_before / 1024:.0f} MB -> {rss_after / 1024:.0f} MB '
+                f'({per_connection:.1f} KB por conexão)'
+            )
+
+    async def _client(self, host, port, path, token, stats):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            stats['failed'] += 1
+            return
+
+        connected = False
+        try:
+            writer.write((
+                f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+                f'Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n'
+            ).encode())
+            if b' 200 ' not in await reader.readline():
+                stats['failed'] += 1
+                return
+            connected = True
+            stats['open'] += 1
+            stats['peak'] = max(stats['peak'], stats['open'])
+
+            while line := await reader.readline():
+                if line.startswith(b': ping'):
+                    stats['heartbeats'] += 1
+                elif line.startswith(b'data: ') and b'loadtest_sent_at' in line:
+                    sent_at = json.loads(line[6:])['loadtest_sent_at']
+                    stats['latencies'].append(time.time() - sent_at)
+            stats['dropped'] += 1
+        except (OSError, ValueError):
+            if connected:
+                stats['dropped'] += 1
+            else:
+                stats['failed'] += 1
+        finally:
+            if connected:
+                stats['open'] -= 1
+            writer.close()
+
+    def _rss(self, pid):
+        """Resident memory of ``pid`` in KB (Linux), or None"""
+        if pid is None:
+            return None
+        try:
+            with open(f'/proc/{pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1])
+        except OSError:
+            return None
+        return None
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0010_card_replica_cpf_key'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(max_length=30, verbose_name='Type')),
+                ('priority', models.CharField(default='MEDIUM', max_length=10, verbose_name='Priority')),
+                ('title', models.CharField(max_length=200, verbose_name='Title')),
+                ('message', models.TextField(verbose_name='Message')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Additional Data')),
+                ('dedup_key', models.CharField(max_length=40, verbose_name='Dedup Key')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('beneficiary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_notifications', to='beneficiaries.beneficiary')),
+            ],
+            options={
+                'verbose_name': 'Outbox Notification',
+                'verbose_name_plural': 'Outbox Notifications',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0010_card_replica_cpf_key'),
+        ('notifications', '0002_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['beneficiary', 'is_read', 'created_at'], name='notificatio_benefic_683560_idx'),
+        ),
+    ]
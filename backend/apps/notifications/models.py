@@ -47,6 +47,10 @@ class Notification(models.Model):
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         ordering = ['-created_at']
+        indexes = [
+            # Unread counts and the newest-first list of one beneficiary
+            models.Index(fields=['beneficiary', 'is_read', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.beneficiary.full_name} - {self.title}"
@@ -111,3 +115,32 @@ class SystemMessage(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class NotificationOutbox(models.Model):
+    """
+    Pending notifications appended by producers (see apps.notifications.outbox)
+    and drained in batches by the drain_notification_outbox task
+    """
+    beneficiary = models.ForeignKey('beneficiaries.Beneficiary', on_delete=models.CASCADE,
+                                    related_name='outbox_notifications')
+
+    notification_type = models.CharField(max_length=30, verbose_name=_('Type'))
+    priority = models.CharField(max_length=10, default='MEDIUM', verbose_name=_('Priority'))
+    title = models.CharField(max_length=200, verbose_name=_('Title'))
+    message = models.TextField(verbose_name=_('Message'))
+    data = models.JSONField(default=dict, blank=True, verbose_name=_('Additional Data'))
+
+    # Identical notifications for the same beneficiary share a key and are
+    # coalesced within NOTIFICATION_COALESCE_WINDOW
+    dedup_key = models.CharField(max_length=40, verbose_name=_('Dedup Key'))
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Outbox Notification')
+        verbose_name_plural = _('Outbox Notifications')
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.beneficiary_id} - {self.title}"
@@ -0,0 +1,167 @@
+"""
+Notification outbox
+
+Producers append notifications to the NotificationOutbox table instead of
+sending one Celery message per recipient. The drain_notification_outbox task
+takes pending rows in batches (SELECT ... FOR UPDATE SKIP LOCKED, so several
+workers can drain at once), coalesces identical notifications for the same
+beneficiary within a window, bulk-creates the Notification rows and deletes
+the drained outbox rows.
+
+Settings:
+    NOTIFICATION_OUTBOX_BATCH_SIZE   outbox rows drained per transaction
+    NOTIFICATION_COALESCE_WINDOW     seconds during which an identical
+                                     notification (same beneficiary, type,
+                                     title and message) is dropped
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import stream, unread
+from .models import Notification, NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+
+DRAIN_SCHEDULED_KEY = 'notifications:outbox:drain_scheduled'
+DRAIN_DELAY = 5  # seconds; producers within this window share one drain message
+SENT_KEY_PREFIX = 'notifications:sent'
+
+
+def _batch_size():
+    return getattr(settings, 'NOTIFICATION_OUTBOX_BATCH_SIZE', 500)
+
+
+def _coalesce_window():
+    return getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 3600)
+
+
+def make_dedup_key(beneficiary_id, notification_type, title, message):
+    """Key shared by identical notifications for the same beneficiary"""
+    raw = f'{beneficiary_id}|{notification_type}|{title}|{message}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def enqueue_notification(beneficiary_id, title, message, notification_type, data=None, priority='MEDIUM'):
+    """Append one notification to the outbox (same arguments as send_notification)"""
+    return enqueue_notifications([{
+        'beneficiary_id': beneficiary_id,
+        'title': title,
+        'message': message,
+        'notification_type': notification_type,
+        'data': data,
+        'priority': priority,
+    }])
+
+
+def enqueue_notifications(notifications):
+    """
+    Append many notifications to the outbox with one bulk insert.
+    ``notifications`` is a list of dicts with the send_notification arguments.
+    """
+    rows = [
+        NotificationOutbox(
+            beneficiary_id=item['beneficiary_id'],
+            title=item['title'],
+            message=item['message'],
+            notification_type=item['notification_type'],
+            priority=item.get('priority', 'MEDIUM'),
+            data=item.get('data') or {},
+            dedup_key=make_dedup_key(
+                item['beneficiary_id'], item['notification_type'], item['title'], item['message']
+            ),
+        )
+        for item in notifications
+    ]
+    if not rows:
+        return 0
+
+    NotificationOutbox.objects.bulk_create(rows, batch_size=_batch_size())
+    schedule_drain()
+    return len(rows)
+
+
+def schedule_drain():
+    """
+    Ask for a drain shortly after the current transaction commits. At most
+    one drain message is sent per DRAIN_DELAY seconds however many producers
+    enqueue in that time; a periodic drain catches anything left behind.
+    """
+    if cache.add(DRAIN_SCHEDULED_KEY, 1, DRAIN_DELAY):
+        from .tasks import drain_notification_outbox
+        transaction.on_commit(
+            lambda: drain_notification_outbox.apply_async(countdown=DRAIN_DELAY)
+        )
+
+
+def _deliver(batch):
+    """
+    Create Notification rows for a batch of outbox rows, dropping those
+    already delivered within the coalesce window.
+    Returns (delivered, coalesced, delivered dedup keys).
+    """
+    window = _coalesce_window()
+    recent = set()
+    if window > 0:
+        sent_keys = {f'{SENT_KEY_PREFIX}:{row.dedup_key}': row.dedup_key for row in batch}
+        recent = {sent_keys[key] for key in cache.get_many(list(sent_keys))}
+
+    notifications = []
+    delivered_keys = set()
+    coalesced = 0
+    for row in batch:
+        if row.dedup_key in recent or row.dedup_key in delivered_keys:
+            coalesced += 1
+            continue
+        delivered_keys.add(row.dedup_key)
+        notifications.append(Notification(
+            beneficiary_id=row.beneficiary_id,
+            title=row.title,
+            message=row.message,
+            notification_type=row.notification_type,
+            priority=row.priority,
+            data=row.data,
+        ))
+
+    Notification.objects.bulk_create(notifications)
+    unread.notifications_created(notification.beneficiary_id for notification in notifications)
+    stream.publish(notifications)
+
+    return len(notifications), coalesced, delivered_keys
+
+
+def drain_outbox(batch_size=None):
+    """Deliver every pending outbox row; returns delivered and coalesced counts"""
+    batch_size = batch_size or _batch_size()
+    totals = {'delivered': 0, 'coalesced': 0}
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                NotificationOutbox.objects.select_for_update(skip_locked=True)
+                .order_by('id')[:batch_size]
+            )
+            if not batch:
+                break
+
+            delivered, coalesced, delivered_keys = _deliver(batch)
+            NotificationOutbox.objects.filter(id__in=[row.id for row in batch]).delete()
+
+        # Remember deliveries only once they are committed
+        window = _coalesce_window()
+        if window > 0 and delivered_keys:
+            cache.set_many({f'{SENT_KEY_PREFIX}:{key}': 1 for key in delivered_keys}, window)
+
+        totals['delivered'] += delivered
+        totals['coalesced'] += coalesced
+
+    if totals['delivered'] or totals['coalesced']:
+        logger.info(
+            f"Notification outbox drained: {totals['delivered']} delivered, "
+            f"{totals['coalesced']} coalesced"
+        )
+    return totals
@@ -0,0 +1,352 @@
+"""
+Notification stream (server-sent events)
+
+GET /api/notifications/stream/ keeps a text/event-stream response open and
+pushes every notification created for the authenticated beneficiary as an
+event (``id`` = notification id, ``event: notification``, ``data`` = the
+NotificationSerializer JSON). It is served by NotificationStreamApp, a plain
+ASGI app mounted in front of Django by elosaude_backend.asgi, so an idle
+connection costs a coroutine and a queue rather than a worker thread.
+
+Producers call ``publish(notifications)``: once the transaction commits the
+serialized rows go out on one Redis pub/sub channel. Each worker process
+holds a single subscription (StreamBroker) and fans the events out to its
+connections of the same beneficiary.
+
+Resume: a reconnecting client sends Last-Event-ID (EventSource does it by
+itself) or ``?last_event_id=``; the latest notifications after that id are
+replayed from the database before the live events, and duplicates are
+skipped. A fresh connection gets live events only. When the Redis
+subscription drops, every stream of the worker is ended so that clients
+reconnect and replay what was missed; so is a client that falls QUEUE_SIZE
+events behind.
+
+Authentication is the API's JWT access token, from the Authorization header
+or ``?token=`` (a browser EventSource cannot set headers). The stream ends
+when the token expires and the client reconnects with a fresh one.
+
+Settings:
+    NOTIFICATION_STREAM_REDIS_URL     Redis server of the pub/sub channel
+    NOTIFICATION_STREAM_HEARTBEAT     seconds between heartbeat comments, which
+                                      keep proxies from closing idle streams
+    NOTIFICATION_STREAM_REPLAY_LIMIT  most notifications replayed on resume
+"""
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+
+from . import unread
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+PATH = '/api/notifications/stream/'
+CHANNEL = 'notifications:stream'
+QUEUE_SIZE = 100  # undelivered events a connection may hold before it is dropped
+RETRY_MS = 3000  # reconnection delay suggested to clients
+
+
+def _redis_url():
+    return getattr(settings, 'NOTIFICATION_STREAM_REDIS_URL', 'redis://localhost:6379/0')
+
+
+def _heartbeat():
+    return getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT', 15)
+
+
+def _replay_limit():
+    return getattr(settings, 'NOTIFICATION_STREAM_REPLAY_LIMIT', 100)
+
+
+def _event(notification):
+    from .serializers import NotificationSerializer
+    return {
+        'beneficiary_id': notification.beneficiary_id,
+        'id': notification.pk,
+        'data': NotificationSerializer(notification).data,
+    }
+
+
+# ============ Publishing ============
+
+_publisher = None
+
+
+def _client():
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(_redis_url())
+    return _publisher
+
+
+def publish(notifications):
+    """
+    Push newly created notifications to the connected beneficiaries once the
+    current transaction commits
+    """
+    messages = [json.dumps(_event(notification), cls=DjangoJSONEncoder) for notification in notifications]
+    if messages:
+        transaction.on_commit(lambda: _publish(messages))
+
+
+def _publish(messages):
+    try:
+        pipeline = _client().pipeline(transaction=False)
+        for message in messages:
+            pipeline.publish(CHANNEL, message)
+        pipeline.execute()
+    except redis.RedisError as e:
+        # Connected clients miss these until they reconnect and resume
+        logger.warning(f"Could not publish {len(messages)} notifications to the stream: {str(e)}")
+
+
+# ============ Fan-out ============
+
+class Subscription:
+    """Events waiting to be sent to one connection"""
+
+    def __init__(self, beneficiary_id):
+        self.beneficiary_id = beneficiary_id
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.closed = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.closed = True  # too far behind; the client resumes after reconnecting
+
+    def close(self):
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)  # wake the connection up
+        except asyncio.QueueFull:
+            pass  # it has events to wake up on
+
+
+class StreamBroker:
+    """One Redis subscription per process, fanned out to its connections"""
+
+    def __init__(self):
+        self.subscriptions = {}  # beneficiary id -> set of Subscription
+        self._listener = None
+
+    @property
+    def connections(self):
+        return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+    def subscribe(self, beneficiary_id):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        subscription = Subscription(beneficiary_id)
+        self.subscriptions.setdefault(beneficiary_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscriptions = self.subscriptions.get(subscription.beneficiary_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.beneficiary_id]
+
+    def close_all(self):
+        for subscriptions in list(self.subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+
+    async def close(self):
+        self.close_all()
+        if self._listener is not None:
+            self._listener.cancel()
+
+    async def _listen(self):
+        delay = 1
+        while True:
+            client = aioredis.Redis.from_url(_redis_url())
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                delay = 1
+                async for message in pubsub.listen():
+                    self._dispatch(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification stream subscription lost: {str(e)}")
+                # Events published meanwhile are lost; make every client resume
+                self.close_all()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                await pubsub.reset()
+                await client.close()
+
+    def _dispatch(self, raw):
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Invalid notification stream message: {raw!r}")
+            return
+        for subscription in list(self.subscriptions.get(event['beneficiary_id'], ())):
+            subscription.push(event)
+
+
+# ============ ASGI app ============
+
+def _authenticate(raw_token):
+    """(beneficiary id, token expiry timestamp) for a valid access token, else None"""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework.exceptions import AuthenticationFailed
+
+    if not raw_token:
+        return None
+    close_old_connections()
+    try:
+        authentication = JWTAuthentication()
+        token = authentication.get_validated_token(raw_token)
+        beneficiary_id = unread.beneficiary_id_for_user(authentication.get_user(token))
+    except AuthenticationFailed:
+        return None
+    finally:
+        close_old_connections()
+    return (beneficiary_id, token['exp']) if beneficiary_id else None
+
+
+def _replay(beneficiary_id, last_id):
+    """Events of the latest notifications after ``last_id``, oldest first"""
+    close_old_connections()
+    try:
+        notifications = list(
+            Notification.objects
+            .filter(beneficiary_id=beneficiary_id, pk__gt=last_id)
+            .order_by('-pk')[:_replay_limit()]
+        )
+        return [_event(notification) for notification in reversed(notifications)]
+    finally:
+        close_old_connections()
+
+
+def _last_event_id(headers, params):
+    value = headers.get(b'last-event-id', b'').decode() or params.get('last_event_id', [''])[0]
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+async def _respond(send, status, detail):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': detail}).encode()})
+
+
+async def _write(send, text):
+    await send({'type': 'http.response.body', 'body': text.encode(), 'more_body': True})
+
+
+async def _watch_disconnect(receive, subscription):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+    subscription.close()
+
+
+class NotificationStreamApp:
+    """Serve the notification stream at PATH and pass everything else to ``app``"""
+
+    def __init__(self, app):
+        self.app = app
+        self.broker = StreamBroker()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == PATH:
+            await self.stream(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.broker.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def stream(self, scope, receive, send):
+        if scope['method'] != 'GET':
+            return await _respond(send, 405, 'Method not allowed.')
+
+        headers = dict(scope['headers'])
+        params = parse_qs(scope['query_string'].decode())
+        authorization = headers.get(b'authorization', b'').decode().split()
+        raw_token = authorization[1] if len(authorization) == 2 and authorization[0] == 'Bearer' else None
+        identity = await sync_to_async(_authenticate, thread_sensitive=False)(
+            raw_token or params.get('token', [''])[0]
+        )
+        if identity is None:
+            return await _respond(send, 401, 'Authentication credentials were not provided or are invalid.')
+        beneficiary_id, expires_at = identity
+        last_id = _last_event_id(headers, params)
+
+        # Subscribe before the replay so nothing created in between is missed
+        subscription = self.broker.subscribe(beneficiary_id)
+        watcher = asyncio.create_task(_watch_disconnect(receive, subscription))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),  # keep nginx from buffering events
+                ],
+            })
+            await _write(send, f'retry: {RETRY_MS}\n\n')
+
+            if last_id is not None:
+                for event in await sync_to_async(_replay, thread_sensitive=False)(beneficiary_id, last_id):
+                    await self._send_event(send, event)
+                    last_id = event['id']
+
+            await self._relay(send, subscription, last_id, expires_at)
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            watcher.cancel()
+            self.broker.unsubscribe(subscription)
+
+    async def _relay(self, send, subscription, last_id, expires_at):
+        heartbeat = _heartbeat()
+        while not subscription.closed:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                await _write(send, ': ping\n\n')
+                continue
+            if event is None or subscription.closed:
+                return
+            if last_id is not None and event['id'] <= last_id:
+                continue  # already replayed
+            await self._send_event(send, event)
+
+    async def _send_event(self, send, event):
+        data = json.dumps(event['data'], cls=DjangoJSONEncoder)
+        await _write(send, f"id: {event['id']}\nevent: notification\ndata: {data}\n\n")
@@ -13,6 +13,7 @@ def send_notification(beneficiary_id, title, message, notification_type, data=No
     Creates in-app notification and sends push notification if available
     """
     from apps.notifications.models import Notification
+    from apps.notifications import stream, unread
     from apps.beneficiaries.models import Beneficiary
     
     try:
@@ -27,6 +28,8 @@ def send_notification(beneficiary_id, title, message, notification_type, data=No
             priority=priority,
             data=data or {}
         )
+        unread.notifications_created([beneficiary.id])
+        stream.publish([notification])
         
         # TODO: Send push notification when FCM is configured
         # send_push_to_beneficiary(beneficiary, title, message, data)
@@ -60,6 +63,7 @@ def send_bulk_notification(beneficiary_ids, title, message, notification_type, d
     Send notification to multiple beneficiaries
     """
     from apps.notifications.models import Notification
+    from apps.notifications import stream, unread
     from apps.beneficiaries.models import Beneficiary
     
     try:
@@ -78,6 +82,8 @@ def send_bulk_notification(beneficiary_ids, title, message, notification_type, d
         
         # Bulk create for performance
         Notification.objects.bulk_create(notifications)
+        unread.notifications_created(notification.beneficiary_id for notification in notifications)
+        stream.publish(notifications)
         
         logger.info(f"Bulk notification sent to {len(beneficiaries)} beneficiaries")
         return len(beneficiaries)
@@ -87,6 +93,39 @@ def send_bulk_notification(beneficiary_ids, title, message, notification_type, d
         return 0
 
 
+@shared_task
+def drain_notification_outbox():
+    """
+    Deliver pending notifications from the outbox in batches
+    Scheduled by producers after they enqueue, and every minute as a fallback
+    """
+    from apps.notifications.outbox import drain_outbox
+
+    try:
+        return drain_outbox()
+    except Exception as e:
+        logger.error(f"Error draining notification outbox: {str(e)}")
+        return None
+
+
+@shared_task
+def reconcile_unread_notification_counts():
+    """
+    Rewrite the cached unread counters of beneficiaries whose notifications
+    changed recently from the database
+    Runs every 15 minutes
+    """
+    from apps.notifications.unread import reconcile
+
+    try:
+        count = reconcile()
+        logger.info(f"Reconciled unread notification counters of {count} beneficiaries")
+        return count
+    except Exception as e:
+        logger.error(f"Error reconciling unread notification counters: {str(e)}")
+        return 0
+
+
 @shared_task
 def cleanup_old_notifications():
     """
@@ -0,0 +1,151 @@
+"""
+Unread notification counters
+
+Each beneficiary's unread count is kept in the cache under
+``notifications:unread:<beneficiary_id>``. Writers adjust it after their
+transaction commits: +n when notifications are created (outbox drain,
+send_notification tasks), -1 when one is read or an unread one deleted,
+0 on mark-all-as-read. A missing counter is recomputed from the database
+(using the (beneficiary, is_read, created_at) index) and cached again; only
+existing counters are adjusted, so a counter is never created from a delta.
+
+The reconcile_unread_notification_counts task rewrites the counters of beneficiaries
+whose notifications changed recently, so writes that bypass these helpers
+(admin edits, queryset updates, cleanups) are corrected within an interval.
+
+UnreadNotificationsMiddleware returns the count of the authenticated
+beneficiary in the X-Unread-Notifications header of every response.
+
+Settings:
+    NOTIFICATION_UNREAD_CACHE_TTL      seconds a counter lives in the cache
+    NOTIFICATION_UNREAD_RECONCILE_WINDOW
+                                       seconds of notification changes the
+                                       reconcile task looks back on
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Notification
+
+
+KEY_PREFIX = 'notifications:unread'
+USER_KEY_PREFIX = 'notifications:beneficiary_of_user'
+HEADER = 'X-Unread-Notifications'
+NO_BENEFICIARY = 0  # cached for users without a beneficiary profile
+
+
+def _ttl():
+    return getattr(settings, 'NOTIFICATION_UNREAD_CACHE_TTL', 86400)
+
+
+def _reconcile_window():
+    return getattr(settings, 'NOTIFICATION_UNREAD_RECONCILE_WINDOW', 7200)
+
+
+def _key(beneficiary_id):
+    return f'{KEY_PREFIX}:{beneficiary_id}'
+
+
+def count_unread(beneficiary_id):
+    """Unread count straight from the database"""
+    return Notification.objects.filter(beneficiary_id=beneficiary_id, is_read=False).count()
+
+
+def get_unread_count(beneficiary_id):
+    """Cached unread count, recomputed from the database when missing"""
+    count = cache.get(_key(beneficiary_id))
+    if count is None:
+        count = count_unread(beneficiary_id)
+        cache.add(_key(beneficiary_id), count, _ttl())
+    return max(count, 0)
+
+
+def _adjust(beneficiary_id, delta):
+    try:
+        if cache.incr(_key(beneficiary_id), delta) < 0:
+            cache.delete(_key(beneficiary_id))  # drifted; recompute on next read
+    except ValueError:
+        pass  # not cached; the next read counts from the database
+
+
+def notifications_created(beneficiary_ids):
+    """
+    Count new unread notifications (one per beneficiary id in the list,
+    repeated ids allowed) once the current transaction commits
+    """
+    counts = Counter(beneficiary_ids)
+    transaction.on_commit(lambda: [_adjust(beneficiary_id, n) for beneficiary_id, n in counts.items()])
+
+
+def notification_read(beneficiary_id):
+    """One unread notification was read or deleted"""
+    transaction.on_commit(lambda: _adjust(beneficiary_id, -1))
+
+
+def all_read(beneficiary_id):
+    """Every notification of the beneficiary was marked as read"""
+    transaction.on_commit(lambda: cache.set(_key(beneficiary_id), 0, _ttl()))
+
+
+def beneficiary_id_for_user(user):
+    """Beneficiary id of an authenticated user (cached), or None"""
+    key = f'{USER_KEY_PREFIX}:{user.pk}'
+    beneficiary_id = cache.get(key)
+    if beneficiary_id is None:
+        from apps.beneficiaries.models import Beneficiary
+        beneficiary_id = Beneficiary.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+        beneficiary_id = beneficiary_id or NO_BENEFICIARY
+        cache.set(key, beneficiary_id, _ttl())
+    return beneficiary_id or None
+
+
+def reconcile(since=None):
+    """
+    Rewrite the counters of every beneficiary with notifications created or
+    changed since ``since`` (default: the reconcile window) from one GROUP BY.
+    Returns the number of counters written.
+    """
+    since = since or timezone.now() - timedelta(seconds=_reconcile_window())
+    beneficiary_ids = set(
+        Notification.objects.filter(updated_at__gte=since)
+        .values_list('beneficiary_id', flat=True)
+        .distinct()
+    )
+    if not beneficiary_ids:
+        return 0
+
+    counts = dict(
+        Notification.objects.filter(beneficiary_id__in=beneficiary_ids, is_read=False)
+        .order_by()
+        .values_list('beneficiary_id')
+        .annotate(unread=Count('id'))
+    )
+    cache.set_many(
+        {_key(beneficiary_id): counts.get(beneficiary_id, 0) for beneficiary_id in beneficiary_ids},
+        _ttl()
+    )
+    return len(beneficiary_ids)
+
+
+class UnreadNotificationsMiddleware:
+    """Add the authenticated beneficiary's unread count to every response"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # DRF sets request.user on the underlying request once it authenticates
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and HEADER not in response:
+            beneficiary_id = beneficiary_id_for_user(user)
+            if beneficiary_id:
+                response[HEADER] = get_unread_count(beneficiary_id)
+        return response
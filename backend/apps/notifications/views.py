@@ -5,6 +5,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from django.db import models
 from apps.common.pagination import StandardResultsSetPagination, SmallResultsSetPagination
+from . import stream, unread
 from .models import Notification, PushToken, SystemMessage
 from .serializers import NotificationSerializer, PushTokenSerializer, SystemMessageSerializer
 
@@ -50,28 +51,58 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         '''Get count of unread notifications'''
-        count = self.get_queryset().filter(is_read=False).count()
+        beneficiary_id = unread.beneficiary_id_for_user(request.user)
+        count = unread.get_unread_count(beneficiary_id) if beneficiary_id else 0
         return Response({'unread_count': count})
 
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
         '''Mark notification as read'''
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        # Only the request that flips the row decrements the unread counter
+        now = timezone.now()
+        if Notification.objects.filter(pk=notification.pk, is_read=False).update(
+            is_read=True, read_at=now, updated_at=now
+        ):
+            unread.notification_read(notification.beneficiary_id)
+            notification.is_read, notification.read_at, notification.updated_at = True, now, now
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
         '''Mark all notifications as read'''
+        now = timezone.now()
         updated_count = self.get_queryset().filter(is_read=False).update(
             is_read=True,
-            read_at=timezone.now()
+            read_at=now,
+            updated_at=now
         )
+        beneficiary_id = unread.beneficiary_id_for_user(request.user)
+        if beneficiary_id:
+            unread.all_read(beneficiary_id)
         return Response({'marked_as_read': updated_count})
 
+    def perform_create(self, serializer):
+        notification = serializer.save()
+        if not notification.is_read:
+            unread.notifications_created([notification.beneficiary_id])
+        stream.publish([notification])
+
+    def perform_update(self, serializer):
+        was_unread = not serializer.instance.is_read
+        notification = serializer.save()
+        if was_unread and notification.is_read:
+            unread.notification_read(notification.beneficiary_id)
+        elif not was_unread and not notification.is_read:
+            unread.notifications_created([notification.beneficiary_id])
+
+    def perform_destroy(self, instance):
+        was_unread = not instance.is_read
+        instance.delete()
+        if was_unread:
+            unread.notification_read(instance.beneficiary_id)
+
 
 class PushTokenViewSet(viewsets.ModelViewSet):
     queryset = PushToken.objects.all()
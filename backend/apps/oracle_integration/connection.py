@@ -1,27 +1,75 @@
 """
 Oracle Database Connection Manager
 Direct connection to Oracle using oracledb instead of Django ORM
+
+Connections come from a process-wide session pool. Each query checks a
+session out of the pool and returns it when done, so concurrent gunicorn
+threads never share a session. Pool sizing and timeouts are configured via
+``settings.ORACLE_POOL``.
 """
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
 import oracledb
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_CONFIG = {
+    'MIN': 2,
+    'MAX': 10,
+    'INCREMENT': 1,
+    'WAIT_TIMEOUT': 5000,  # milliseconds to wait for a free session
+    'PING_INTERVAL': 60,  # seconds a session may sit idle before being pinged
+    'HEALTH_CHECK_INTERVAL': 30,  # seconds between background health checks
+}
+
+DEFAULT_FETCH_ARRAYSIZE = 500  # rows per round-trip in stream_query
+
 
 class OracleConnection:
-    """Singleton Oracle connection manager"""
+    """Pooled Oracle connection manager"""
 
-    _connection = None
     _pool = None
+    _lock = threading.Lock()
+    _health_thread = None
+
+    # Pool statistics (guarded by _stats_lock)
+    _stats_lock = threading.Lock()
+    _stats = {
+        'acquired': 0,
+        'timeouts': 0,
+        'errors': 0,
+        'total_wait_ms': 0.0,
+        'max_wait_ms': 0.0,
+        'last_health_check': None,
+        'last_health_status': None,
+        'last_health_latency_ms': None,
+    }
 
     @classmethod
-    def get_connection(cls):
-        """Get or create Oracle connection"""
-        if cls._connection is None or not cls._connection.ping():
-            cls._connection = cls._create_connection()
-        return cls._connection
+    def get_pool_config(cls):
+        """Return pool settings merged with defaults"""
+        config = dict(DEFAULT_POOL_CONFIG)
+        config.update(getattr(settings, 'ORACLE_POOL', {}))
+        return config
+
+    @classmethod
+    def get_pool(cls):
+        """Get or lazily create the session pool"""
+        if cls._pool is None:
+            with cls._lock:
+                if cls._pool is None:
+                    cls._pool = cls._create_pool()
+                    cls._start_health_monitor()
+        return cls._pool
 
     @classmethod
-    def _create_connection(cls):
-        """Create new Oracle connection"""
+    def _create_pool(cls):
+        """Create new Oracle session pool"""
         # Initialize thick mode
         try:
             oracledb.init_oracle_client(lib_dir='/opt/oracle/instantclient_21_7')
@@ -30,6 +78,7 @@ class OracleConnection:
 
         # Get Oracle config from settings
         oracle_config = settings.DATABASES.get('oracle', {})
+        pool_config = cls.get_pool_config()
 
         dsn = oracledb.makedsn(
             oracle_config.get('HOST', '192.168.40.29'),
@@ -37,59 +86,240 @@ class OracleConnection:
             service_name=oracle_config.get('NAME', 'SIML')
         )
 
-        connection = oracledb.connect(
+        pool = oracledb.create_pool(
             user=oracle_config.get('USER', 'estagiario'),
             password=oracle_config.get('PASSWORD', 'EIst4269uu'),
-            dsn=dsn
+            dsn=dsn,
+            min=pool_config['MIN'],
+            max=pool_config['MAX'],
+            increment=pool_config['INCREMENT'],
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=pool_config['WAIT_TIMEOUT'],
+            ping_interval=pool_config['PING_INTERVAL'],
+        )
+
+        logger.info(
+            "Oracle session pool created (min=%s, max=%s, increment=%s)",
+            pool_config['MIN'], pool_config['MAX'], pool_config['INCREMENT']
         )
+        return pool
 
-        return connection
+    @classmethod
+    def _start_health_monitor(cls):
+        """Start the daemon thread that checks pool health in the background"""
+        interval = cls.get_pool_config()['HEALTH_CHECK_INTERVAL']
+        if not interval or interval <= 0:
+            return
+        if cls._health_thread is not None and cls._health_thread.is_alive():
+            return
+
+        def monitor():
+            while cls._pool is not None:
+                time.sleep(interval)
+                try:
+                    cls.check_health()
+                except Exception as e:
+                    logger.warning(f"Oracle pool health check failed: {str(e)}")
+
+        cls._health_thread = threading.Thread(
+            target=monitor, name='oracle-pool-health', daemon=True
+        )
+        cls._health_thread.start()
+
+    @classmethod
+    def check_health(cls):
+        """
+        Run ``SELECT 1 FROM DUAL`` on a pooled session and record the result.
+        Returns the round-trip latency in milliseconds.
+        """
+        start = time.monotonic()
+        try:
+            with cls.acquire() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT 1 FROM DUAL")
+                    cursor.fetchone()
+                finally:
+                    cursor.close()
+        except Exception:
+            with cls._stats_lock:
+                cls._stats['last_health_check'] = time.time()
+                cls._stats['last_health_status'] = 'error'
+                cls._stats['last_health_latency_ms'] = None
+            raise
+
+        latency_ms = (time.monotonic() - start) * 1000
+        with cls._stats_lock:
+            cls._stats['last_health_check'] = time.time()
+            cls._stats['last_health_status'] = 'ok'
+            cls._stats['last_health_latency_ms'] = round(latency_ms, 2)
+        return latency_ms
 
     @classmethod
-    def execute_query(cls, query, params=None):
-        """Execute a SELECT query and return results"""
-        conn = cls.get_connection()
-        cursor = conn.cursor()
+    @contextmanager
+    def acquire(cls):
+        """
+        Check a session out of the pool for the duration of the block.
+
+        Usage:
+            with OracleConnection.acquire() as conn:
+                cursor = conn.cursor()
+                ...
+        """
+        pool = cls.get_pool()
+        start = time.monotonic()
+        try:
+            conn = pool.acquire()
+        except oracledb.Error as e:
+            with cls._stats_lock:
+                if 'DPY-4005' in str(e) or 'ORA-24457' in str(e):
+                    cls._stats['timeouts'] += 1
+                else:
+                    cls._stats['errors'] += 1
+            raise
+
+        wait_ms = (time.monotonic() - start) * 1000
+        with cls._stats_lock:
+            cls._stats['acquired'] += 1
+            cls._stats['total_wait_ms'] += wait_ms
+            cls._stats['max_wait_ms'] = max(cls._stats['max_wait_ms'], wait_ms)
+
         try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-
-            # Get column names
-            columns = [desc[0] for desc in cursor.description]
-
-            # Fetch all rows
-            rows = cursor.fetchall()
-
-            # Convert to list of dicts
-            results = []
-            for row in rows:
-                row_dict = {}
-                for i, col_name in enumerate(columns):
-                    value = row[i]
-                    # Convert to JSON-serializable format
-                    if value is not None:
-                        if hasattr(value, 'isoformat'):  # datetime objects
-                            value = value.isoformat()
-                        elif isinstance(value, bytes):
-                            value = value.decode('utf-8', errors='ignore')
-                    row_dict[col_name] = value
-                results.append(row_dict)
-
-            return results
+            yield conn
         finally:
-            cursor.close()
+            try:
+                pool.release(conn)
+            except oracledb.Error as e:
+                logger.warning(f"Error releasing Oracle session: {str(e)}")
+
+    @classmethod
+    def get_connection(cls):
+        """
+        Check out a session from the pool.
+        The caller is responsible for returning it with ``release_connection``;
+        prefer ``acquire()`` which does this automatically.
+        """
+        return cls.get_pool().acquire()
+
+    @classmethod
+    def release_connection(cls, conn):
+        """Return a session obtained via ``get_connection`` to the pool"""
+        cls.get_pool().release(conn)
+
+    @classmethod
+    def get_pool_stats(cls):
+        """Return pool statistics for metrics and capacity planning"""
+        config = cls.get_pool_config()
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+
+        acquired = stats['acquired']
+        stats['avg_wait_ms'] = round(stats['total_wait_ms'] / acquired, 2) if acquired else 0.0
+        stats['total_wait_ms'] = round(stats['total_wait_ms'], 2)
+        stats['max_wait_ms'] = round(stats['max_wait_ms'], 2)
+        stats['min'] = config['MIN']
+        stats['max'] = config['MAX']
+        stats['increment'] = config['INCREMENT']
+
+        pool = cls._pool
+        if pool is None:
+            stats.update({'initialized': False, 'opened': 0, 'busy': 0})
+        else:
+            stats.update({
+                'initialized': True,
+                'opened': pool.opened,
+                'busy': pool.busy,
+            })
+        return stats
+
+    @classmethod
+    def close_pool(cls):
+        """Close the pool (used on shutdown and in maintenance scripts)"""
+        with cls._lock:
+            if cls._pool is not None:
+                pool, cls._pool = cls._pool, None
+                pool.close(force=True)
+
+    @classmethod
+    def get_fetch_arraysize(cls):
+        """Rows fetched per round-trip when streaming query results"""
+        return getattr(settings, 'ORACLE_FETCH_ARRAYSIZE', DEFAULT_FETCH_ARRAYSIZE)
+
+    @staticmethod
+    def _output_type_handler(cursor, metadata):
+        """
+        Convert dates to ISO strings and RAW values to text inside the driver,
+        as each row is fetched, so results are JSON-serializable without a
+        second pass over every cell.
+        """
+        if metadata.type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP,
+                                  oracledb.DB_TYPE_TIMESTAMP_TZ, oracledb.DB_TYPE_TIMESTAMP_LTZ):
+            return cursor.var(metadata.type_code, arraysize=cursor.arraysize,
+                              outconverter=lambda value: value.isoformat())
+        if metadata.type_code in (oracledb.DB_TYPE_RAW, oracledb.DB_TYPE_LONG_RAW):
+            return cursor.var(metadata.type_code, arraysize=cursor.arraysize,
+                              outconverter=lambda value: value.decode('utf-8', errors='ignore'))
+        return None
+
+    @classmethod
+    def stream_query(cls, query, params=None, timeout=None, arraysize=None,
+                     as_tuples=False, convert=True):
+        """
+        Execute a SELECT query and yield its rows in batches of ``arraysize``.
+
+        Rows are dicts keyed by column name, or plain tuples in SELECT order
+        when ``as_tuples`` is set (cheaper for bulk consumers such as exports
+        and replication). With ``convert`` dates come back as ISO strings and
+        RAW values as text; pass ``convert=False`` to get native driver types.
+        The pooled session is held until the generator is exhausted or closed.
+        """
+        arraysize = arraysize or cls.get_fetch_arraysize()
+        with cls.acquire() as conn:
+            if timeout:
+                conn.call_timeout = int(timeout)
+            cursor = conn.cursor()
+            try:
+                cursor.arraysize = arraysize
+                cursor.prefetchrows = arraysize + 1
+                if convert:
+                    cursor.outputtypehandler = cls._output_type_handler
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                if not as_tuples:
+                    columns = [desc[0] for desc in cursor.description]
+                    cursor.rowfactory = lambda *row: dict(zip(columns, row))
+
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+                if timeout:
+                    conn.call_timeout = 0
+
+    @classmethod
+    def execute_query(cls, query, params=None, timeout=None):
+        """
+        Execute a SELECT query and return results as a list of dicts
+        ``timeout`` (milliseconds) bounds every round-trip of the query;
+        Oracle cancels the call and raises if it is exceeded.
+        Use ``stream_query`` for large result sets.
+        """
+        results = []
+        for rows in cls.stream_query(query, params, timeout=timeout):
+            results.extend(rows)
+        return results
 
     @classmethod
     def test_connection(cls):
         """Test Oracle connection"""
         try:
-            conn = cls.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM DUAL")
-            result = cursor.fetchone()
-            cursor.close()
-            return result is not None
+            cls.check_health()
+            return True
         except Exception as e:
             raise Exception(f"Oracle connection test failed: {str(e)}")
@@ -0,0 +1,68 @@
+"""
+Precomputed statistics for the Oracle unified card view
+
+Aggregating DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS scans the whole view, so
+the estatisticas endpoint serves a snapshot from the Django cache instead.
+The snapshot is refreshed by a periodic Celery task
+(apps.oracle_integration.tasks.refresh_card_statistics) and computed on
+demand only when the cache is empty.
+"""
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .connection import OracleConnection
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_KEY = 'oracle:card_statistics'
+CACHE_TIMEOUT = 24 * 60 * 60  # a stale snapshot beats scanning Oracle per request
+
+STATS_BY_TYPE_QUERY = """
+    SELECT TIPO_CARTEIRA AS "tipo_carteira",
+           COUNT(MATRICULA_SOUL) AS "total",
+           SUM(CASE WHEN SN_ATIVO = 'S' THEN 1 ELSE 0 END) AS "ativos"
+    FROM DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS
+    GROUP BY TIPO_CARTEIRA
+    ORDER BY 2 DESC
+"""
+STATS_BY_PROVIDER_QUERY = """
+    SELECT PRESTADOR_REDE AS "prestador_rede",
+           COUNT(MATRICULA_SOUL) AS "total"
+    FROM DBAPS.ESAU_V_APP_CARTEIRAS_UNIFICADAS
+    WHERE PRESTADOR_REDE IS NOT NULL
+    GROUP BY PRESTADOR_REDE
+    ORDER BY 2 DESC
+"""
+
+
+def compute_card_statistics():
+    """Run the aggregations against Oracle and return the snapshot"""
+    por_tipo = OracleConnection.execute_query(STATS_BY_TYPE_QUERY)
+    por_prestador = OracleConnection.execute_query(STATS_BY_PROVIDER_QUERY)
+
+    return {
+        'total_geral': sum(item['total'] for item in por_tipo),
+        'total_ativos': sum(item['ativos'] or 0 for item in por_tipo),
+        'por_tipo': por_tipo,
+        'por_prestador': por_prestador,
+        'computed_at': timezone.now().isoformat(),
+    }
+
+
+def refresh_card_statistics():
+    """Recompute the snapshot and store it in the cache"""
+    snapshot = compute_card_statistics()
+    cache.set(CACHE_KEY, snapshot, CACHE_TIMEOUT)
+    logger.info(f"Oracle card statistics refreshed: {snapshot['total_geral']} cards")
+    return snapshot
+
+
+def get_card_statistics():
+    """Return the cached snapshot, computing it if the cache is empty"""
+    snapshot = cache.get(CACHE_KEY)
+    if snapshot is None:
+        snapshot = refresh_card_statistics()
+    return snapshot
@@ -0,0 +1,20 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_card_statistics():
+    """
+    Refresh the cached statistics snapshot of the Oracle unified card view
+    Runs every 30 minutes
+    """
+    from apps.oracle_integration.statistics import refresh_card_statistics as refresh
+
+    try:
+        snapshot = refresh()
+        return snapshot['total_geral']
+    except Exception as e:
+        logger.error(f"Error refreshing Oracle card statistics: {str(e)}")
+        return None
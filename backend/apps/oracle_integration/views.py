@@ -2,14 +2,126 @@
 Oracle Integration Views
 API views for Oracle card data
 """
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.conf import settings
+from apps.common import card_cache
 from .connection import OracleConnection
 from .models import OracleCarteirasUnificadas
 from .serializers import OracleCarteirasUnificadasSerializer
+from .statistics import get_card_statistics
+
+logger = logging.getLogger(__name__)
+
+
+# Per-view queries used by OracleCardViewSet.my_oracle_cards
+ORACLE_CARD_QUERIES = {
+    'carteirinha': """
+        SELECT * FROM DBAPS.ESAU_V_APP_CARTEIRINHA
+        WHERE NR_CPF = :cpf AND SN_ATIVO = 'S'
+        ORDER BY CD_PLANO
+    """,
+    # Unimed view is filtered by CPF only, active status is checked in the result
+    'unimed': """
+        SELECT * FROM DBAPS.ESAU_V_APP_UNIMED
+        WHERE CPF = :cpf
+    """,
+    'reciprocidade': """
+        SELECT * FROM DBAPS.ESAU_V_APP_RECIPROCIDADE
+        WHERE NR_CPF = :cpf AND SN_ATIVO = 'S'
+    """,
+}
+
+_fanout_executor = None
+_fanout_lock = threading.Lock()
+
+
+def _get_fanout_executor():
+    """Shared thread pool for concurrent Oracle lookups, sized to the session pool"""
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=OracleConnection.get_pool_config()['MAX'],
+                    thread_name_prefix='oracle-cards'
+                )
+    return _fanout_executor
+
+
+def _timed_query(query, params, timeout_ms):
+    """Run an Oracle query and return (rows, elapsed milliseconds)"""
+    start = time.monotonic()
+    rows = OracleConnection.execute_query(query, params, timeout=timeout_ms)
+    return rows, (time.monotonic() - start) * 1000
+
+
+def _fetch_oracle_cards(cpf_number):
+    """
+    Query the three Oracle card views concurrently, each on its own pooled
+    session, under an overall deadline (settings.ORACLE_CARDS_DEADLINE).
+
+    Returns ``(data, timings)`` where ``timings`` maps each view to its
+    elapsed milliseconds, or None if it was unavailable. Views that fail or
+    miss the deadline are returned empty and listed in ``unavailable_sources``;
+    raises only when every view is unavailable.
+    """
+    deadline = settings.ORACLE_CARDS_DEADLINE
+    futures = {
+        source: _get_fanout_executor().submit(
+            _timed_query, query, {'cpf': cpf_number}, deadline * 1000
+        )
+        for source, query in ORACLE_CARD_QUERIES.items()
+    }
+    done, _ = wait(futures.values(), timeout=deadline)
+
+    results = {}
+    timings = {}
+    unavailable = []
+    errors = []
+    for source, future in futures.items():
+        if future in done and future.exception() is None:
+            results[source], timings[source] = future.result()
+            continue
+
+        future.cancel()
+        results[source] = []
+        timings[source] = None
+        unavailable.append(source)
+        if future in done:
+            errors.append(f'{source}: {future.exception()}')
+            logger.warning(f"Oracle {source} lookup failed: {future.exception()}")
+        else:
+            errors.append(f'{source}: timed out')
+            logger.warning(f"Oracle {source} lookup exceeded {deadline}s deadline")
+
+    if len(unavailable) == len(futures):
+        raise Exception('; '.join(errors))
+
+    carteirinha = results['carteirinha']
+    # Filter active records (handle case sensitivity)
+    unimed = [
+        card for card in results['unimed']
+        if card.get('sn_ativo') == 'S' or card.get('SN_ATIVO') == 'S'
+    ]
+    reciprocidade = results['reciprocidade']
+
+    data = {
+        'carteirinha': carteirinha,
+        'unimed': unimed,
+        'reciprocidade': reciprocidade,
+        'total_cards': len(carteirinha) + len(unimed) + len(reciprocidade),
+        'partial': bool(unavailable),
+        'unavailable_sources': unavailable,
+    }
+    return data, timings
 
 
 class OracleCardViewSet(viewsets.ViewSet):
@@ -23,6 +135,11 @@ class OracleCardViewSet(viewsets.ViewSet):
         """
         Get all Oracle cards for current user's beneficiary
         Returns cards from all 3 Oracle views: Carteirinha, Unimed, Reciprocidade
+
+        Served through the per-CPF card cache (ETag / If-None-Match aware).
+        On a miss the views are queried concurrently (see _fetch_oracle_cards)
+        and per-view timings go in the Server-Timing header; partial results
+        are returned but not cached.
         """
         try:
             beneficiary = request.user.beneficiary
@@ -30,36 +147,25 @@ class OracleCardViewSet(viewsets.ViewSet):
             cpf_clean = beneficiary.cpf.replace('.', '').replace('-', '')
             cpf_number = int(cpf_clean)
 
-            # Query Carteirinha view
-            carteirinha_query = """
-                SELECT * FROM DBAPS.ESAU_V_APP_CARTEIRINHA
-                WHERE NR_CPF = :cpf AND SN_ATIVO = 'S'
-                ORDER BY CD_PLANO
-            """
-            carteirinha = OracleConnection.execute_query(carteirinha_query, {'cpf': cpf_number})
-
-            # Query Unimed view (filter by CPF only, check active status in result)
-            unimed_query = """
-                SELECT * FROM DBAPS.ESAU_V_APP_UNIMED
-                WHERE CPF = :cpf
-            """
-            unimed_raw = OracleConnection.execute_query(unimed_query, {'cpf': cpf_number})
-            # Filter active records (handle case sensitivity)
-            unimed = [card for card in unimed_raw if card.get('sn_ativo') == 'S' or card.get('SN_ATIVO') == 'S']
-
-            # Query Reciprocidade view
-            reciprocidade_query = """
-                SELECT * FROM DBAPS.ESAU_V_APP_RECIPROCIDADE
-                WHERE NR_CPF = :cpf AND SN_ATIVO = 'S'
-            """
-            reciprocidade = OracleConnection.execute_query(reciprocidade_query, {'cpf': cpf_number})
+            timings = {}
 
-            return Response({
-                'carteirinha': carteirinha,
-                'unimed': unimed,
-                'reciprocidade': reciprocidade,
-                'total_cards': len(carteirinha) + len(unimed) + len(reciprocidade)
-            })
+            def fetch():
+                data, source_timings = _fetch_oracle_cards(cpf_number)
+                timings.update(source_timings)
+                return data
+
+            entry, hit = card_cache.get_or_compute(
+                cpf_number, card_cache.CARD_TYPE_ORACLE, fetch,
+                cache_if=lambda data: not data['partial']
+            )
+            response = card_cache.cached_response(request, entry, hit)
+            if timings:
+                response['Server-Timing'] = ', '.join(
+                    f'{source};dur={elapsed:.1f}' if elapsed is not None
+                    else f'{source};desc="unavailable"'
+                    for source, elapsed in timings.items()
+                )
+            return response
 
         except AttributeError:
             return Response(
@@ -81,41 +187,16 @@ class OracleCardViewSet(viewsets.ViewSet):
     def test_connection(self, request):
         """
         Test Oracle database connection
-        Returns connection status and sample data count
+        Runs SELECT 1 FROM DUAL on a pooled session and reports its latency;
+        card counts are served by carteirinhas-unificadas/estatisticas
         """
         try:
-            # Test connection
-            OracleConnection.test_connection()
-
-            # Count active records
-            carteirinha_count_query = """
-                SELECT COUNT(*) AS CNT FROM DBAPS.ESAU_V_APP_CARTEIRINHA WHERE SN_ATIVO = 'S'
-            """
-            # Unimed view has all records (no active filter available in Oracle)
-            unimed_count_query = """
-                SELECT COUNT(*) AS CNT FROM DBAPS.ESAU_V_APP_UNIMED
-            """
-            reciprocidade_count_query = """
-                SELECT COUNT(*) AS CNT FROM DBAPS.ESAU_V_APP_RECIPROCIDADE WHERE SN_ATIVO = 'S'
-            """
-
-            carteirinha_result = OracleConnection.execute_query(carteirinha_count_query)
-            unimed_result = OracleConnection.execute_query(unimed_count_query)
-            reciprocidade_result = OracleConnection.execute_query(reciprocidade_count_query)
-
-            carteirinha_count = carteirinha_result[0]['CNT'] if carteirinha_result else 0
-            unimed_count = unimed_result[0]['CNT'] if unimed_result else 0
-            reciprocidade_count = reciprocidade_result[0]['CNT'] if reciprocidade_result else 0
+            latency_ms = OracleConnection.check_health()
 
             return Response({
                 'status': 'connected',
                 'database': 'Oracle 192.168.40.29:1521/SIML',
-                'active_records': {
-                    'carteirinha': carteirinha_count,
-                    'unimed': unimed_count,
-                    'reciprocidade': reciprocidade_count,
-                    'total': carteirinha_count + unimed_count + reciprocidade_count
-                }
+                'latency_ms': round(latency_ms, 2),
             })
         except Exception as e:
             return Response(
@@ -126,6 +207,14 @@ class OracleCardViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'])
+    def pool_stats(self, request):
+        """
+        Oracle session pool statistics
+        Returns open/busy sessions, acquire wait times and last health check
+        """
+        return Response(OracleConnection.get_pool_stats())
+
 
 class OracleCarteirasUnificadasViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -150,11 +239,37 @@ class OracleCarteirasUnificadasViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['tipo_carteira', 'nome_beneficiario', 'data_validade', 'matricula_soul']
     ordering = ['tipo_carteira', 'matricula_soul']
 
+    def _group_by_type(self, carteirinhas):
+        """Serialize cards grouped by card type"""
+        resultado = {
+            'total': 0,
+            'carteirinha_principal': [],
+            'unimed': [],
+            'reciprocidade': [],
+        }
+
+        for carteirinha in carteirinhas:
+            serialized = self.get_serializer(carteirinha).data
+            resultado['total'] += 1
+
+            if carteirinha.is_carteirinha_principal:
+                resultado['carteirinha_principal'].append(serialized)
+            elif carteirinha.is_unimed:
+                resultado['unimed'].append(serialized)
+            elif carteirinha.is_reciprocidade:
+                resultado['reciprocidade'].append(serialized)
+
+        # Add summary info
+        resultado['tem_unimed'] = len(resultado['unimed']) > 0
+        resultado['tem_reciprocidade'] = len(resultado['reciprocidade']) > 0
+        return resultado
+
     @action(detail=False, methods=['get'])
     def minhas_carteirinhas(self, request):
         """
         Get all cards for the currently logged-in beneficiary
         Returns cards grouped by type for easy consumption
+        Served through the per-CPF card cache (ETag / If-None-Match aware)
         """
         try:
             beneficiary = request.user.beneficiary
@@ -162,32 +277,11 @@ class OracleCarteirasUnificadasViewSet(viewsets.ReadOnlyModelViewSet):
             cpf_clean = beneficiary.cpf.replace('.', '').replace('-', '')
             cpf_number = int(cpf_clean)
 
-            # Query unified view
-            carteirinhas = self.queryset.filter(nr_cpf=cpf_number)
-
-            # Group by type
-            resultado = {
-                'total': carteirinhas.count(),
-                'carteirinha_principal': [],
-                'unimed': [],
-                'reciprocidade': [],
-            }
-
-            for carteirinha in carteirinhas:
-                serialized = self.get_serializer(carteirinha).data
-
-                if carteirinha.is_carteirinha_principal:
-                    resultado['carteirinha_principal'].append(serialized)
-                elif carteirinha.is_unimed:
-                    resultado['unimed'].append(serialized)
-                elif carteirinha.is_reciprocidade:
-                    resultado['reciprocidade'].append(serialized)
-
-            # Add summary info
-            resultado['tem_unimed'] = len(resultado['unimed']) > 0
-            resultado['tem_reciprocidade'] = len(resultado['reciprocidade']) > 0
-
-            return Response(resultado)
+            entry, hit = card_cache.get_or_compute(
+                cpf_number, card_cache.CARD_TYPE_UNIFIED,
+                lambda: self._group_by_type(self.queryset.filter(nr_cpf=cpf_number))
+            )
+            return card_cache.cached_response(request, entry, hit)
 
         except AttributeError:
             return Response(
@@ -209,29 +303,11 @@ class OracleCarteirasUnificadasViewSet(viewsets.ReadOnlyModelViewSet):
     def estatisticas(self, request):
         """
         Get general statistics about cards in the unified view
-        Returns total counts by card type
+        Returns total and active counts by card type and counts by provider,
+        from the precomputed snapshot (see statistics.py) with its computed_at
         """
         try:
-            # Count by card type
-            stats_por_tipo = self.queryset.values('tipo_carteira').annotate(
-                total=Count('matricula_soul')
-            ).order_by('-total')
-
-            # Count by provider (for reciprocity/unimed)
-            stats_por_prestador = self.queryset.exclude(
-                prestador_rede__isnull=True
-            ).values('prestador_rede').annotate(
-                total=Count('matricula_soul')
-            ).order_by('-total')
-
-            # Overall totals
-            total_geral = sum(item['total'] for item in stats_por_tipo)
-
-            return Response({
-                'total_geral': total_geral,
-                'por_tipo': list(stats_por_tipo),
-                'por_prestador': list(stats_por_prestador),
-            })
+            return Response(get_card_statistics())
 
         except Exception as e:
             return Response(
@@ -47,7 +47,7 @@ class AccreditedProviderAdmin(admin.ModelAdmin):
         'accepts_emergency', 'state', 'created_at'
     ]
     search_fields = ['name', 'trade_name', 'cnpj_cpf', 'city', 'specialties__name']
-    readonly_fields = ['rating', 'total_reviews', 'created_at', 'updated_at']
+    readonly_fields = ['rating', 'total_reviews', 'rating_sum', 'created_at', 'updated_at']
     filter_horizontal = ['specialties']
     list_per_page = 20
     date_hierarchy = 'created_at'
@@ -69,7 +69,7 @@ class AccreditedProviderAdmin(admin.ModelAdmin):
             'fields': ('accepts_telemedicine', 'accepts_emergency', 'working_hours')
         }),
         ('Avaliações', {
-            'fields': ('rating', 'total_reviews'),
+            'fields': ('rating', 'total_reviews', 'rating_sum'),
             'classes': ('collapse',)
         }),
         ('Status', {
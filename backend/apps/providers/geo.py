@@ -0,0 +1,111 @@
+"""
+Nearby provider search
+
+A search first restricts providers to the latitude/longitude bounding box of
+the search circle, which the (latitude, longitude) index answers without a
+scan, then computes the exact great-circle (haversine) distance of those
+candidates in SQL, keeps the ones inside the radius and orders them by
+distance. ``nearest`` finds the k closest providers by growing the radius
+until k are found.
+
+Settings:
+    PROVIDER_NEARBY_MAX_RADIUS_KM   largest radius a search may use
+    PROVIDER_NEARBY_MAX_RESULTS     largest k of a k-nearest search
+"""
+import math
+
+from django.conf import settings
+from django.db.models import ExpressionWrapper, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def max_radius_km():
+    return getattr(settings, 'PROVIDER_NEARBY_MAX_RADIUS_KM', 200)
+
+
+def max_results():
+    return getattr(settings, 'PROVIDER_NEARBY_MAX_RESULTS', 100)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two points given in degrees"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(a), 1.0))
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Q selecting the coordinates inside the box around the search circle.
+    Handles circles that reach a pole or cross the antimeridian.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_lat = lat - math.degrees(angular)
+    max_lat = lat + math.degrees(angular)
+    box = Q(latitude__gte=round(max(min_lat, -90), 6), latitude__lte=round(min(max_lat, 90), 6))
+
+    if min_lat <= -90 or max_lat >= 90 or math.sin(angular) >= math.cos(math.radians(lat)):
+        return box  # every longitude
+
+    delta_lon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(lat))))
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if min_lon < -180:
+        longitude = Q(longitude__gte=round(min_lon + 360, 6)) | Q(longitude__lte=round(max_lon, 6))
+    elif max_lon > 180:
+        longitude = Q(longitude__gte=round(min_lon, 6)) | Q(longitude__lte=round(max_lon - 360, 6))
+    else:
+        longitude = Q(longitude__gte=round(min_lon, 6), longitude__lte=round(max_lon, 6))
+    return box & longitude
+
+
+def distance_expression(lat, lon):
+    """Haversine distance in km from (lat, lon) to each row's coordinates"""
+    row_lat = Radians(Cast('latitude', FloatField()))
+    row_lon = Radians(Cast('longitude', FloatField()))
+    origin_lat = Value(math.radians(lat), output_field=FloatField())
+    origin_lon = Value(math.radians(lon), output_field=FloatField())
+
+    a = (
+        Power(Sin((row_lat - origin_lat) / 2), 2)
+        + Cos(origin_lat) * Cos(row_lat) * Power(Sin((row_lon - origin_lon) / 2), 2)
+    )
+    return ExpressionWrapper(
+        2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(a), Value(1.0, output_field=FloatField()))),
+        output_field=FloatField()
+    )
+
+
+def within_radius(queryset, lat, lon, radius_km):
+    """
+    Rows of ``queryset`` within ``radius_km`` of (lat, lon), closest first,
+    annotated with ``distance_km``
+    """
+    return (
+        queryset
+        .filter(bounding_box(lat, lon, radius_km))
+        .annotate(distance_km=distance_expression(lat, lon))
+        .filter(distance_km__lte=radius_km)
+        .order_by('distance_km', 'pk')
+    )
+
+
+def nearest(queryset, lat, lon, k, radius_km=5, max_radius=None):
+    """
+    The ``k`` rows of ``queryset`` closest to (lat, lon), annotated with
+    ``distance_km``. The search radius starts at ``radius_km`` and grows
+    until k rows are inside it or it reaches ``max_radius``.
+    """
+    max_radius = max_radius or max_radius_km()
+    radius_km = min(radius_km, max_radius)
+    while True:
+        rows = list(within_radius(queryset, lat, lon, radius_km)[:k])
+        # Anything outside the radius is farther than every row inside it
+        if len(rows) >= k or radius_km >= max_radius:
+            return rows
+        radius_km = min(radius_km * 4, max_radius)
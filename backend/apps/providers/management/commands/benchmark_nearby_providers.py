@@ -0,0 +1,127 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.providers import geo
+from apps.providers.models import AccreditedProvider
+
+
+# Provider clusters (capitals) plus a uniform spread over the country
+CITIES = [
+    ('São Paulo', 'SP', -23.5505, -46.6333),
+    ('Rio de Janeiro', 'RJ', -22.9068, -43.1729),
+    ('Belo Horizonte', 'MG', -19.9167, -43.9345),
+    ('Brasília', 'DF', -15.7939, -47.8828),
+    ('Salvador', 'BA', -12.9777, -38.5016),
+    ('Fortaleza', 'CE', -3.7319, -38.5267),
+    ('Recife', 'PE', -8.0476, -34.8770),
+    ('Porto Alegre', 'RS', -30.0346, -51.2177),
+    ('Curitiba', 'PR', -25.4284, -49.2733),
+    ('Manaus', 'AM', -3.1190, -60.0217),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the nearby provider search (bounding box on the location index '
+        'plus haversine in SQL) against a full scan of every provider with coordinates '
+        '(haversine in Python), on synthetic providers inserted in a rolled-back transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--providers', type=int, default=100_000, help='Synthetic providers (default 100000)')
+        parser.add_argument('--searches', type=int, default=50, help='Searches per variant (default 50)')
+        parser.add_argument('--radius', type=float, default=10, help='Search radius in km (default 10)')
+        parser.add_argument('--k', type=int, default=20, help='k of the k-nearest search (default 20)')
+
+    def handle(self, *args, **options):
+        total = options['providers']
+        searches = max(options['searches'], 1)
+        radius = options['radius']
+        k = options['k']
+        rng = random.Random(42)
+
+        with transaction.atomic():
+            self.stdout.write(f'Gerando {total} prestadores sintéticos...')
+            AccreditedProvider.objects.bulk_create(
+                (self._provider(rng, i) for i in range(total)),
+                batch_size=5000
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {AccreditedProvider._meta.db_table}')
+
+            active = AccreditedProvider.objects.filter(
+                is_active=True, latitude__isnull=False, longitude__isnull=False
+            )
+            points = [self._point(rng) for _ in range(searches)]
+
+            old = self._measure(lambda lat, lon: self._full_scan(active, lat, lon, radius), points)
+            by_radius = self._measure(lambda lat, lon: list(geo.within_radius(active, lat, lon, radius)), points)
+            by_k = self._measure(lambda lat, lon: geo.nearest(active, lat, lon, k), points)
+
+            self._report('Varredura completa (haversine em Python)', old)
+            self._report(f'Raio de {radius:g} km', by_radius)
+            self._report(f'{k} mais próximos', by_k)
+
+            lat, lon = points[0]
+            plan = geo.within_radius(active, lat, lon, radius).explain()
+            self.stdout.write(f'Plano da busca por raio:\n{plan}')
+
+            # The indexed search must return exactly what a full scan finds
+            expected = self._full_scan(active, lat, lon, radius)
+            found = list(geo.within_radius(active, lat, lon, radius).values_list('pk', flat=True))
+            if set(found) == set(expected):
+                self.stdout.write(self.style.SUCCESS(f'Resultado conferido: {len(found)} prestadores no raio'))
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f'Resultado divergente: {len(found)} encontrados, {len(expected)} esperados'
+                ))
+
+            transaction.set_rollback(True)
+
+    def _provider(self, rng, i):
+        if rng.random() < 0.8:
+            city, state, lat, lon = rng.choice(CITIES)
+            lat, lon = rng.gauss(lat, 0.15), rng.gauss(lon, 0.15)
+        else:
+            city, state = 'Interior', 'XX'
+            lat, lon = rng.uniform(-33.7, 5.2), rng.uniform(-73.9, -34.8)
+        return AccreditedProvider(
+            provider_type=rng.choice(AccreditedProvider.PROVIDER_TYPES)[0],
+            name=f'Prestador Benchmark {i}',
+            phone='0000000000',
+            email=f'benchmark{i}@example.com',
+            address='Endereço sintético',
+            city=city,
+            state=state,
+            zip_code='00000000',
+            latitude=round(lat, 6),
+            longitude=round(lon, 6),
+        )
+
+    def _full_scan(self, queryset, lat, lon, radius):
+        """Every provider within the radius, by distance, computed over all rows"""
+        distances = sorted(
+            (geo.haversine_km(lat, lon, float(row_lat), float(row_lon)), pk)
+            for pk, row_lat, row_lon in queryset.values_list('pk', 'latitude', 'longitude')
+        )
+        return [pk for distance, pk in distances if distance <= radius]
+
+    def _point(self, rng):
+        _, _, lat, lon = rng.choice(CITIES)
+        return rng.gauss(lat, 0.1), rng.gauss(lon, 0.1)
+
+    def _measure(self, search, points):
+        timings = []
+        for lat, lon in points:
+            start = time.perf_counter()
+            search(lat, lon)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        p95 = sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(f'{label}: média {statistics.mean(timings):.2f} ms, p95 {p95:.2f} ms')
@@ -0,0 +1,48 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.providers.models import ProviderReview
+from apps.providers.ratings import import_reviews, reconcile_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Import provider reviews from a CSV file (provider_id, beneficiary_id, '
+        'rating, comment) with bulk inserts, updating each provider rating once'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', nargs='?', help='CSV file with a header row')
+        parser.add_argument('--ignore-conflicts', action='store_true',
+                            help='Skip reviews of a provider the beneficiary already reviewed')
+        parser.add_argument('--reconcile', action='store_true',
+                            help='Only recompute the rating counters of every provider')
+
+    def handle(self, *args, **options):
+        if options['reconcile']:
+            count = reconcile_ratings()
+            self.stdout.write(self.style.SUCCESS(f'{count} prestadores corrigidos'))
+            return
+
+        if not options['csv_file']:
+            raise CommandError('Informe o arquivo CSV')
+
+        reviews = []
+        with open(options['csv_file'], newline='', encoding='utf-8') as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    rating = int(row['rating'])
+                    if not 1 <= rating <= 5:
+                        raise ValueError(rating)
+                    reviews.append(ProviderReview(
+                        provider_id=int(row['provider_id']),
+                        beneficiary_id=int(row['beneficiary_id']),
+                        rating=rating,
+                        comment=row.get('comment') or '',
+                    ))
+                except (KeyError, TypeError, ValueError) as e:
+                    raise CommandError(f'Linha {line} inválida: {e}')
+
+        count = import_reviews(reviews, ignore_conflicts=options['ignore_conflicts'])
+        self.stdout.write(self.style.SUCCESS(f'{count} avaliações importadas'))
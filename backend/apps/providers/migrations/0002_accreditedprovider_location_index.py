@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accreditedprovider',
+            index=models.Index(fields=['latitude', 'longitude'], name='providers_a_latitud_b70306_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.11 on 2026-10-17 20:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations, models
+
+
+# Portuguese stemming over unaccented words
+CREATE_SEARCH_CONFIG = """
+    CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+    ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+"""
+DROP_SEARCH_CONFIG = "DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent;"
+
+# Same documents apps.providers.search.refresh_search_documents builds
+FILL_SEARCH_DOCUMENTS = r"""
+    UPDATE providers_accreditedprovider AS p
+    SET search_document = btrim(regexp_replace(
+            lower(unaccent(concat_ws(' ', p.name, p.trade_name, p.city, s.names))), '\s+', ' ', 'g'
+        )),
+        search_vector =
+            setweight(to_tsvector('portuguese_unaccent', concat_ws(' ', p.name, p.trade_name)), 'A')
+            || setweight(to_tsvector('portuguese_unaccent', coalesce(s.names, '')), 'B')
+            || setweight(to_tsvector('portuguese_unaccent', coalesce(p.city, '')), 'C')
+    FROM (
+        SELECT provider.id, string_agg(specialty.name, ' ') AS names
+        FROM providers_accreditedprovider AS provider
+        LEFT JOIN providers_accreditedprovider_specialties AS link ON link.accreditedprovider_id = provider.id
+        LEFT JOIN providers_specialty AS specialty ON specialty.id = link.specialty_id
+        GROUP BY provider.id
+    ) AS s
+    WHERE s.id = p.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0002_accreditedprovider_location_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunSQL(CREATE_SEARCH_CONFIG, DROP_SEARCH_CONFIG),
+        migrations.AddField(
+            model_name='accreditedprovider',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Search Document'),
+        ),
+        migrations.AddField(
+            model_name='accreditedprovider',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search Vector'),
+        ),
+        migrations.RunSQL(FILL_SEARCH_DOCUMENTS, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='accreditedprovider',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='providers_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='accreditedprovider',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_document'], name='providers_search_document_trgm', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-17 20:45
+
+from django.db import migrations, models
+
+
+# Fill the new counter (and fix the others) from the existing reviews
+FILL_RATING_COUNTERS = """
+    UPDATE providers_accreditedprovider AS p
+    SET rating_sum = coalesce(r.total, 0),
+        total_reviews = coalesce(r.count, 0),
+        rating = coalesce(round(r.total::numeric / nullif(r.count, 0), 2), 0)
+    FROM providers_accreditedprovider AS provider
+    LEFT JOIN (
+        SELECT provider_id, sum(rating) AS total, count(*) AS count
+        FROM providers_providerreview
+        GROUP BY provider_id
+    ) AS r ON r.provider_id = provider.id
+    WHERE provider.id = p.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0003_accreditedprovider_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accreditedprovider',
+            name='rating_sum',
+            field=models.IntegerField(default=0, verbose_name='Rating Sum'),
+        ),
+        migrations.RunSQL(FILL_RATING_COUNTERS, migrations.RunSQL.noop),
+    ]
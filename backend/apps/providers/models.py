@@ -1,8 +1,22 @@
-from django.db import models
-from django.db.models import Avg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
 from django.utils.translation import gettext_lazy as _
 
 
+def rating_expression(rating_sum, total_reviews):
+    """SQL for the average rating of ``rating_sum`` over ``total_reviews`` reviews (0 with none)"""
+    return Coalesce(
+        Round(Cast(rating_sum, DecimalField(max_digits=12, decimal_places=4)) / NullIf(total_reviews, 0), 2),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=3, decimal_places=2)
+    )
+
+
 class Specialty(models.Model):
     """Medical specialties"""
     name = models.CharField(max_length=100, unique=True, verbose_name=_('Specialty Name'))
@@ -58,9 +72,15 @@ class AccreditedProvider(models.Model):
     working_hours = models.JSONField(default=dict, verbose_name=_('Working Hours'))
     # Format: {"monday": {"open": "08:00", "close": "18:00"}, ...}
 
-    # Rating
+    # Rating: rating_sum / total_reviews, maintained incrementally by ProviderReview
+    # writes and reconciled daily (apps.providers.ratings)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0, verbose_name=_('Rating'))
     total_reviews = models.IntegerField(default=0, verbose_name=_('Total Reviews'))
+    rating_sum = models.IntegerField(default=0, verbose_name=_('Rating Sum'))
+
+    # Directory search (apps.providers.search), kept up to date by signals
+    search_document = models.TextField(blank=True, default='', editable=False, verbose_name=_('Search Document'))
+    search_vector = SearchVectorField(null=True, editable=False, verbose_name=_('Search Vector'))
 
     is_active = models.BooleanField(default=True, verbose_name=_('Active'))
     created_at = models.DateTimeField(auto_now_add=True)
@@ -70,22 +90,41 @@ class AccreditedProvider(models.Model):
         verbose_name = _('Accredited Provider')
         verbose_name_plural = _('Accredited Providers')
         ordering = ['name']
+        indexes = [
+            # Bounding-box prefilter of the nearby search (apps.providers.geo)
+            models.Index(fields=['latitude', 'longitude']),
+            GinIndex(fields=['search_vector'], name='providers_search_vector_gin'),
+            GinIndex(fields=['search_document'], opclasses=['gin_trgm_ops'], name='providers_search_document_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.get_provider_type_display()}"
 
+    @classmethod
+    def adjust_rating(cls, provider_id, rating_delta, count_delta):
+        """
+        Apply a review change to a provider's rating counters with one atomic
+        UPDATE, so concurrent review writes never overwrite each other
+        """
+        rating_sum = F('rating_sum') + rating_delta
+        total_reviews = F('total_reviews') + count_delta
+        cls.objects.filter(pk=provider_id).update(
+            rating_sum=rating_sum,
+            total_reviews=total_reviews,
+            rating=rating_expression(rating_sum, total_reviews),
+        )
+
     def update_rating(self):
-        """Update provider rating based on reviews"""
-        reviews = self.reviews.all()
-        if reviews.exists():
-            avg_rating = reviews.aggregate(Avg('rating'))['rating__avg']
-            self.rating = round(avg_rating, 2)
-            self.total_reviews = reviews.count()
-            self.save(update_fields=['rating', 'total_reviews'])
-        else:
-            self.rating = 0
-            self.total_reviews = 0
-            self.save(update_fields=['rating', 'total_reviews'])
+        """Recompute provider rating from all of its reviews"""
+        totals = self.reviews.aggregate(count=Count('id'), total=Sum('rating'))
+        self.rating_sum = totals['total'] or 0
+        self.total_reviews = totals['count']
+        # ROUND_HALF_UP matches PostgreSQL's ROUND() in rating_expression
+        self.rating = (
+            (Decimal(self.rating_sum) / self.total_reviews).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            if self.total_reviews else Decimal('0')
+        )
+        self.save(update_fields=['rating', 'rating_sum', 'total_reviews'])
 
 
 class ProviderReview(models.Model):
@@ -107,11 +146,25 @@ class ProviderReview(models.Model):
         return f"{self.provider.name} - {self.rating} stars"
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update provider rating
-        self.provider.update_rating()
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = ProviderReview.objects.select_for_update().filter(pk=self.pk).values(
+                    'provider_id', 'rating'
+                ).first()
+            super().save(*args, **kwargs)
+
+            # Update provider rating counters by the difference
+            if previous is None:
+                AccreditedProvider.adjust_rating(self.provider_id, self.rating, 1)
+            elif previous['provider_id'] != self.provider_id:
+                AccreditedProvider.adjust_rating(previous['provider_id'], -previous['rating'], -1)
+                AccreditedProvider.adjust_rating(self.provider_id, self.rating, 1)
+            elif previous['rating'] != self.rating:
+                AccreditedProvider.adjust_rating(self.provider_id, self.rating - previous['rating'], 0)
 
     def delete(self, *args, **kwargs):
-        provider = self.provider
-        super().delete(*args, **kwargs)
-        provider.update_rating()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            AccreditedProvider.adjust_rating(self.provider_id, -self.rating, -1)
+        return result
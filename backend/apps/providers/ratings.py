@@ -0,0 +1,117 @@
+"""
+Provider rating counters
+
+Each provider keeps ``rating_sum`` and ``total_reviews`` and derives
+``rating`` from them. ProviderReview.save()/delete() adjust the counters
+with one atomic UPDATE per write (AccreditedProvider.adjust_rating).
+
+Writes that bypass the model methods (queryset updates and deletes, raw
+SQL, ``import_reviews``) are corrected by ``reconcile_ratings``, which
+recomputes every counter from a single GROUP BY over the reviews, then
+locks the providers that drifted, counts their reviews again and rewrites
+them. The reconcile_provider_ratings task runs it daily.
+
+Settings:
+    PROVIDER_RATING_BATCH_SIZE   rows written per statement by the reconcile
+                                 and import functions
+"""
+import logging
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import AccreditedProvider, ProviderReview
+
+logger = logging.getLogger(__name__)
+
+
+def _batch_size():
+    return getattr(settings, 'PROVIDER_RATING_BATCH_SIZE', 1000)
+
+
+def _rating(rating_sum, total_reviews):
+    # ROUND_HALF_UP matches PostgreSQL's ROUND() in rating_expression
+    if not total_reviews:
+        return Decimal('0')
+    return (Decimal(rating_sum) / total_reviews).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def _drifted(provider_ids=None):
+    """
+    Providers (all, or ``provider_ids``) whose stored counters differ from
+    their reviews, as unsaved instances holding the correct counters
+    """
+    reviews = ProviderReview.objects.all()
+    providers = AccreditedProvider.objects.all()
+    if provider_ids is not None:
+        reviews = reviews.filter(provider_id__in=provider_ids)
+        providers = providers.filter(pk__in=provider_ids)
+
+    actual = {
+        row['provider_id']: (row['total'], row['count'])
+        for row in reviews.order_by().values('provider_id').annotate(count=Count('id'), total=Sum('rating'))
+    }
+
+    drifted = []
+    stored = providers.values_list('pk', 'rating_sum', 'total_reviews', 'rating')
+    for pk, rating_sum, total_reviews, rating in stored.iterator(chunk_size=_batch_size()):
+        expected_sum, expected_count = actual.get(pk, (0, 0))
+        expected_rating = _rating(expected_sum, expected_count)
+        if (rating_sum, total_reviews, rating) != (expected_sum, expected_count, expected_rating):
+            drifted.append(AccreditedProvider(
+                pk=pk, rating_sum=expected_sum, total_reviews=expected_count, rating=expected_rating
+            ))
+    return drifted
+
+
+def reconcile_ratings(provider_ids=None):
+    """
+    Recompute the rating counters of every provider (or of ``provider_ids``)
+    from the reviews and store the ones that differ. Returns the number of
+    providers corrected.
+    """
+    candidates = _drifted(provider_ids)
+    if not candidates:
+        return 0
+
+    with transaction.atomic():
+        # Lock the drifted providers, then count again: review writes committed
+        # meanwhile are included, and those still in flight wait for the lock
+        # and apply their F() delta on top of the corrected counters.
+        locked = list(
+            AccreditedProvider.objects.select_for_update()
+            .filter(pk__in=[provider.pk for provider in candidates])
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        drifted = _drifted(locked)
+        AccreditedProvider.objects.bulk_update(
+            drifted, ['rating_sum', 'total_reviews', 'rating'], batch_size=_batch_size()
+        )
+
+    if drifted:
+        logger.info(f"Provider ratings reconciled: {len(drifted)} providers corrected")
+    return len(drifted)
+
+
+def import_reviews(reviews, ignore_conflicts=False):
+    """
+    Insert many ProviderReview objects with bulk inserts, without the
+    per-review rating update, then recompute the counters of the affected
+    providers once. With ``ignore_conflicts`` reviews that already exist
+    (same provider and beneficiary) are skipped. Returns the number of
+    reviews given.
+    """
+    reviews = list(reviews)
+    provider_ids = {review.provider_id for review in reviews}
+
+    with transaction.atomic():
+        ProviderReview.objects.bulk_create(
+            reviews, batch_size=_batch_size(), ignore_conflicts=ignore_conflicts
+        )
+        reconcile_ratings(list(provider_ids))
+
+    logger.info(f"Imported {len(reviews)} provider reviews for {len(provider_ids)} providers")
+    return len(reviews)
@@ -0,0 +1,89 @@
+"""
+Provider directory search
+
+Every provider carries a denormalized search document built from its name,
+trade name, city and specialty names:
+
+* ``search_vector``: weighted tsvector (names A, specialties B, city C) in
+  the ``portuguese_unaccent`` text search configuration (Portuguese stemming
+  over unaccented words), under a GIN index;
+* ``search_document``: the same text unaccented and lowercased, under a
+  trigram GIN index, for partial words and typos.
+
+A search matches either, ranks by full-text rank plus trigram word
+similarity and never joins the specialties, so rows are not duplicated.
+The documents are refreshed by the receivers in apps.providers.signals
+whenever a provider, its specialties or a specialty name change.
+"""
+import unicodedata
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db.models import F, Q, Value
+from rest_framework import filters
+
+from .models import AccreditedProvider
+
+
+SEARCH_CONFIG = 'portuguese_unaccent'
+
+# Fields the search document is built from; saves touching none skip the refresh
+DOCUMENT_FIELDS = {'name', 'trade_name', 'city'}
+
+
+def normalize(text):
+    """Lowercase ``text`` without accents or repeated whitespace"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    unaccented = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(unaccented.lower().split())
+
+
+def refresh_search_documents(provider_ids):
+    """Rebuild the search document of the given providers"""
+    providers = (
+        AccreditedProvider.objects
+        .filter(pk__in=provider_ids)
+        .only('pk', 'name', 'trade_name', 'city')
+        .prefetch_related('specialties')
+    )
+    for provider in providers:
+        specialties = ' '.join(specialty.name for specialty in provider.specialties.all())
+        AccreditedProvider.objects.filter(pk=provider.pk).update(
+            search_document=normalize(' '.join([provider.name, provider.trade_name, provider.city, specialties])),
+            search_vector=(
+                SearchVector('name', 'trade_name', weight='A', config=SEARCH_CONFIG)
+                + SearchVector(Value(specialties), weight='B', config=SEARCH_CONFIG)
+                + SearchVector('city', weight='C', config=SEARCH_CONFIG)
+            ),
+        )
+
+
+def search(queryset, term):
+    """
+    Providers of ``queryset`` matching ``term`` by full text or trigram word
+    similarity, best match first, annotated with ``search_rank``
+    """
+    normalized = normalize(term)
+    if not normalized:
+        return queryset
+
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset
+        .filter(Q(search_vector=query) | Q(search_document__trigram_word_similar=normalized))
+        .annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+            + TrigramWordSimilarity(normalized, 'search_document')
+        )
+        .order_by('-search_rank', 'name')
+    )
+
+
+class ProviderSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` over the provider search documents, ranked. An explicit
+    ``?ordering=`` still wins over the rank.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '')
+        return search(queryset, term)
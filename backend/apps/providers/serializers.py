@@ -2,6 +2,10 @@ from rest_framework import serializers
 from .models import Specialty, AccreditedProvider, ProviderReview
 
 
+# Reviews embedded in the provider detail; the rest are paginated at /providers/<id>/reviews/
+RECENT_REVIEWS = 5
+
+
 class SpecialtySerializer(serializers.ModelSerializer):
     class Meta:
         model = Specialty
@@ -24,7 +28,7 @@ class AccreditedProviderSerializer(serializers.ModelSerializer):
         many=True, write_only=True, queryset=Specialty.objects.all(), source='specialties'
     )
     provider_type_display = serializers.CharField(source='get_provider_type_display', read_only=True)
-    recent_reviews = ProviderReviewSerializer(source='reviews', many=True, read_only=True)
+    recent_reviews = serializers.SerializerMethodField()
     
     class Meta:
         model = AccreditedProvider
@@ -39,10 +43,21 @@ class AccreditedProviderSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'rating', 'total_reviews']
 
+    def get_recent_reviews(self, obj):
+        # Prefetched by AccreditedProviderViewSet.get_queryset
+        reviews = getattr(obj, 'recent_review_list', None)
+        if reviews is None:
+            reviews = obj.reviews.select_related('beneficiary')[:RECENT_REVIEWS]
+        return ProviderReviewSerializer(reviews, many=True).data
+
 
 class AccreditedProviderListSerializer(serializers.ModelSerializer):
-    """Optimized serializer for list view"""
-    specialties = SpecialtySerializer(many=True, read_only=True)
+    """
+    Optimized serializer for list view. Expects the list queryset of
+    AccreditedProviderViewSet, whose ``specialty_list`` holds the
+    specialties aggregated in SQL.
+    """
+    specialties = serializers.JSONField(source='specialty_list', read_only=True)
     provider_type_display = serializers.CharField(source='get_provider_type_display', read_only=True)
     
     class Meta:
@@ -53,3 +68,14 @@ class AccreditedProviderListSerializer(serializers.ModelSerializer):
             'specialties', 'rating', 'total_reviews',
             'accepts_telemedicine', 'accepts_emergency', 'is_active'
         ]
+
+
+class NearbyProviderSerializer(AccreditedProviderListSerializer):
+    """List fields plus the distance from the searched point"""
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta(AccreditedProviderListSerializer.Meta):
+        fields = AccreditedProviderListSerializer.Meta.fields + ['distance_km']
+
+    def get_distance_km(self, obj):
+        return round(obj.distance_km, 2)
@@ -0,0 +1,49 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import AccreditedProvider, Specialty
+from .search import DOCUMENT_FIELDS, refresh_search_documents
+
+
+@receiver(post_save, sender=AccreditedProvider)
+def refresh_provider_search_document(sender, instance, update_fields=None, **kwargs):
+    """Rebuild the search document when a searched field may have changed"""
+    if update_fields is not None and not DOCUMENT_FIELDS.intersection(update_fields):
+        return
+    refresh_search_documents([instance.pk])
+
+
+@receiver(m2m_changed, sender=AccreditedProvider.specialties.through)
+def refresh_search_documents_on_specialties(sender, instance, action, reverse, pk_set, **kwargs):
+    """Rebuild the search documents of providers whose specialties changed"""
+    if action == 'pre_clear' and reverse:
+        # The cleared providers are unknown after the clear; remember them
+        instance._search_provider_ids = list(instance.providers.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        refresh_search_documents([instance.pk])
+    elif action == 'post_clear':
+        refresh_search_documents(getattr(instance, '_search_provider_ids', []))
+    else:
+        refresh_search_documents(pk_set)
+
+
+@receiver(post_save, sender=Specialty)
+def refresh_search_documents_on_specialty_rename(sender, instance, created, update_fields=None, **kwargs):
+    """A specialty name is part of the search document of its providers"""
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    refresh_search_documents(instance.providers.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Specialty)
+def remember_specialty_providers(sender, instance, **kwargs):
+    instance._search_provider_ids = list(instance.providers.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Specialty)
+def refresh_search_documents_on_specialty_delete(sender, instance, **kwargs):
+    refresh_search_documents(getattr(instance, '_search_provider_ids', []))
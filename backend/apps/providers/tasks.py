@@ -0,0 +1,22 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_provider_ratings():
+    """
+    Recompute provider rating counters from the reviews and fix any drift
+    Runs daily
+    """
+    from apps.providers.ratings import reconcile_ratings
+
+    try:
+        count = reconcile_ratings()
+        logger.info(f"Reconciled provider ratings: {count} providers corrected")
+        return count
+
+    except Exception as e:
+        logger.error(f"Error reconciling provider ratings: {str(e)}")
+        return 0
@@ -0,0 +1,110 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.beneficiaries.models import Beneficiary, Company, HealthPlan
+from .models import AccreditedProvider, ProviderReview, Specialty
+from .ratings import import_reviews
+
+
+BASE_URL = '/api/providers/providers/'
+NEARBY_URL = f'{BASE_URL}nearby/?lat=-23.5505&lon=-46.6333&radius=50'
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ProviderEndpointQueryTests(APITestCase):
+    """
+    Each provider endpoint runs a fixed number of queries, whatever the page
+    size: no query per provider, specialty or review.
+    """
+    PROVIDERS = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.specialties = [
+            Specialty.objects.create(name=name)
+            for name in ('Cardiologia', 'Pediatria', 'Dermatologia')
+        ]
+        company = Company.objects.create(
+            name='Empresa Teste', cnpj='00000000000999', address='-', phone='-', email='teste@example.com'
+        )
+        plan = HealthPlan.objects.create(
+            name='Plano Teste', plan_type=HealthPlan.PLAN_TYPES[0][0], description='-',
+            monthly_fee=Decimal('0')
+        )
+        beneficiaries = Beneficiary.objects.bulk_create([
+            Beneficiary(
+                registration_number=f'TEST{i:04d}', cpf=f'{99900000000 + i}', full_name=f'Beneficiario {i}',
+                birth_date=date(1990, 1, 1), gender='M', beneficiary_type='TITULAR',
+                company=company, health_plan=plan,
+            )
+            for i in range(25)
+        ])
+
+        providers = []
+        for i in range(cls.PROVIDERS):
+            provider = AccreditedProvider.objects.create(
+                provider_type='CLINIC', name=f'Clinica Teste {i}', phone='-', email='teste@example.com',
+                address='-', city='São Paulo', state='SP', zip_code='00000000',
+                latitude=Decimal('-23.550000') + Decimal(i) / 1000, longitude=Decimal('-46.630000'),
+            )
+            provider.specialties.set(cls.specialties)
+            providers.append(provider)
+        cls.provider = providers[0]
+
+        import_reviews(
+            ProviderReview(provider=provider, beneficiary=beneficiary, rating=1 + i % 5, comment='-')
+            for provider in providers[:3]
+            for i, beneficiary in enumerate(beneficiaries)
+        )
+        cls.user = User.objects.create_user('provider-tests', 'provider-tests@example.com')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assertQueriesPerPage(self, expected, url):
+        """``url`` (formatted with each page size) runs ``expected`` queries"""
+        for size in (5, 20):
+            with self.subTest(size=size):
+                # The first request caches per-user lookups done by middleware
+                self.client.get(url.format(size=size))
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url.format(size=size))
+                self.assertEqual(response.status_code, 200)
+
+    def test_list(self):
+        # count + page
+        self.assertQueriesPerPage(2, f'{BASE_URL}?page_size={{size}}')
+
+    def test_list_search(self):
+        self.assertQueriesPerPage(2, f'{BASE_URL}?search=cardiologia&page_size={{size}}')
+
+    def test_nearby_radius(self):
+        # count + page
+        self.assertQueriesPerPage(2, f'{NEARBY_URL}&page_size={{size}}')
+
+    def test_nearby_k(self):
+        # Every provider is inside the first radius tried
+        self.assertQueriesPerPage(1, f'{NEARBY_URL}&k={{size}}')
+
+    def test_nearby_k_within_radius(self):
+        response = self.client.get(
+            f'{BASE_URL}nearby/?lat=-23.5505&lon=-46.6333&radius=1&k={self.PROVIDERS}'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(0 < len(response.data) < self.PROVIDERS)
+        self.assertTrue(all(provider['distance_km'] <= 1 for provider in response.data))
+
+    def test_by_specialty(self):
+        self.assertQueriesPerPage(1, f'{BASE_URL}by_specialty/?specialty_id={self.specialties[0].pk}')
+
+    def test_detail(self):
+        # provider + specialties + recent reviews
+        self.assertQueriesPerPage(3, f'{BASE_URL}{self.provider.pk}/')
+
+    def test_reviews(self):
+        # provider + count + page
+        self.assertQueriesPerPage(3, f'{BASE_URL}{self.provider.pk}/reviews/?page_size={{size}}')
@@ -2,12 +2,17 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import Avg, Exists, OuterRef, Prefetch, Q, Value
+from django.db.models.functions import JSONObject
 from apps.common.pagination import StandardResultsSetPagination, SmallResultsSetPagination
+from . import geo
 from .models import Specialty, AccreditedProvider, ProviderReview
+from .search import ProviderSearchFilter
 from .serializers import (
     SpecialtySerializer, AccreditedProviderSerializer,
-    AccreditedProviderListSerializer, ProviderReviewSerializer
+    AccreditedProviderListSerializer, NearbyProviderSerializer, ProviderReviewSerializer,
+    RECENT_REVIEWS
 )
 
 
@@ -21,20 +26,66 @@ class SpecialtyViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at']
 
 
+# Columns read by AccreditedProviderListSerializer
+LIST_COLUMNS = [
+    'id', 'provider_type', 'name', 'trade_name', 'phone', 'city', 'state', 'latitude', 'longitude',
+    'rating', 'total_reviews', 'accepts_telemedicine', 'accepts_emergency', 'is_active',
+]
+LIST_ACTIONS = ('list', 'nearby', 'by_specialty')
+
+
 class AccreditedProviderViewSet(viewsets.ModelViewSet):
-    queryset = AccreditedProvider.objects.prefetch_related('specialties', 'reviews').all()
+    queryset = AccreditedProvider.objects.all()
     serializer_class = AccreditedProviderSerializer
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search= is ranked full-text/trigram search over name, trade name, city and specialties
+    filter_backends = [DjangoFilterBackend, ProviderSearchFilter, filters.OrderingFilter]
     filterset_fields = ['provider_type', 'is_active', 'accepts_telemedicine', 'accepts_emergency', 'city', 'state']
-    search_fields = ['name', 'trade_name', 'city', 'specialties__name']
     ordering_fields = ['name', 'rating', 'created_at']
 
+    def get_queryset(self):
+        if self.action in LIST_ACTIONS:
+            # One query per page: list columns only, specialties as a JSON array, no reviews
+            return AccreditedProvider.objects.only(*LIST_COLUMNS).annotate(
+                specialty_list=JSONBAgg(
+                    JSONObject(
+                        id='specialties__id',
+                        name='specialties__name',
+                        description='specialties__description',
+                        is_active='specialties__is_active',
+                        created_at='specialties__created_at',
+                        updated_at='specialties__updated_at',
+                    ),
+                    filter=Q(specialties__id__isnull=False),
+                    ordering='specialties__name',
+                    default=Value('[]'),
+                )
+            )
+        if self.action == 'reviews':
+            return AccreditedProvider.objects.only('pk')
+        return AccreditedProvider.objects.prefetch_related(
+            'specialties',
+            Prefetch(
+                'reviews',
+                queryset=ProviderReview.objects.select_related('beneficiary')[:RECENT_REVIEWS],
+                to_attr='recent_review_list'
+            ),
+        )
+
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in LIST_ACTIONS:
             return AccreditedProviderListSerializer
         return AccreditedProviderSerializer
 
+    def _with_specialties(self, queryset, specialty_ids):
+        """Providers having any of the specialties (no join, so no duplicate rows)"""
+        return queryset.filter(Exists(
+            AccreditedProvider.specialties.through.objects.filter(
+                accreditedprovider_id=OuterRef('pk'),
+                specialty_id__in=specialty_ids
+            )
+        ))
+
     @action(detail=False, methods=['get'])
     def by_specialty(self, request):
         """Filter providers by specialty"""
@@ -45,34 +96,91 @@ class AccreditedProviderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        providers = self.queryset.filter(specialties__id=specialty_id, is_active=True)
+        try:
+            specialty_id = int(specialty_id)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid specialty_id parameter'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        providers = self._with_specialties(self.get_queryset(), [specialty_id]).filter(is_active=True)
         serializer = AccreditedProviderListSerializer(providers, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def nearby(self, request):
-        """Get providers nearby (requires lat, lon, radius in km)"""
+        """
+        Get providers nearby, closest first, with their distance in km
+
+        Requires lat and lon. Returns every provider within radius km
+        (default 10), paginated, or with k only the k nearest ones: inside
+        radius when it is given, else searching outwards up to
+        PROVIDER_NEARBY_MAX_RADIUS_KM. specialty_id takes one or more
+        comma-separated ids; the list filters (provider_type, city, ...)
+        apply as well.
+        """
         try:
             lat = float(request.query_params.get('lat'))
             lon = float(request.query_params.get('lon'))
             radius = float(request.query_params.get('radius', 10))
+            k = request.query_params.get('k')
+            k = int(k) if k else None
+            specialty_ids = [
+                int(value) for value in request.query_params.get('specialty_id', '').split(',') if value.strip()
+            ]
         except (TypeError, ValueError):
             return Response(
                 {'error': 'Invalid lat, lon, or radius parameters'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Simple distance calculation (can be improved with PostGIS)
-        # This is a basic implementation - for production use django.contrib.gis
-        providers = self.queryset.filter(
-            is_active=True,
-            latitude__isnull=False,
-            longitude__isnull=False
+
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180) or radius <= 0 or (k is not None and k <= 0):
+            return Response(
+                {'error': 'Invalid lat, lon, or radius parameters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        radius = min(radius, geo.max_radius_km())
+
+        providers = self.filter_queryset(
+            self.get_queryset().filter(
+                is_active=True,
+                latitude__isnull=False,
+                longitude__isnull=False
+            )
         )
-        
-        serializer = AccreditedProviderListSerializer(providers, many=True)
+        if specialty_ids:
+            providers = self._with_specialties(providers, specialty_ids)
+
+        if k is not None:
+            # An explicit radius bounds the search; otherwise it only seeds it
+            max_radius = radius if 'radius' in request.query_params else None
+            nearest = geo.nearest(
+                providers, lat, lon, min(k, geo.max_results()), radius_km=radius, max_radius=max_radius
+            )
+            serializer = NearbyProviderSerializer(nearest, many=True)
+            return Response(serializer.data)
+
+        providers = geo.within_radius(providers, lat, lon, radius)
+        page = self.paginate_queryset(providers)
+        if page is not None:
+            serializer = NearbyProviderSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = NearbyProviderSerializer(providers, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def reviews(self, request, pk=None):
+        """Reviews of a provider, newest first, paginated"""
+        provider = self.get_object()
+        reviews = ProviderReview.objects.filter(provider=provider).select_related('beneficiary')
+
+        paginator = SmallResultsSetPagination()
+        page = paginator.paginate_queryset(reviews, request, view=self)
+        serializer = ProviderReviewSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
 
 class ProviderReviewViewSet(viewsets.ModelViewSet):
     queryset = ProviderReview.objects.select_related('provider', 'beneficiary').all()
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ReimbursementsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.reimbursements'
+
+    def ready(self):
+        import apps.reimbursements.signals  # noqa
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common import document_cache
+
+from .models import ReimbursementRequest
+
+
+@receiver([post_save, post_delete], sender=ReimbursementRequest)
+def invalidate_reimbursement_receipt(sender, instance, **kwargs):
+    document_cache.invalidate(document_cache.KIND_REIMBURSEMENT_RECEIPT, instance.pk)
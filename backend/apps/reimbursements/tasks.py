@@ -49,7 +49,7 @@ def analyze_reimbursement(reimbursement_id):
     - Auto-approve low amounts (<= R$ 500)
     """
     from apps.reimbursements.models import ReimbursementRequest, ReimbursementDocument
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
 
     try:
         reimbursement = ReimbursementRequest.objects.select_related('beneficiary').get(id=reimbursement_id)
@@ -66,7 +66,7 @@ def analyze_reimbursement(reimbursement_id):
             reimbursement.analysis_date = timezone.now()
             reimbursement.save()
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=reimbursement.beneficiary.id,
                 title="Reembolso Negado",
                 message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi negado: Beneficiário inativo",
@@ -85,7 +85,7 @@ def analyze_reimbursement(reimbursement_id):
             reimbursement.analysis_date = timezone.now()
             reimbursement.save()
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=reimbursement.beneficiary.id,
                 title="Reembolso Negado",
                 message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi negado: Data de atendimento inválida",
@@ -104,7 +104,7 @@ def analyze_reimbursement(reimbursement_id):
             reimbursement.analysis_date = timezone.now()
             reimbursement.save()
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=reimbursement.beneficiary.id,
                 title="Reembolso Negado",
                 message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi negado: Prazo expirado",
@@ -123,7 +123,7 @@ def analyze_reimbursement(reimbursement_id):
             reimbursement.analysis_date = timezone.now()
             reimbursement.save()
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=reimbursement.beneficiary.id,
                 title="Reembolso Negado",
                 message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi negado: Documentação incompleta",
@@ -146,7 +146,7 @@ def analyze_reimbursement(reimbursement_id):
             reimbursement.notes = f'Auto-aprovado (cobertura de {int(coverage_percentage * 100)}%)'
             reimbursement.save()
 
-            send_notification.delay(
+            enqueue_notification(
                 beneficiary_id=reimbursement.beneficiary.id,
                 title="Reembolso Aprovado",
                 message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi aprovado! Valor: R$ {approved_amount:.2f}",
@@ -172,7 +172,7 @@ def analyze_reimbursement(reimbursement_id):
                 reimbursement.notes = f'Auto-aprovado (cobertura de {int(coverage_percentage * 100)}%)'
                 reimbursement.save()
 
-                send_notification.delay(
+                enqueue_notification(
                     beneficiary_id=reimbursement.beneficiary.id,
                     title="Reembolso Aprovado",
                     message=f"Seu pedido de reembolso {reimbursement.protocol_number} foi aprovado! Valor: R$ {approved_amount:.2f}",
@@ -185,7 +185,7 @@ def analyze_reimbursement(reimbursement_id):
                 return True
 
         # For high amounts or complex cases, keep as pending for manual review
-        send_notification.delay(
+        enqueue_notification(
             beneficiary_id=reimbursement.beneficiary.id,
             title="Reembolso em Análise",
             message=f"Seu pedido de reembolso {reimbursement.protocol_number} está sendo analisado por nossa equipe",
@@ -210,7 +210,7 @@ def send_pending_reimbursement_reminders():
     Send reminders for reimbursements pending for more than 72 hours
     """
     from apps.reimbursements.models import ReimbursementRequest
-    from apps.notifications.tasks import send_notification
+    from apps.notifications.outbox import enqueue_notification
 
     cutoff_date = timezone.now() - timedelta(hours=72)
 
@@ -221,7 +221,7 @@ def send_pending_reimbursement_reminders():
 
     count = 0
     for reimbursement in pending_reimbursements:
-        send_notification.delay(
+        enqueue_notification(
             beneficiary_id=reimbursement.beneficiary.id,
             title="Reembolso em Análise",
             message=f"Seu pedido de reembolso {reimbursement.protocol_number} está sendo analisado. Em breve você receberá uma resposta.",
@@ -2,13 +2,14 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import HttpResponse
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
+from apps.common import document_cache
+from apps.utils import pdf_layout
 from apps.common.pagination import StandardResultsSetPagination, SmallResultsSetPagination
 from .models import ReimbursementRequest, ReimbursementDocument
 from .serializers import (
@@ -84,201 +85,199 @@ class ReimbursementRequestViewSet(viewsets.ModelViewSet):
                 return Response({'error': 'Reimbursement has not been paid yet'},
                               status=status.HTTP_400_BAD_REQUEST)
 
-            # Create PDF in memory
-            buffer = BytesIO()
-            p = canvas.Canvas(buffer, pagesize=A4)
-            width, height = A4
-
-            # Colors
-            primary_color = colors.HexColor('#20a490')
-            success_color = colors.HexColor('#4CAF50')
-            gray_color = colors.HexColor('#666666')
-            light_gray = colors.HexColor('#F5F9F8')
-
-            # Header
-            p.setFillColor(primary_color)
-            p.rect(0, height - 3*cm, width, 3*cm, fill=True, stroke=False)
-            p.setFillColor(colors.white)
-            p.setFont("Helvetica-Bold", 24)
-            p.drawString(2*cm, height - 2*cm, "ELOSAÚDE")
-            p.setFont("Helvetica", 14)
-            p.drawString(2*cm, height - 2.5*cm, "Comprovante de Reembolso")
-
-            # Success badge
-            y_pos = height - 4*cm
-            p.setFillColor(success_color)
-            p.roundRect(2*cm, y_pos, 4*cm, 0.8*cm, 0.3*cm, fill=True, stroke=False)
-            p.setFillColor(colors.white)
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(2.5*cm, y_pos + 0.25*cm, "✓ PAGO")
-
-            # Amount paid
-            y_pos -= 2*cm
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica-Bold", 18)
-            p.drawString(2*cm, y_pos, f"Valor Reembolsado: R$ {reimbursement.approved_amount:,.2f}")
-
-            # Protocol information
-            y_pos -= 1.5*cm
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(2*cm, y_pos, "Informações do Reembolso")
-
-            y_pos -= 0.8*cm
-            p.setFont("Helvetica", 10)
-            reimbursement_details = [
-                ("Protocolo:", reimbursement.protocol_number),
-                ("Data do Pagamento:", reimbursement.payment_date.strftime('%d/%m/%Y')),
-                ("Data do Serviço:", reimbursement.service_date.strftime('%d/%m/%Y')),
-                ("Tipo de Despesa:", dict(ReimbursementRequest.EXPENSE_TYPES).get(reimbursement.expense_type, reimbursement.expense_type)),
-            ]
-
-            for label, value in reimbursement_details:
-                p.setFont("Helvetica-Bold", 10)
-                p.drawString(2*cm, y_pos, label)
-                p.setFont("Helvetica", 10)
-                p.drawString(8*cm, y_pos, str(value))
-                y_pos -= 0.6*cm
+            def render():
+                # Create PDF in memory
+                buffer = BytesIO()
+                p = canvas.Canvas(buffer, pagesize=A4)
+                width, height = A4
+
+                # Colors
+                success_color = colors.HexColor('#4CAF50')
+                gray_color = pdf_layout.GRAY_COLOR
+                light_gray = pdf_layout.LIGHT_GRAY
+
+                # Header
+                pdf_layout.header_band(subtitle="Comprovante de Reembolso").stamp(p)
+
+                # Success badge
+                y_pos = height - 4*cm
+                p.setFillColor(success_color)
+                p.roundRect(2*cm, y_pos, 4*cm, 0.8*cm, 0.3*cm, fill=True, stroke=False)
+                p.setFillColor(colors.white)
+                p.setFont("Helvetica-Bold", 12)
+                p.drawString(2.5*cm, y_pos + 0.25*cm, "✓ PAGO")
 
-            # Financial summary box
-            y_pos -= 1*cm
-            p.setFillColor(light_gray)
-            p.rect(2*cm, y_pos - 2*cm, width - 4*cm, 2.5*cm, fill=True, stroke=True)
-
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica-Bold", 11)
-            p.drawString(2.5*cm, y_pos - 0.5*cm, "Resumo Financeiro")
-
-            y_pos -= 1.1*cm
-            p.setFont("Helvetica", 9)
-            p.drawString(2.5*cm, y_pos, "Valor Solicitado:")
-            p.drawString(12*cm, y_pos, f"R$ {reimbursement.requested_amount:,.2f}")
-
-            y_pos -= 0.6*cm
-            p.setFont("Helvetica-Bold", 9)
-            p.drawString(2.5*cm, y_pos, "Valor Aprovado:")
-            p.drawString(12*cm, y_pos, f"R$ {reimbursement.approved_amount:,.2f}")
-
-            # Beneficiary information
-            y_pos -= 2*cm
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(2*cm, y_pos, "Dados do Beneficiário")
-
-            y_pos -= 0.8*cm
-            p.setFont("Helvetica", 10)
-            ben_details = [
-                ("Nome:", beneficiary.full_name),
-                ("CPF:", beneficiary.cpf),
-            ]
-
-            for label, value in ben_details:
-                p.setFont("Helvetica-Bold", 10)
-                p.drawString(2*cm, y_pos, label)
+                # Amount paid
+                y_pos -= 2*cm
+                p.setFillColor(colors.black)
+                p.setFont("Helvetica-Bold", 18)
+                p.drawString(2*cm, y_pos, f"Valor Reembolsado: R$ {reimbursement.approved_amount:,.2f}")
+
+                # Protocol information
+                y_pos -= 1.5*cm
+                p.setFont("Helvetica-Bold", 12)
+                p.drawString(2*cm, y_pos, "Informações do Reembolso")
+
+                y_pos -= 0.8*cm
                 p.setFont("Helvetica", 10)
-                p.drawString(8*cm, y_pos, str(value))
-                y_pos -= 0.6*cm
+                reimbursement_details = [
+                    ("Protocolo:", reimbursement.protocol_number),
+                    ("Data do Pagamento:", reimbursement.payment_date.strftime('%d/%m/%Y')),
+                    ("Data do Serviço:", reimbursement.service_date.strftime('%d/%m/%Y')),
+                    ("Tipo de Despesa:", dict(ReimbursementRequest.EXPENSE_TYPES).get(reimbursement.expense_type, reimbursement.expense_type)),
+                ]
 
-            # Provider information
-            y_pos -= 0.5*cm
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(2*cm, y_pos, "Dados do Prestador")
+                for label, value in reimbursement_details:
+                    p.setFont("Helvetica-Bold", 10)
+                    p.drawString(2*cm, y_pos, label)
+                    p.setFont("Helvetica", 10)
+                    p.drawString(8*cm, y_pos, str(value))
+                    y_pos -= 0.6*cm
 
-            y_pos -= 0.8*cm
-            p.setFont("Helvetica", 10)
-            provider_details = [
-                ("Nome:", reimbursement.provider_name),
-                ("CNPJ/CPF:", reimbursement.provider_cnpj_cpf),
-            ]
+                # Financial summary box
+                y_pos -= 1*cm
+                p.setFillColor(light_gray)
+                p.rect(2*cm, y_pos - 2*cm, width - 4*cm, 2.5*cm, fill=True, stroke=True)
+
+                p.setFillColor(colors.black)
+                p.setFont("Helvetica-Bold", 11)
+                p.drawString(2.5*cm, y_pos - 0.5*cm, "Resumo Financeiro")
+
+                y_pos -= 1.1*cm
+                p.setFont("Helvetica", 9)
+                p.drawString(2.5*cm, y_pos, "Valor Solicitado:")
+                p.drawString(12*cm, y_pos, f"R$ {reimbursement.requested_amount:,.2f}")
 
-            for label, value in provider_details:
-                p.setFont("Helvetica-Bold", 10)
-                p.drawString(2*cm, y_pos, label)
-                p.setFont("Helvetica", 10)
-                p.drawString(8*cm, y_pos, str(value))
                 y_pos -= 0.6*cm
+                p.setFont("Helvetica-Bold", 9)
+                p.drawString(2.5*cm, y_pos, "Valor Aprovado:")
+                p.drawString(12*cm, y_pos, f"R$ {reimbursement.approved_amount:,.2f}")
 
-            # Service description
-            y_pos -= 0.5*cm
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(2*cm, y_pos, "Descrição do Serviço")
-
-            y_pos -= 0.7*cm
-            p.setFont("Helvetica", 9)
-            # Word wrap for long descriptions
-            desc_lines = []
-            words = reimbursement.service_description.split()
-            current_line = []
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                if p.stringWidth(test_line, "Helvetica", 9) < (width - 5*cm):
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        desc_lines.append(' '.join(current_line))
-                    current_line = [word]
-            if current_line:
-                desc_lines.append(' '.join(current_line))
-
-            for line in desc_lines[:5]:  # Max 5 lines
-                p.drawString(2*cm, y_pos, line)
-                y_pos -= 0.5*cm
+                # Beneficiary information
+                y_pos -= 2*cm
+                p.setFont("Helvetica-Bold", 12)
+                p.drawString(2*cm, y_pos, "Dados do Beneficiário")
 
-            # Bank details
-            if reimbursement.bank_details:
-                y_pos -= 1*cm
+                y_pos -= 0.8*cm
+                p.setFont("Helvetica", 10)
+                ben_details = [
+                    ("Nome:", beneficiary.full_name),
+                    ("CPF:", beneficiary.cpf),
+                ]
+
+                for label, value in ben_details:
+                    p.setFont("Helvetica-Bold", 10)
+                    p.drawString(2*cm, y_pos, label)
+                    p.setFont("Helvetica", 10)
+                    p.drawString(8*cm, y_pos, str(value))
+                    y_pos -= 0.6*cm
+
+                # Provider information
+                y_pos -= 0.5*cm
                 p.setFont("Helvetica-Bold", 12)
-                p.drawString(2*cm, y_pos, "Dados Bancários do Crédito")
+                p.drawString(2*cm, y_pos, "Dados do Prestador")
 
                 y_pos -= 0.8*cm
-                p.setFont("Helvetica", 9)
-                bank_info = [
-                    ("Banco:", reimbursement.bank_details.get('bank', 'N/A')),
-                    ("Agência:", reimbursement.bank_details.get('agency', 'N/A')),
-                    ("Conta:", reimbursement.bank_details.get('account', 'N/A')),
-                    ("Tipo:", dict({'checking': 'Corrente', 'savings': 'Poupança'}).get(
-                        reimbursement.bank_details.get('account_type', ''), 'N/A')),
+                p.setFont("Helvetica", 10)
+                provider_details = [
+                    ("Nome:", reimbursement.provider_name),
+                    ("CNPJ/CPF:", reimbursement.provider_cnpj_cpf),
                 ]
 
-                for label, value in bank_info:
-                    p.setFont("Helvetica-Bold", 9)
+                for label, value in provider_details:
+                    p.setFont("Helvetica-Bold", 10)
                     p.drawString(2*cm, y_pos, label)
-                    p.setFont("Helvetica", 9)
-                    p.drawString(6*cm, y_pos, str(value))
+                    p.setFont("Helvetica", 10)
+                    p.drawString(8*cm, y_pos, str(value))
+                    y_pos -= 0.6*cm
+
+                # Service description
+                y_pos -= 0.5*cm
+                p.setFont("Helvetica-Bold", 12)
+                p.drawString(2*cm, y_pos, "Descrição do Serviço")
+
+                y_pos -= 0.7*cm
+                p.setFont("Helvetica", 9)
+                # Word wrap for long descriptions
+                desc_lines = []
+                words = reimbursement.service_description.split()
+                current_line = []
+                for word in words:
+                    test_line = ' '.join(current_line + [word])
+                    if p.stringWidth(test_line, "Helvetica", 9) < (width - 5*cm):
+                        current_line.append(word)
+                    else:
+                        if current_line:
+                            desc_lines.append(' '.join(current_line))
+                        current_line = [word]
+                if current_line:
+                    desc_lines.append(' '.join(current_line))
+
+                for line in desc_lines[:5]:  # Max 5 lines
+                    p.drawString(2*cm, y_pos, line)
                     y_pos -= 0.5*cm
 
-            # Verification box
-            y_pos -= 1.5*cm
-            if y_pos < 7*cm:
+                # Bank details
+                if reimbursement.bank_details:
+                    y_pos -= 1*cm
+                    p.setFont("Helvetica-Bold", 12)
+                    p.drawString(2*cm, y_pos, "Dados Bancários do Crédito")
+
+                    y_pos -= 0.8*cm
+                    p.setFont("Helvetica", 9)
+                    bank_info = [
+                        ("Banco:", reimbursement.bank_details.get('bank', 'N/A')),
+                        ("Agência:", reimbursement.bank_details.get('agency', 'N/A')),
+                        ("Conta:", reimbursement.bank_details.get('account', 'N/A')),
+                        ("Tipo:", dict({'checking': 'Corrente', 'savings': 'Poupança'}).get(
+                            reimbursement.bank_details.get('account_type', ''), 'N/A')),
+                    ]
+
+                    for label, value in bank_info:
+                        p.setFont("Helvetica-Bold", 9)
+                        p.drawString(2*cm, y_pos, label)
+                        p.setFont("Helvetica", 9)
+                        p.drawString(6*cm, y_pos, str(value))
+                        y_pos -= 0.5*cm
+
+                # Verification box
+                y_pos -= 1.5*cm
+                if y_pos < 7*cm:
+                    p.showPage()
+                    y_pos = height - 2*cm
+
+                p.setFillColor(colors.HexColor('#E8F5E9'))
+                p.rect(2*cm, y_pos - 2*cm, width - 4*cm, 2.5*cm, fill=True, stroke=True)
+                p.setFillColor(colors.black)
+                p.setFont("Helvetica-Bold", 10)
+                p.drawString(2.5*cm, y_pos - 0.5*cm, "Autenticidade do Comprovante")
+                p.setFont("Helvetica", 9)
+                p.drawString(2.5*cm, y_pos - 1*cm, f"Código de Verificação: REIMB-{reimbursement.id:06d}-{reimbursement.payment_date.strftime('%Y%m%d')}")
+                p.drawString(2.5*cm, y_pos - 1.5*cm, "Este comprovante pode ser verificado em: www.elosaude.com.br/verificar")
+
+                # Footer
+                p.setFont("Helvetica", 8)
+                p.setFillColor(gray_color)
+                p.drawString(2*cm, 2*cm, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+                pdf_layout.footer_lines(
+                    (pdf_layout.COMPANY_LINE, "www.elosaude.com.br | reembolso@elosaude.com.br | (11) 3000-0000"),
+                    1.5*cm
+                ).stamp(p)
+
+                # Save PDF
                 p.showPage()
-                y_pos = height - 2*cm
-
-            p.setFillColor(colors.HexColor('#E8F5E9'))
-            p.rect(2*cm, y_pos - 2*cm, width - 4*cm, 2.5*cm, fill=True, stroke=True)
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica-Bold", 10)
-            p.drawString(2.5*cm, y_pos - 0.5*cm, "Autenticidade do Comprovante")
-            p.setFont("Helvetica", 9)
-            p.drawString(2.5*cm, y_pos - 1*cm, f"Código de Verificação: REIMB-{reimbursement.id:06d}-{reimbursement.payment_date.strftime('%Y%m%d')}")
-            p.drawString(2.5*cm, y_pos - 1.5*cm, "Este comprovante pode ser verificado em: www.elosaude.com.br/verificar")
-
-            # Footer
-            p.setFont("Helvetica", 8)
-            p.setFillColor(gray_color)
-            p.drawString(2*cm, 2*cm, f"Emitido em: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            p.drawString(2*cm, 1.5*cm, "ELOSAÚDE - Planos de Saúde | CNPJ: 00.000.000/0001-00")
-            p.drawString(2*cm, 1*cm, "www.elosaude.com.br | reembolso@elosaude.com.br | (11) 3000-0000")
-
-            # Save PDF
-            p.showPage()
-            p.save()
-
-            # Get PDF data
-            pdf_data = buffer.getvalue()
-            buffer.close()
-
-            # Return PDF
-            response = HttpResponse(pdf_data, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="comprovante_reembolso_{reimbursement.protocol_number}.pdf"'
-            return response
+                p.save()
+
+                # Get PDF data
+                pdf_data = buffer.getvalue()
+                buffer.close()
+                return pdf_data
+
+            return document_cache.serve(
+                request, document_cache.KIND_REIMBURSEMENT_RECEIPT, reimbursement.pk,
+                document_cache.content_version(reimbursement.updated_at, beneficiary.updated_at),
+                render, filename=f'comprovante_reembolso_{reimbursement.protocol_number}.pdf'
+            )
 
         except Exception as e:
             return Response({'error': f'Error generating PDF: {str(e)}'},
@@ -4,13 +4,12 @@ PDF Generator utilities using ReportLab
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate
 from io import BytesIO
 from datetime import datetime
 
+from apps.utils.pdf_layout import DOCUMENT_FOOTER, DOCUMENT_HEADER, get_styles
+
 
 class PDFGenerator:
     """Base class for generating PDFs"""
@@ -20,42 +19,15 @@ class PDFGenerator:
         self.buffer = BytesIO()
         self.pagesize = A4
         self.width, self.height = self.pagesize
-        self.styles = getSampleStyleSheet()
-
-        # Custom styles
-        self.styles.add(ParagraphStyle(
-            name='Title',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            textColor=colors.HexColor('#007AFF')
-        ))
-
-        self.styles.add(ParagraphStyle(
-            name='Subtitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.HexColor('#333333')
-        ))
-
-        self.styles.add(ParagraphStyle(
-            name='RightAlign',
-            parent=self.styles['Normal'],
-            alignment=TA_RIGHT,
-        ))
+        # Shared, built once per process; treat as read-only
+        self.styles = get_styles()
 
     def create_header(self, canvas, doc):
         """Draw header on each page"""
-        canvas.saveState()
-
-        # Logo placeholder (you can add an actual logo later)
-        canvas.setFont('Helvetica-Bold', 16)
-        canvas.setFillColor(colors.HexColor('#007AFF'))
-        canvas.drawString(2*cm, self.height - 2*cm, '🏥 Elosaúde')
+        DOCUMENT_HEADER.stamp(canvas)
 
         # Date
+        canvas.saveState()
         canvas.setFont('Helvetica', 9)
         canvas.setFillColor(colors.black)
         canvas.drawRightString(
@@ -63,39 +35,21 @@ class PDFGenerator:
             self.height - 2*cm,
             f'Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}'
         )
-
-        # Line
-        canvas.setStrokeColor(colors.HexColor('#007AFF'))
-        canvas.setLineWidth(2)
-        canvas.line(2*cm, self.height - 2.5*cm, self.width - 2*cm, self.height - 2.5*cm)
-
         canvas.restoreState()
 
     def create_footer(self, canvas, doc):
         """Draw footer on each page"""
-        canvas.saveState()
-
-        # Line
-        canvas.setStrokeColor(colors.HexColor('#CCCCCC'))
-        canvas.setLineWidth(1)
-        canvas.line(2*cm, 2*cm, self.width - 2*cm, 2*cm)
+        DOCUMENT_FOOTER.stamp(canvas)
 
-        # Footer text
+        # Page number
+        canvas.saveState()
         canvas.setFont('Helvetica', 8)
         canvas.setFillColor(colors.HexColor('#666666'))
-        canvas.drawCentredString(
-            self.width / 2,
-            1.5*cm,
-            'Elosaúde - Gestão de Saúde'
-        )
-
-        # Page number
         canvas.drawRightString(
             self.width - 2*cm,
             1.5*cm,
             f'Página {doc.page}'
         )
-
         canvas.restoreState()
 
     def create_document(self):
@@ -0,0 +1,183 @@
+"""
+Reusable PDF page layouts
+
+The static part of a document (header band, brand, fixed subtitles, legal
+footer) is described once per process as a PageLayout. On a canvas it is
+drawn a single time into a form XObject and every page references that form,
+so only the variable fields are drawn per page. Stylesheets and table styles
+are built once per process as well.
+"""
+import hashlib
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import TableStyle
+
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+PRIMARY_COLOR = colors.HexColor('#20a490')
+GRAY_COLOR = colors.HexColor('#666666')
+LIGHT_GRAY = colors.HexColor('#F5F9F8')
+
+# PDFGenerator (platypus documents) palette
+DOCUMENT_COLOR = colors.HexColor('#007AFF')
+TABLE_LABEL_BACKGROUND = colors.HexColor('#F0F0F0')
+
+COMPANY_LINE = "ELOSAÚDE - Planos de Saúde | CNPJ: 00.000.000/0001-00"
+
+
+class PageLayout:
+    """
+    Static drawing shared by every page of a document type.
+
+    ``draw(canvas)`` must only issue drawing operations that do not depend
+    on the document; it runs once per canvas, inside a form XObject.
+    """
+
+    # Set to False to draw the static part directly on every page (used by
+    # the rendering benchmark as the uncompiled baseline)
+    compiled = True
+
+    def __init__(self, name, draw):
+        self.name = name
+        self.draw = draw
+
+    def stamp(self, canvas):
+        """Place the static part on the current page"""
+        if not self.compiled:
+            canvas.saveState()
+            self.draw(canvas)
+            canvas.restoreState()
+            return
+
+        if not canvas.hasForm(self.name):
+            canvas.saveState()
+            canvas.beginForm(self.name)
+            self.draw(canvas)
+            canvas.endForm()
+            canvas.restoreState()
+        canvas.doForm(self.name)
+
+
+def _form_name(prefix, *parts):
+    return prefix + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:12]
+
+
+@lru_cache(maxsize=None)
+def header_band(title='ELOSAÚDE', subtitle=None, band_height=3*cm, title_size=24, subtitle_size=14,
+                title_y=2*cm, subtitle_y=2.5*cm, pagesize=A4):
+    """Colored band at the top of the page with the brand and a fixed subtitle"""
+    page_width, page_height = pagesize
+
+    def draw(canvas):
+        canvas.setFillColor(PRIMARY_COLOR)
+        canvas.rect(0, page_height - band_height, page_width, band_height, fill=True, stroke=False)
+        canvas.setFillColor(colors.white)
+        canvas.setFont("Helvetica-Bold", title_size)
+        canvas.drawString(2*cm, page_height - title_y, title)
+        if subtitle:
+            canvas.setFont("Helvetica", subtitle_size)
+            canvas.drawString(2*cm, page_height - subtitle_y, subtitle)
+
+    return PageLayout(
+        _form_name('Header', title, subtitle, band_height, title_size, subtitle_size, title_y, subtitle_y,
+                   tuple(pagesize)),
+        draw
+    )
+
+
+@lru_cache(maxsize=None)
+def footer_lines(lines, top):
+    """Fixed gray footer lines, the first at ``top`` and then every 0.5cm down"""
+    def draw(canvas):
+        canvas.setFont("Helvetica", 8)
+        canvas.setFillColor(GRAY_COLOR)
+        y = top
+        for line in lines:
+            canvas.drawString(2*cm, y, line)
+            y -= 0.5*cm
+
+    return PageLayout(_form_name('Footer', lines, top), draw)
+
+
+def _draw_document_header(canvas):
+    # Logo placeholder (you can add an actual logo later)
+    canvas.setFont('Helvetica-Bold', 16)
+    canvas.setFillColor(DOCUMENT_COLOR)
+    canvas.drawString(2*cm, PAGE_HEIGHT - 2*cm, '🏥 Elosaúde')
+
+    # Line
+    canvas.setStrokeColor(DOCUMENT_COLOR)
+    canvas.setLineWidth(2)
+    canvas.line(2*cm, PAGE_HEIGHT - 2.5*cm, PAGE_WIDTH - 2*cm, PAGE_HEIGHT - 2.5*cm)
+
+
+def _draw_document_footer(canvas):
+    # Line
+    canvas.setStrokeColor(colors.HexColor('#CCCCCC'))
+    canvas.setLineWidth(1)
+    canvas.line(2*cm, 2*cm, PAGE_WIDTH - 2*cm, 2*cm)
+
+    # Footer text
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(colors.HexColor('#666666'))
+    canvas.drawCentredString(PAGE_WIDTH / 2, 1.5*cm, 'Elosaúde - Gestão de Saúde')
+
+
+# Header and footer of the platypus documents built with PDFGenerator
+DOCUMENT_HEADER = PageLayout('DocumentHeader', _draw_document_header)
+DOCUMENT_FOOTER = PageLayout('DocumentFooter', _draw_document_footer)
+
+
+@lru_cache(maxsize=1)
+def get_styles():
+    """Paragraph stylesheet shared by every PDFGenerator (built once per process)"""
+    styles = getSampleStyleSheet()
+
+    # The sample sheet already defines 'Title'; replace it with ours
+    styles.byName['Title'] = ParagraphStyle(
+        name='Title',
+        parent=styles['Heading1'],
+        fontSize=18,
+        alignment=TA_CENTER,
+        spaceAfter=20,
+        textColor=DOCUMENT_COLOR
+    )
+
+    styles.add(ParagraphStyle(
+        name='Subtitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.HexColor('#333333')
+    ))
+
+    styles.add(ParagraphStyle(
+        name='RightAlign',
+        parent=styles['Normal'],
+        alignment=TA_RIGHT,
+    ))
+
+    return styles
+
+
+# Label/value tables (label column shaded)
+KEY_VALUE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), TABLE_LABEL_BACKGROUND),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "elosaude_backend.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up; serves /api/notifications/stream/ itself
+from apps.notifications.stream import NotificationStreamApp  # noqa: E402
+
+application = NotificationStreamApp(django_application)
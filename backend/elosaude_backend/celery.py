@@ -18,6 +18,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
+# oracle_integration is not an installed app (its models live in Oracle),
+# so its task module is registered explicitly.
+app.autodiscover_tasks(['apps.oracle_integration'])
 
 # Configure Celery Beat schedule
 app.conf.beat_schedule = {
@@ -27,12 +30,35 @@ app.conf.beat_schedule = {
         'task': 'apps.notifications.tasks.send_appointment_reminders',
         'schedule': crontab(hour=9, minute=0),
     },
+    # Drain the notification outbox every minute (producers also schedule drains)
+    'drain-notification-outbox': {
+        'task': 'apps.notifications.tasks.drain_notification_outbox',
+        'schedule': crontab(),
+    },
+    # Reconcile cached unread notification counters every 15 minutes
+    'reconcile-unread-notification-counts': {
+        'task': 'apps.notifications.tasks.reconcile_unread_notification_counts',
+        'schedule': crontab(minute='*/15'),
+    },
     # Cleanup old notifications every day at 2 AM
     'cleanup-old-notifications': {
         'task': 'apps.notifications.tasks.cleanup_old_notifications',
         'schedule': crontab(hour=2, minute=0),
     },
 
+    # ============ BENEFICIARIES ============
+    # Replicate Oracle card data into PostgreSQL every 15 minutes
+    'replicate-oracle-cards': {
+        'task': 'apps.beneficiaries.tasks.replicate_oracle_cards',
+        'schedule': crontab(minute='*/15'),
+    },
+
+    # Refresh Oracle card statistics snapshot every 30 minutes
+    'refresh-oracle-card-statistics': {
+        'task': 'apps.oracle_integration.tasks.refresh_card_statistics',
+        'schedule': crontab(minute='*/30'),
+    },
+
     # ============ GUIDES ============
     # Check expired guides every hour
     'check-expired-guides': {
@@ -78,6 +104,27 @@ app.conf.beat_schedule = {
         'task': 'apps.financial.tasks.generate_annual_tax_statements',
         'schedule': crontab(hour=3, minute=0, day_of_month=2, month_of_year=1),
     },
+
+    # ============ PROVIDERS ============
+    # Recompute provider rating counters from the reviews every day at 3:30 AM
+    'reconcile-provider-ratings': {
+        'task': 'apps.providers.tasks.reconcile_provider_ratings',
+        'schedule': crontab(hour=3, minute=30),
+    },
+
+    # ============ ADMIN REPORTS ============
+    # Delete expired report export jobs and their files every day at 4 AM
+    'cleanup-report-jobs': {
+        'task': 'apps.admin_api.tasks.cleanup_report_jobs',
+        'schedule': crontab(hour=4, minute=0),
+    },
+
+    # ============ ADMIN DASHBOARD ============
+    # Store the previous day's dashboard metrics rollup every day at 00:15
+    'rollup-dashboard-metrics': {
+        'task': 'apps.admin_api.tasks.rollup_dashboard_metrics',
+        'schedule': crontab(hour=0, minute=15),
+    },
 }
 
 # Celery configuration
@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'rest_framework',
@@ -59,6 +60,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.notifications.unread.UnreadNotificationsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -167,6 +169,59 @@ SIMPLE_JWT = {
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ['X-Unread-Notifications']
+
+# Cache (Redis, shared with Celery)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+    }
+}
+
+# Beneficiary card cache (apps.common.card_cache)
+CARD_CACHE_TTL = config('CARD_CACHE_TTL', default=900, cast=int)  # seconds
+CARD_CACHE_L1_TTL = config('CARD_CACHE_L1_TTL', default=30, cast=int)  # seconds
+CARD_CACHE_L1_MAX_ENTRIES = config('CARD_CACHE_L1_MAX_ENTRIES', default=1000, cast=int)
+
+# Oracle -> PostgreSQL card replication (apps.beneficiaries.replication)
+CARD_REPLICATION_BATCH_SIZE = config('CARD_REPLICATION_BATCH_SIZE', default=1000, cast=int)
+
+# Notification outbox (apps.notifications.outbox)
+NOTIFICATION_OUTBOX_BATCH_SIZE = config('NOTIFICATION_OUTBOX_BATCH_SIZE', default=500, cast=int)
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=3600, cast=int)  # seconds
+
+# Cached unread notification counters (apps.notifications.unread)
+NOTIFICATION_UNREAD_CACHE_TTL = config('NOTIFICATION_UNREAD_CACHE_TTL', default=86400, cast=int)  # seconds
+NOTIFICATION_UNREAD_RECONCILE_WINDOW = config('NOTIFICATION_UNREAD_RECONCILE_WINDOW', default=7200, cast=int)  # seconds
+
+# Notification stream over SSE (apps.notifications.stream, served by elosaude_backend.asgi)
+NOTIFICATION_STREAM_REDIS_URL = config('NOTIFICATION_STREAM_REDIS_URL', default=CACHES['default']['LOCATION'])
+NOTIFICATION_STREAM_HEARTBEAT = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=int)  # seconds
+NOTIFICATION_STREAM_REPLAY_LIMIT = config('NOTIFICATION_STREAM_REPLAY_LIMIT', default=100, cast=int)
+
+# Batch PDF rendering (apps.financial.pdf_batch); 0 = one process per CPU
+PDF_RENDER_WORKERS = config('PDF_RENDER_WORKERS', default=0, cast=int)
+PDF_RENDER_CHUNK_SIZE = config('PDF_RENDER_CHUNK_SIZE', default=200, cast=int)
+
+# Admin report exports (apps.admin_api.exports); rows fetched per round-trip
+REPORT_EXPORT_CHUNK_SIZE = config('REPORT_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Report previews above this planner estimate return it instead of an exact COUNT(*)
+REPORT_EXACT_COUNT_THRESHOLD = config('REPORT_EXACT_COUNT_THRESHOLD', default=100000, cast=int)
+# Days finished report jobs (apps.admin_api.tasks) and their files are kept
+REPORT_JOB_RETENTION_DAYS = config('REPORT_JOB_RETENTION_DAYS', default=7, cast=int)
+
+# Admin dashboard metrics (apps.admin_api.metrics)
+DASHBOARD_METRICS_CACHE_TIMEOUT = config('DASHBOARD_METRICS_CACHE_TIMEOUT', default=60, cast=int)  # seconds
+# Days of daily rollups the rollup task fills in when rows are missing
+DASHBOARD_METRICS_BACKFILL_DAYS = config('DASHBOARD_METRICS_BACKFILL_DAYS', default=366, cast=int)
+
+# Nearby provider search (apps.providers.geo)
+PROVIDER_NEARBY_MAX_RADIUS_KM = config('PROVIDER_NEARBY_MAX_RADIUS_KM', default=200, cast=float)
+PROVIDER_NEARBY_MAX_RESULTS = config('PROVIDER_NEARBY_MAX_RESULTS', default=100, cast=int)  # k-nearest limit
+
+# Provider rating reconciliation and review imports (apps.providers.ratings); rows per statement
+PROVIDER_RATING_BATCH_SIZE = config('PROVIDER_RATING_BATCH_SIZE', default=1000, cast=int)
 
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
@@ -177,6 +232,20 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# Oracle Integration - session pool
+ORACLE_POOL = {
+    'MIN': config('ORACLE_POOL_MIN', default=2, cast=int),
+    'MAX': config('ORACLE_POOL_MAX', default=10, cast=int),
+    'INCREMENT': config('ORACLE_POOL_INCREMENT', default=1, cast=int),
+    'WAIT_TIMEOUT': config('ORACLE_POOL_WAIT_TIMEOUT', default=5000, cast=int),  # ms
+    'PING_INTERVAL': config('ORACLE_POOL_PING_INTERVAL', default=60, cast=int),  # seconds
+    'HEALTH_CHECK_INTERVAL': config('ORACLE_POOL_HEALTH_CHECK_INTERVAL', default=30, cast=int),  # seconds
+}
+# Rows fetched per round-trip by OracleConnection.stream_query
+ORACLE_FETCH_ARRAYSIZE = config('ORACLE_FETCH_ARRAYSIZE', default=500, cast=int)
+# Overall deadline (seconds) for the concurrent my_oracle_cards lookup
+ORACLE_CARDS_DEADLINE = config('ORACLE_CARDS_DEADLINE', default=3.0, cast=float)
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
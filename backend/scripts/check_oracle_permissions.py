@@ -95,15 +95,15 @@ def check_permissions():
                 TEST_FIELD VARCHAR2(100)
             )
         """
-        conn = OracleConnection.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(test_create)
-        print("   ✓ CREATE TABLE permission: YES")
-
-        # Clean up
-        cursor.execute("DROP TABLE TEST_DJANGO_MIGRATION_CHECK")
-        conn.commit()
-        cursor.close()
+        with OracleConnection.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(test_create)
+            print("   ✓ CREATE TABLE permission: YES")
+
+            # Clean up
+            cursor.execute("DROP TABLE TEST_DJANGO_MIGRATION_CHECK")
+            conn.commit()
+            cursor.close()
         print("   ✓ Test table created and dropped successfully")
     except Exception as e:
         print(f"   ✗ CREATE TABLE permission: NO")